@@ -0,0 +1,82 @@
+# /backend/bench/bench_catalogo_compacto.py
+"""
+Catálogo do vendedor: formato completo x compacto (JSON em colunas) x MessagePack.
+
+Popula BENCH_PRODUTOS produtos (padrão 5.000) com grade de 5 tamanhos x
+4 cores e mede, para cada formato, o tamanho da resposta (com e sem gzip),
+o tempo para montá-la no servidor e o tempo para o cliente decodificá-la.
+
+    python -m bench.bench_catalogo_compacto
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import msgpack
+
+from bench.comum import criar_empresa, engine, inserir_em_lotes, medir_ms, models, recriar_banco
+from sqlalchemy.orm import Session
+
+from src.routes.vendedor.catalogo import _serializar_catalogo
+from src.services.catalogo_compacto import FORMATO_COMPACTO, FORMATO_COMPLETO, FORMATO_MSGPACK
+
+QT_PRODUTOS = int(os.getenv("BENCH_PRODUTOS", 5_000))
+TAMANHOS = ("PP", "P", "M", "G", "GG")
+CORES = ("Preto", "Branco", "Azul Marinho", "Vermelho")
+QT_CATEGORIAS = 3
+
+
+def popular():
+    with engine.begin() as conexao:
+        criar_empresa(conexao)
+        inserir_em_lotes(conexao, models.CategoriaProduto.__table__, (
+            {"ID_CATEGORIA": i, "ID_ORGANIZACAO": 1, "NO_CATEGORIA": f"Categoria {i}", "FL_ATIVA": True}
+            for i in range(1, QT_CATEGORIAS + 1)
+        ))
+        inserir_em_lotes(conexao, models.Produto.__table__, (
+            {"ID_PRODUTO": i, "ID_EMPRESA": 1, "ID_CATEGORIA": 1 + i % QT_CATEGORIAS, "CD_PRODUTO": f"B{i}",
+             "DS_PRODUTO": f"Produto de teste número {i}", "SG_UNIDADE_MEDIDA": "UN", "FL_ATIVO": True,
+             "DT_CRIACAO": datetime(2025, 1, 1)}
+            for i in range(1, QT_PRODUTOS + 1)
+        ))
+        inserir_em_lotes(conexao, models.VariacaoProduto.__table__, (
+            {"ID_PRODUTO": i, "DS_TAMANHO": tamanho, "DS_COR": cor, "CD_SKU": f"B{i}-{tamanho}-{cor}",
+             "VL_AJUSTE_PRECO": Decimal(0), "QT_ESTOQUE": 10, "FL_ATIVA": True}
+            for i in range(1, QT_PRODUTOS + 1) for tamanho in TAMANHOS for cor in CORES
+        ))
+        inserir_em_lotes(conexao, models.ItemCatalogo.__table__, (
+            {"ID_CATALOGO": 1, "ID_PRODUTO": i, "VL_PRECO_CATALOGO": Decimal("49.90"), "FL_ATIVO_NO_CATALOGO": True}
+            for i in range(1, QT_PRODUTOS + 1)
+        ))
+
+
+def main():
+    print(f"Banco: {recriar_banco()} | {QT_PRODUTOS} produtos x {len(TAMANHOS) * len(CORES)} variações")
+    popular()
+
+    with Session(engine) as db:
+        def serializar(formato):
+            conteudo = _serializar_catalogo(db, 1, 1, None, formato)
+            db.expunge_all()
+            return conteudo
+
+        completo = serializar(FORMATO_COMPLETO)
+        compacto = serializar(FORMATO_COMPACTO)
+        assert msgpack.unpackb(serializar(FORMATO_MSGPACK)) == json.loads(compacto)
+        assert json.loads(compacto)["qt_itens"] == len(json.loads(completo)) == QT_PRODUTOS
+
+        print(f"{'formato':>9} | {'tamanho':>10} | {'gzip':>9} | {'montagem':>10} | decodificação")
+        for formato, decodificar in (
+            (FORMATO_COMPLETO, json.loads), (FORMATO_COMPACTO, json.loads), (FORMATO_MSGPACK, msgpack.unpackb)
+        ):
+            conteudo = serializar(formato)
+            ms_montagem = medir_ms(lambda: serializar(formato), repeticoes=3)
+            ms_decodificacao = medir_ms(lambda: decodificar(conteudo))
+            print(f"{formato:>9} | {len(conteudo) / 1024:7.0f} KB | {len(gzip.compress(conteudo)) / 1024:6.0f} KB | "
+                  f"{ms_montagem:7.0f} ms | {ms_decodificacao:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
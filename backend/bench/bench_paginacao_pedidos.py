@@ -0,0 +1,86 @@
+# /backend/bench/bench_paginacao_pedidos.py
+"""
+Listagem de pedidos do vendedor: OFFSET x cursor (keyset) em páginas profundas.
+
+Popula BENCH_PEDIDOS pedidos (padrão 1.000.000) de 20 vendedores em 5
+empresas e mede a mesma página de 25 pedidos pelos dois caminhos de
+'paginar_pedidos'. O OFFSET cresce com a profundidade; o cursor segue o
+índice IX_PEDIDOS_VENDEDOR_DATA e custa o mesmo em qualquer página.
+
+    python -m bench.bench_paginacao_pedidos
+    BENCH_PEDIDOS=200000 python -m bench.bench_paginacao_pedidos
+"""
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from bench.comum import criar_empresa, engine, inserir_em_lotes, medir_ms, models, recriar_banco
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from src.services.paginacao import codificar_cursor, paginar_pedidos
+
+QT_PEDIDOS = int(os.getenv("BENCH_PEDIDOS", 1_000_000))
+QT_VENDEDORES = 20
+QT_EMPRESAS = 5
+TAMANHO_PAGINA = 25
+PAGINAS = (1, 100, 1000, 2000)
+ID_VENDEDOR, ID_EMPRESA = 3, 3
+
+
+def popular():
+    inicio = datetime(2023, 1, 1)
+    with engine.begin() as conexao:
+        criar_empresa(conexao)
+        for id_empresa in range(2, QT_EMPRESAS + 1):
+            conexao.execute(insert(models.Empresa.__table__).values(
+                ID_EMPRESA=id_empresa, ID_ORGANIZACAO=1, NO_EMPRESA="Bench", NR_CNPJ=f"{id_empresa:014d}"
+            ))
+        inserir_em_lotes(conexao, models.Usuario.__table__, (
+            {"ID_USUARIO": i, "ID_ORGANIZACAO": 1, "DS_EMAIL": f"vendedor{i}@bench", "DS_SENHA_HASH": "-",
+             "TP_USUARIO": "vendedor"}
+            for i in range(1, QT_VENDEDORES + 1)
+        ))
+        conexao.execute(insert(models.Cliente.__table__).values(
+            ID_CLIENTE=1, ID_ORGANIZACAO=1, NR_CNPJ="0", NO_RAZAO_SOCIAL="Cliente"
+        ))
+        inserir_em_lotes(conexao, models.Pedido.__table__, (
+            {"ID_PEDIDO": i, "ID_USUARIO": 1 + i % QT_VENDEDORES, "ID_EMPRESA": 1 + i % QT_EMPRESAS,
+             "ID_CLIENTE": 1, "VL_TOTAL": Decimal("999.00"), "ST_PEDIDO": "pendente",
+             "DT_PEDIDO": inicio + timedelta(minutes=i)}
+            for i in range(1, QT_PEDIDOS + 1)
+        ))
+        conexao.execute(text("ANALYZE"))
+
+
+def main():
+    print(f"Banco: {recriar_banco()} | {QT_PEDIDOS} pedidos, {QT_VENDEDORES} vendedores, {QT_EMPRESAS} empresas")
+    popular()
+
+    with Session(engine) as db:
+        def pedidos_vendedor():
+            return db.query(models.Pedido.id_pedido, models.Pedido.dt_pedido).filter(
+                models.Pedido.id_usuario == ID_VENDEDOR,
+                models.Pedido.id_empresa == ID_EMPRESA
+            )
+
+        print(f"{'página':>6} | {'offset':>10} | {'cursor':>10} | ganho")
+        for pagina in PAGINAS:
+            skip = (pagina - 1) * TAMANHO_PAGINA
+            # Cursor equivalente: a última linha da página anterior
+            cursor = None
+            if skip:
+                anterior = paginar_pedidos(pedidos_vendedor(), 1, skip=skip - 1).one()
+                cursor = codificar_cursor(anterior.dt_pedido, anterior.id_pedido)
+
+            por_offset = lambda: paginar_pedidos(pedidos_vendedor(), TAMANHO_PAGINA, skip=skip).all()
+            por_cursor = lambda: paginar_pedidos(pedidos_vendedor(), TAMANHO_PAGINA, cursor=cursor).all()
+            assert [p.id_pedido for p in por_offset()] == [p.id_pedido for p in por_cursor()]
+
+            ms_offset = medir_ms(por_offset)
+            ms_cursor = medir_ms(por_cursor)
+            print(f"{pagina:>6} | {ms_offset:7.2f} ms | {ms_cursor:7.2f} ms | {ms_offset / ms_cursor:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
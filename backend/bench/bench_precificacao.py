@@ -0,0 +1,100 @@
+# /backend/bench/bench_precificacao.py
+"""
+Precificação dos itens do pedido: consulta por linha x em lote (TabelaPrecos).
+
+Compara, para pedidos de 10/100/500 linhas (produtos com grade), a
+resolução antiga (contagem de variações, item do catálogo e variação a cada
+linha) com a TabelaPrecos usada em create_pedido (duas consultas).
+
+    python -m bench.bench_precificacao
+"""
+from decimal import Decimal
+
+from bench.comum import contar_consultas, criar_empresa, engine, inserir_em_lotes, medir_ms, models, recriar_banco
+from sqlalchemy.orm import Session
+
+from src.schemas import ItemPedidoCreate
+from src.services.precificacao import TabelaPrecos
+
+QT_PRODUTOS = 1000
+VARIACOES_POR_PRODUTO = 4
+TAMANHOS_PEDIDO = (10, 100, 500)
+
+
+def popular():
+    with engine.begin() as conexao:
+        criar_empresa(conexao)
+        inserir_em_lotes(conexao, models.Produto.__table__, (
+            {"ID_PRODUTO": i, "ID_EMPRESA": 1, "CD_PRODUTO": f"P{i}", "DS_PRODUTO": f"Produto {i}", "FL_ATIVO": True}
+            for i in range(1, QT_PRODUTOS + 1)
+        ))
+        inserir_em_lotes(conexao, models.VariacaoProduto.__table__, (
+            {"ID_VARIACAO": (i - 1) * VARIACOES_POR_PRODUTO + v + 1, "ID_PRODUTO": i, "DS_TAMANHO": str(v),
+             "VL_AJUSTE_PRECO": Decimal("1.50"), "QT_ESTOQUE": None, "FL_ATIVA": True}
+            for i in range(1, QT_PRODUTOS + 1) for v in range(VARIACOES_POR_PRODUTO)
+        ))
+        inserir_em_lotes(conexao, models.ItemCatalogo.__table__, (
+            {"ID_CATALOGO": 1, "ID_PRODUTO": i, "VL_PRECO_CATALOGO": Decimal("49.90"), "FL_ATIVO_NO_CATALOGO": True}
+            for i in range(1, QT_PRODUTOS + 1)
+        ))
+
+
+def itens_pedido(qt_linhas: int):
+    return [
+        ItemPedidoCreate(id_produto=i, id_variacao=(i - 1) * VARIACOES_POR_PRODUTO + 1, qt_quantidade=2, pc_desconto_item=0)
+        for i in range(1, qt_linhas + 1)
+    ]
+
+
+def precificar_por_linha(db: Session, id_catalogo: int, itens) -> Decimal:
+    """ Resolução antiga de create_pedido: três consultas por linha """
+    total = Decimal(0)
+    for item_in in itens:
+        db.query(models.VariacaoProduto).filter(
+            models.VariacaoProduto.id_produto == item_in.id_produto,
+            models.VariacaoProduto.fl_ativa == True
+        ).count()
+        item_catalogo = db.query(models.ItemCatalogo).filter(
+            models.ItemCatalogo.id_catalogo == id_catalogo,
+            models.ItemCatalogo.id_produto == item_in.id_produto,
+            models.ItemCatalogo.fl_ativo_no_catalogo == True
+        ).first()
+        preco = item_catalogo.vl_preco_catalogo + db.get(models.VariacaoProduto, item_in.id_variacao).vl_ajuste_preco
+        total += preco * item_in.qt_quantidade
+    return total
+
+
+def precificar_em_lote(db: Session, id_catalogo: int, itens) -> Decimal:
+    tabela = TabelaPrecos.carregar(db, [id_catalogo], itens)
+    return tabela.precificar_itens(id_catalogo, itens)[1]
+
+
+def executar(db: Session, funcao, itens):
+    """ Sessão limpa a cada execução (db.get não pode reaproveitar o identity map) """
+    db.expunge_all()
+    return funcao(db, 1, [item.model_copy() for item in itens])
+
+
+def main():
+    print(f"Banco: {recriar_banco()} | {QT_PRODUTOS} produtos x {VARIACOES_POR_PRODUTO} variações")
+    popular()
+
+    print(f"{'linhas':>6} | {'por linha':>20} | {'em lote':>20} | ganho")
+    with Session(engine) as db:
+        for qt_linhas in TAMANHOS_PEDIDO:
+            itens = itens_pedido(qt_linhas)
+            assert executar(db, precificar_por_linha, itens) == executar(db, precificar_em_lote, itens)
+
+            with contar_consultas() as consultas_linha:
+                executar(db, precificar_por_linha, itens)
+            with contar_consultas() as consultas_lote:
+                executar(db, precificar_em_lote, itens)
+            ms_linha = medir_ms(lambda: executar(db, precificar_por_linha, itens))
+            ms_lote = medir_ms(lambda: executar(db, precificar_em_lote, itens))
+
+            print(f"{qt_linhas:>6} | {ms_linha:8.1f} ms {consultas_linha[0]:4d} SQL | "
+                  f"{ms_lote:8.1f} ms {consultas_lote[0]:4d} SQL | {ms_linha / ms_lote:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# /backend/bench/bench_produtos.py
+"""
+Listagem de produtos do gestor: carga única antiga x páginas por OFFSET x cursor.
+
+Popula BENCH_PRODUTOS produtos (padrão 50.000) com 20 variações e um item
+de catálogo cada, e mede:
+- a consulta antiga (joinedload de variações e listas de preço, sem limite),
+  uma única execução;
+- a mesma página de 100 produtos (com selectinload, como a rota atual) por
+  OFFSET e pelo cursor de 'paginar_produtos', em profundidades crescentes.
+
+    python -m bench.bench_produtos
+    BENCH_PRODUTOS=10000 python -m bench.bench_produtos
+"""
+import os
+import time
+from decimal import Decimal
+
+from bench.comum import contar_consultas, criar_empresa, engine, inserir_em_lotes, medir_ms, models, recriar_banco
+from sqlalchemy import text
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from src.services.paginacao import _codificar, paginar_produtos
+
+QT_PRODUTOS = int(os.getenv("BENCH_PRODUTOS", 50_000))
+VARIACOES_POR_PRODUTO = 20
+TAMANHO_PAGINA = 100
+PAGINAS = (1, 100, 400)
+
+
+def popular():
+    with engine.begin() as conexao:
+        criar_empresa(conexao)
+        inserir_em_lotes(conexao, models.Produto.__table__, (
+            {"ID_PRODUTO": i, "ID_EMPRESA": 1, "CD_PRODUTO": f"P{i}", "DS_PRODUTO": f"Produto {i:06d}", "FL_ATIVO": True}
+            for i in range(1, QT_PRODUTOS + 1)
+        ))
+        inserir_em_lotes(conexao, models.VariacaoProduto.__table__, (
+            {"ID_PRODUTO": i, "DS_TAMANHO": str(v), "QT_ESTOQUE": 1, "FL_ATIVA": True}
+            for i in range(1, QT_PRODUTOS + 1) for v in range(VARIACOES_POR_PRODUTO)
+        ))
+        inserir_em_lotes(conexao, models.ItemCatalogo.__table__, (
+            {"ID_CATALOGO": 1, "ID_PRODUTO": i, "VL_PRECO_CATALOGO": Decimal("10.00"), "FL_ATIVO_NO_CATALOGO": True}
+            for i in range(1, QT_PRODUTOS + 1)
+        ))
+        conexao.execute(text("ANALYZE"))
+
+
+def produtos_organizacao(db: Session):
+    return db.query(models.Produto).join(models.Empresa).filter(models.Empresa.id_organizacao == 1)
+
+
+def pagina_atual(db: Session, skip: int = 0, cursor=None):
+    """ Consulta da rota atual; com 'skip', a mesma ordem paginada por OFFSET """
+    query = produtos_organizacao(db).options(
+        selectinload(models.Produto.variacoes),
+        selectinload(models.Produto.categoria),
+        selectinload(models.Produto.listas_de_preco)
+    )
+    if skip:
+        query = query.order_by(models.Produto.ds_produto, models.Produto.id_produto).offset(skip).limit(TAMANHO_PAGINA)
+    else:
+        query = paginar_produtos(query, TAMANHO_PAGINA, cursor)
+    produtos = query.all()
+    db.expunge_all()
+    return produtos
+
+
+def main():
+    print(f"Banco: {recriar_banco()} | {QT_PRODUTOS} produtos x {VARIACOES_POR_PRODUTO} variações")
+    popular()
+
+    with Session(engine) as db:
+        with contar_consultas() as consultas:
+            inicio = time.perf_counter()
+            produtos = produtos_organizacao(db).options(
+                joinedload(models.Produto.variacoes), joinedload(models.Produto.listas_de_preco)
+            ).order_by(models.Produto.ds_produto).all()
+            ms_antiga = (time.perf_counter() - inicio) * 1000
+        print(f"antiga (tudo, joinedload): {len(produtos)} produtos, {ms_antiga:.0f} ms, {consultas[0]} SQL")
+        db.expunge_all()
+        del produtos
+
+        print(f"{'página':>6} | {'offset':>10} | {'cursor':>10} | ganho")
+        for pagina in PAGINAS:
+            skip = (pagina - 1) * TAMANHO_PAGINA
+            cursor = None
+            if skip:
+                anterior = produtos_organizacao(db).order_by(
+                    models.Produto.ds_produto, models.Produto.id_produto
+                ).offset(skip - 1).limit(1).one()
+                cursor = _codificar(anterior.ds_produto, anterior.id_produto)
+
+            por_offset = lambda: pagina_atual(db, skip=skip)
+            por_cursor = lambda: pagina_atual(db, cursor=cursor)
+            assert [p.id_produto for p in por_offset()] == [p.id_produto for p in por_cursor()]
+
+            ms_offset = medir_ms(por_offset)
+            ms_cursor = medir_ms(por_cursor)
+            print(f"{pagina:>6} | {ms_offset:7.2f} ms | {ms_cursor:7.2f} ms | {ms_offset / ms_cursor:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
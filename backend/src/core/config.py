@@ -1,5 +1,7 @@
 # /src/core/config.py
 import os
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -25,5 +27,48 @@ class Settings(BaseSettings):
     # URL do Banco de Dados (carregada pelo database.py, mas bom ter aqui)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
 
+    # Os campos abaixo são lidos das variáveis de ambiente de mesmo nome
+    # (o pydantic-settings converte os tipos); o valor aqui é o padrão.
+
+    # Validade (em horas) das respostas guardadas pelo header 'Idempotency-Key'
+    IDEMPOTENCY_TTL_HOURS: int = 24
+
+    # Números de pedido reservados por worker a cada ida ao contador (services/numeracao.py)
+    ORDER_NUMBER_BLOCK_SIZE: int = 20
+
+    # --- E-mail (SMTP) ---
+    MAIL_USERNAME: Optional[str] = None
+    MAIL_PASSWORD: Optional[str] = None
+    MAIL_FROM: Optional[str] = None
+    MAIL_PORT: int = 587
+    MAIL_SERVER: Optional[str] = None
+    # (Podem ser desligados no .env para testar com um SMTP local)
+    MAIL_STARTTLS: bool = True
+    MAIL_SSL_TLS: bool = False
+    MAIL_USE_CREDENTIALS: bool = True
+    MAIL_VALIDATE_CERTS: bool = True
+
+    # --- Worker da fila de e-mails (services/email_worker.py) ---
+    EMAIL_WORKER_BATCH: int = 50                    # E-mails por ciclo
+    EMAIL_WORKER_INTERVAL: float = 5                # Segundos entre ciclos com a fila vazia
+    EMAIL_WORKER_MAX_RETRIES: int = 8               # Tentativas antes de marcar 'erro'
+    EMAIL_WORKER_ONCE: Optional[str] = None         # Definida (qualquer valor): processa a fila uma vez e sai
+    EMAIL_OUTBOX_RETENTION_DAYS: int = 30           # Dias que enviados/erros ficam na fila
+    EMAIL_WORKER_METRICS_INTERVAL: float = 60       # Segundos entre as métricas da fila no log
+    EMAIL_WORKER_PURGE_INTERVAL: float = 60 * 60    # Segundos entre as limpezas da fila
+
+    # --- Dashboards e relatórios do gestor ---
+    DASHBOARD_WORKERS: int = 5                      # Threads das consultas paralelas (por worker)
+    REPORT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Cache de relatórios (por worker, LRU)
+    REPORT_CACHE_TTL_SECONDS: int = 300
+    ANALYTICS_CACHE_MAX_BYTES: int = 128 * 1024 * 1024   # DataFrames das análises (por worker, LRU)
+    ANALYTICS_MAX_BYTES_PER_ORG: int = 64 * 1024 * 1024  # Acima disso não fica em cache
+    ANALYTICS_RELOAD_SECONDS: int = 3600                 # Recarga completa do DataFrame
+
+    # --- Catálogo do vendedor ---
+    CATALOG_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Cache do catálogo pronto (por worker, LRU)
+    CATALOG_CACHE_TTL_SECONDS: int = 3600
+    CATALOG_CHANGES_RETENTION_DAYS: int = 90         # Log da sincronização incremental
+
 # Instância única das configurações
 settings = Settings()
\ No newline at end of file
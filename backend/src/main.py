@@ -14,6 +14,11 @@ import threading
 # Importações da nossa aplicação
 from src.database import engine, Base, SessionLocal
 from src.models import models
+from src.services.comissoes import livro_vazio, recalcular_comissoes
+from src.services.resumos_vendas import reconstruir_resumos, resumos_vazios
+from src.services.contadores_sistema import reconciliar_contadores
+from src.services.alteracoes_catalogo import DIAS_RETENCAO, limpar_alteracoes_antigas
+from src.services.busca_produtos import criar_indice_busca, indice_vazio, reconstruir_indice
 from src.routes.auth import auth_router
 from src.routes.utils import utils_router
 
@@ -25,6 +30,7 @@ from src.routes.gestor.clientes import gestor_clientes_router
 from src.routes.gestor.produtos import gestor_produtos_router as gestor_catalogo_router
 from src.routes.gestor.config import gestor_config_router
 from src.routes.gestor.relatorios import gestor_relatorios_router
+from src.routes.gestor.analises import gestor_analises_router
 from src.routes.gestor.pedidos import gestor_pedidos_router
 from src.routes.gestor.importacao import importacao_router
 
@@ -35,6 +41,7 @@ from src.routes.admin.dashboard import admin_dashboard_router
 
 # Vendedor
 from src.routes.vendedor.pedidos import vendedor_pedidos_router
+from src.routes.vendedor.rascunhos import vendedor_rascunhos_router
 from src.routes.vendedor.catalogo import vendedor_catalogo_router
 from src.routes.vendedor.clientes import vendedor_clientes_router
 from src.routes.vendedor.dashboard import vendedor_dashboard_router
@@ -97,6 +104,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 
@@ -324,214 +332,106 @@ def create_postgresql_triggers(db: Session):
     print("✅ Triggers de auditoria PostgreSQL verificados/criados.")
 
 
-# --- FUNÇÕES PARA CRIAR VIEWS ---
-def create_sqlite_views(db: Session):
-    """Cria Views para Dashboards no SQLite"""
-    print("📊 Criando Views (SQLite)...")
+# --- ÍNDICES EM TABELAS JÁ EXISTENTES ---
+def create_missing_indexes():
+    """
+    O create_all() só cria os índices das tabelas que ele mesmo cria.
+    Aqui garantimos que índices novos dos modelos também existam em
+    bancos já populados (CREATE INDEX apenas se ainda não existir).
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                print(f"  ⚠️ Erro ao criar índice {index.name}: {e}")
+
+
+# --- VIEWS ANTIGAS ---
+# As Views de dashboard foram substituídas por tabelas mantidas pela aplicação:
+# VW_COMISSOES_CALCULADAS -> TB_COMISSOES_PEDIDO (src.services.comissoes)
+# VW_VENDAS_* -> TB_RESUMO_VENDAS_* (src.services.resumos_vendas)
+VIEWS_ANTIGAS = [
+    "VW_VENDAS_VENDEDOR_MES",
+    "VW_COMISSOES_CALCULADAS",
+    "VW_VENDAS_EMPRESA_MES",
+    "VW_VENDAS_POR_CIDADE",
+]
 
-    views = [
-        "VW_VENDAS_VENDEDOR_MES",
-        "VW_COMISSOES_CALCULADAS",
-        "VW_VENDAS_EMPRESA_MES",
-        "VW_VENDAS_POR_CIDADE",
-    ]
 
-    for view in views:
+def drop_sqlite_views(db: Session):
+    """Remove as Views antigas de Dashboard (SQLite)"""
+    for view in VIEWS_ANTIGAS:
         try:
             db.execute(text(f"DROP VIEW IF EXISTS {view}"))
         except:
             pass
+    db.commit()
+
+
+def drop_postgresql_views(db: Session):
+    """Remove as Views antigas de Dashboard (PostgreSQL)"""
+    for view in VIEWS_ANTIGAS:
         try:
-            db.execute(text(f"DROP TABLE IF EXISTS {view}"))
+            db.execute(text(f'DROP VIEW IF EXISTS "{view}" CASCADE'))
+            db.commit()
         except:
-            pass
+            db.rollback()
 
-    # 1. View: Vendas por Vendedor
-    db.execute(
-        text("""
-    CREATE VIEW VW_VENDAS_VENDEDOR_MES AS
-    SELECT 
-        u.ID_USUARIO,
-        u.NO_COMPLETO AS NO_VENDEDOR,
-        u.ID_ORGANIZACAO,
-        datetime(p.DT_PEDIDO, 'start of month') AS DT_MES_REFERENCIA,
-        COUNT(p.ID_PEDIDO) AS QT_PEDIDOS,
-        SUM(p.VL_TOTAL) AS VL_TOTAL_VENDAS,
-        AVG(p.VL_TOTAL) AS VL_TICKET_MEDIO
-    FROM TB_USUARIOS u
-    INNER JOIN TB_PEDIDOS p ON u.ID_USUARIO = p.ID_USUARIO
-    WHERE u.TP_USUARIO = 'vendedor' AND p.ST_PEDIDO != 'cancelado'
-    GROUP BY u.ID_USUARIO, u.NO_COMPLETO, u.ID_ORGANIZACAO, datetime(p.DT_PEDIDO, 'start of month');
-    """)
-    )
 
-    # 2. View: Vendas por Empresa
-    db.execute(
-        text("""
-    CREATE VIEW VW_VENDAS_EMPRESA_MES AS
-    SELECT 
-        e.ID_EMPRESA,
-        e.NO_EMPRESA,
-        e.ID_ORGANIZACAO,
-        datetime(p.DT_PEDIDO, 'start of month') AS DT_MES_REFERENCIA,
-        COUNT(p.ID_PEDIDO) AS QT_PEDIDOS,
-        SUM(p.VL_TOTAL) AS VL_TOTAL_VENDAS,
-        COUNT(DISTINCT p.ID_CLIENTE) AS QT_CLIENTES_ATENDIDOS
-    FROM TB_EMPRESAS e
-    INNER JOIN TB_PEDIDOS p ON e.ID_EMPRESA = p.ID_EMPRESA
-    WHERE p.ST_PEDIDO != 'cancelado'
-    GROUP BY e.ID_EMPRESA, e.NO_EMPRESA, e.ID_ORGANIZACAO, datetime(p.DT_PEDIDO, 'start of month');
-    """)
-    )
+def backfill_comissoes(db: Session):
+    """Preenche o livro de comissões na primeira execução (bancos já populados)"""
+    try:
+        if livro_vazio(db):
+            print("💰 Calculando o livro de comissões...")
+            print(f"✅ Comissões calculadas: {recalcular_comissoes(db)} pedidos.")
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Erro ao calcular o livro de comissões: {e}")
 
-    # 3. View: Vendas por Cidade
-    db.execute(
-        text("""
-    CREATE VIEW VW_VENDAS_POR_CIDADE AS
-    SELECT 
-        en.NO_CIDADE,
-        en.SG_ESTADO,
-        c.ID_ORGANIZACAO,
-        datetime(p.DT_PEDIDO, 'start of month') AS DT_MES_REFERENCIA,
-        COUNT(p.ID_PEDIDO) AS QT_PEDIDOS,
-        SUM(p.VL_TOTAL) AS VL_TOTAL_VENDAS
-    FROM TB_PEDIDOS p
-    INNER JOIN TB_CLIENTES c ON p.ID_CLIENTE = c.ID_CLIENTE
-    INNER JOIN TB_ENDERECOS en ON p.ID_ENDERECO_ENTREGA = en.ID_ENDERECO
-    WHERE p.ST_PEDIDO != 'cancelado'
-    GROUP BY en.NO_CIDADE, en.SG_ESTADO, c.ID_ORGANIZACAO, datetime(p.DT_PEDIDO, 'start of month');
-    """)
-    )
 
-    # 4. View: Comissões
-    db.execute(
-        text("""
-    CREATE VIEW VW_COMISSOES_CALCULADAS AS
-    SELECT 
-        p.ID_PEDIDO,
-        p.NR_PEDIDO,
-        p.ID_USUARIO,
-        u.NO_COMPLETO AS NO_VENDEDOR,
-        p.ID_EMPRESA,
-        e.NO_EMPRESA,
-        p.VL_TOTAL,
-        COALESCE(e.PC_COMISSAO_PADRAO, 0) AS PC_COMISSAO_APLICADA,
-        (p.VL_TOTAL * COALESCE(e.PC_COMISSAO_PADRAO, 0) / 100) AS VL_COMISSAO_CALCULADA,
-        p.DT_PEDIDO
-    FROM TB_PEDIDOS p
-    INNER JOIN TB_USUARIOS u ON p.ID_USUARIO = u.ID_USUARIO
-    INNER JOIN TB_EMPRESAS e ON p.ID_EMPRESA = e.ID_EMPRESA
-    WHERE p.ST_PEDIDO != 'cancelado';
-    """)
-    )
+def backfill_resumos_vendas(db: Session):
+    """Preenche os resumos mensais de vendas na primeira execução (bancos já populados)"""
+    try:
+        if resumos_vazios(db):
+            print("📊 Calculando resumos mensais de vendas...")
+            print(f"✅ Resumos calculados: {reconstruir_resumos(db)} pedidos.")
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Erro ao calcular resumos de vendas: {e}")
 
-    db.commit()
-    print("✅ Views criadas (SQLite).")
-
-
-def create_postgresql_views(db: Session):
-    """Cria Views para Dashboards no PostgreSQL"""
-    print("📊 Criando Views (PostgreSQL)...")
-
-    views = [
-        (
-            "VW_VENDAS_VENDEDOR_MES",
-            """
-        SELECT 
-            u."ID_USUARIO",
-            u."NO_COMPLETO" AS "NO_VENDEDOR",
-            u."ID_ORGANIZACAO",
-            DATE_TRUNC('month', p."DT_PEDIDO") AS "DT_MES_REFERENCIA",
-            COUNT(p."ID_PEDIDO") AS "QT_PEDIDOS",
-            SUM(p."VL_TOTAL") AS "VL_TOTAL_VENDAS",
-            AVG(p."VL_TOTAL") AS "VL_TICKET_MEDIO"
-        FROM "TB_USUARIOS" u
-        INNER JOIN "TB_PEDIDOS" p ON u."ID_USUARIO" = p."ID_USUARIO"
-        WHERE u."TP_USUARIO" = 'vendedor' AND p."ST_PEDIDO" != 'cancelado'
-        GROUP BY u."ID_USUARIO", u."NO_COMPLETO", u."ID_ORGANIZACAO", DATE_TRUNC('month', p."DT_PEDIDO")
-        """,
-        ),
-        (
-            "VW_VENDAS_EMPRESA_MES",
-            """
-        SELECT 
-            e."ID_EMPRESA",
-            e."NO_EMPRESA",
-            e."ID_ORGANIZACAO",
-            DATE_TRUNC('month', p."DT_PEDIDO") AS "DT_MES_REFERENCIA",
-            COUNT(p."ID_PEDIDO") AS "QT_PEDIDOS",
-            SUM(p."VL_TOTAL") AS "VL_TOTAL_VENDAS",
-            COUNT(DISTINCT p."ID_CLIENTE") AS "QT_CLIENTES_ATENDIDOS"
-        FROM "TB_EMPRESAS" e
-        INNER JOIN "TB_PEDIDOS" p ON e."ID_EMPRESA" = p."ID_EMPRESA"
-        WHERE p."ST_PEDIDO" != 'cancelado'
-        GROUP BY e."ID_EMPRESA", e."NO_EMPRESA", e."ID_ORGANIZACAO", DATE_TRUNC('month', p."DT_PEDIDO")
-        """,
-        ),
-        (
-            "VW_VENDAS_POR_CIDADE",
-            """
-        SELECT 
-            en."NO_CIDADE",
-            en."SG_ESTADO",
-            c."ID_ORGANIZACAO",
-            DATE_TRUNC('month', p."DT_PEDIDO") AS "DT_MES_REFERENCIA",
-            COUNT(p."ID_PEDIDO") AS "QT_PEDIDOS",
-            SUM(p."VL_TOTAL") AS "VL_TOTAL_VENDAS"
-        FROM "TB_PEDIDOS" p
-        INNER JOIN "TB_CLIENTES" c ON p."ID_CLIENTE" = c."ID_CLIENTE"
-        INNER JOIN "TB_ENDERECOS" en ON p."ID_ENDERECO_ENTREGA" = en."ID_ENDERECO"
-        WHERE p."ST_PEDIDO" != 'cancelado'
-        GROUP BY en."NO_CIDADE", en."SG_ESTADO", c."ID_ORGANIZACAO", DATE_TRUNC('month', p."DT_PEDIDO")
-        """,
-        ),
-        (
-            "VW_COMISSOES_CALCULADAS",
-            """
-        SELECT 
-            p."ID_PEDIDO",
-            p."NR_PEDIDO",
-            p."ID_USUARIO",
-            u."NO_COMPLETO" AS "NO_VENDEDOR",
-            p."ID_EMPRESA",
-            e."NO_EMPRESA",
-            p."VL_TOTAL",
-            COALESCE(e."PC_COMISSAO_PADRAO", 0) AS "PC_COMISSAO_APLICADA",
-            (p."VL_TOTAL" * COALESCE(e."PC_COMISSAO_PADRAO", 0) / 100) AS "VL_COMISSAO_CALCULADA",
-            p."DT_PEDIDO"
-        FROM "TB_PEDIDOS" p
-        INNER JOIN "TB_USUARIOS" u ON p."ID_USUARIO" = u."ID_USUARIO"
-        INNER JOIN "TB_EMPRESAS" e ON p."ID_EMPRESA" = e."ID_EMPRESA"
-        WHERE p."ST_PEDIDO" != 'cancelado'
-        """,
-        ),
-    ]
-
-    for view_name, view_sql in views:
-        try:
-            # PRIMEIRO: Tentar dropar como TABELA (caso tenha sido criada como tabela)
-            try:
-                db.execute(text(f'DROP TABLE IF EXISTS "{view_name}" CASCADE'))
-                db.commit()
-            except:
-                pass
 
-            # SEGUNDO: Tentar dropar como VIEW
-            try:
-                db.execute(text(f'DROP VIEW IF EXISTS "{view_name}" CASCADE'))
-                db.commit()
-            except:
-                pass
+def reconciliar_contadores_sistema(db: Session):
+    """Acerta os contadores do dashboard do Super Admin com as tabelas"""
+    try:
+        correcoes = reconciliar_contadores(db)
+        if correcoes:
+            print(f"✅ Contadores do sistema reconciliados: {correcoes}")
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Erro ao reconciliar contadores do sistema: {e}")
 
-            # TERCEIRO: Criar a VIEW
-            db.execute(text(f'CREATE VIEW "{view_name}" AS {view_sql}'))
-            db.commit()
-            print(f"  ✓ View {view_name} criada")
-        except Exception as e:
-            print(f"  ⚠️ Erro ao criar view {view_name}: {e}")
-            db.rollback()
 
-    print("✅ Views PostgreSQL verificadas/criadas.")
+def preparar_busca_produtos(db: Session):
+    """Cria o índice textual de produtos e indexa os produtos já existentes"""
+    try:
+        criar_indice_busca(db)
+        if indice_vazio(db):
+            print(f"🔎 Índice de busca de produtos criado: {reconstruir_indice(db)} produtos.")
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Erro ao preparar a busca de produtos: {e}")
+
+
+def limpar_log_catalogo(db: Session):
+    """Apaga o log de alterações de catálogo mais antigo que a retenção"""
+    try:
+        apagadas = limpar_alteracoes_antigas(db)
+        if apagadas:
+            print(f"🧹 Log de alterações de catálogo: {apagadas} registros com mais de {DIAS_RETENCAO} dias removidos")
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Erro ao limpar o log de alterações de catálogo: {e}")
 
 
 # --- POPULAÇÃO DE DADOS INICIAIS (SEED COMPLETO) ---
@@ -897,22 +797,23 @@ def initialize_database():
         print("📦 Criando tabelas do banco de dados...")
         try:
             Base.metadata.create_all(bind=engine)
+            create_missing_indexes()
             print("✅ Tabelas criadas/verificadas com sucesso!")
         except Exception as e:
             print(f"❌ Erro ao criar tabelas: {e}")
             return  # Para aqui se não conseguir criar tabelas
         # *** FIM DA ADIÇÃO ***
 
-        # 2. CRIAR VIEWS E TRIGGERS (agora as tabelas já existem)
+        # 2. REMOVER VIEWS ANTIGAS E CRIAR TRIGGERS (agora as tabelas já existem)
         db: Session = SessionLocal()
         try:
             if is_sqlite():
                 print("🔧 Banco SQLite detectado")
-                create_sqlite_views(db)
+                drop_sqlite_views(db)
                 create_sqlite_triggers(db)
             elif is_postgresql():
                 print("🐘 Banco PostgreSQL detectado")
-                create_postgresql_views(db)
+                drop_postgresql_views(db)
                 create_postgresql_triggers(db)
             else:
                 print("⚠️  Tipo de banco não reconhecido")
@@ -932,6 +833,41 @@ def initialize_database():
             print("⚠️  Ambiente PROD: Dados de teste NÃO serão criados.")
             print("💡 Acesse a API com: admin@repcom.com / admin123")
 
+        # 5. LIVRO DE COMISSÕES (bancos com pedidos anteriores ao livro)
+        db = SessionLocal()
+        try:
+            backfill_comissoes(db)
+        finally:
+            db.close()
+
+        # 6. RESUMOS DE VENDAS (bancos com pedidos anteriores aos resumos)
+        db = SessionLocal()
+        try:
+            backfill_resumos_vendas(db)
+        finally:
+            db.close()
+
+        # 7. CONTADORES DO SISTEMA (corrige o seed e bancos anteriores aos contadores)
+        db = SessionLocal()
+        try:
+            reconciliar_contadores_sistema(db)
+        finally:
+            db.close()
+
+        # 8. LOG DE ALTERAÇÕES DE CATÁLOGO (sincronização offline)
+        db = SessionLocal()
+        try:
+            limpar_log_catalogo(db)
+        finally:
+            db.close()
+
+        # 9. BUSCA DE PRODUTOS (índice textual e produtos do seed/anteriores)
+        db = SessionLocal()
+        try:
+            preparar_busca_produtos(db)
+        finally:
+            db.close()
+
         print(f"{'=' * 70}")
         print(f"✅ INICIALIZAÇÃO CONCLUÍDA")
         print(f"{'=' * 70}\n")
@@ -959,12 +895,14 @@ app.include_router(gestor_clientes_router)
 app.include_router(gestor_catalogo_router)
 app.include_router(gestor_config_router)
 app.include_router(gestor_relatorios_router)
+app.include_router(gestor_analises_router)
 app.include_router(gestor_pedidos_router)
 app.include_router(gestor_logs_router)
 app.include_router(importacao_router)
 
 # Vendedor
 app.include_router(vendedor_pedidos_router)
+app.include_router(vendedor_rascunhos_router)
 app.include_router(vendedor_catalogo_router)
 app.include_router(vendedor_clientes_router)
 app.include_router(vendedor_dashboard_router)
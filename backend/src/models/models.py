@@ -10,11 +10,15 @@ from sqlalchemy import (
     Date,
     ForeignKey,
     UniqueConstraint,
+    Index,
     JSON,
     text,
     extract,
+    select,
+    case,
+    LargeBinary,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 import bcrypt
 
@@ -356,6 +360,8 @@ class Produto(Base):
 
     __table_args__ = (
         UniqueConstraint("ID_EMPRESA", "CD_PRODUTO", name="UK_PRODUTOS_CODIGO_EMPRESA"),
+        # Listagem do gestor: ordem alfabética paginada por (DS_PRODUTO, ID_PRODUTO)
+        Index("IX_PRODUTOS_EMPRESA_DESCRICAO", "ID_EMPRESA", "DS_PRODUTO", "ID_PRODUTO"),
     )
 
     # Relacionamentos
@@ -388,10 +394,34 @@ class VariacaoProduto(Base):
     fl_ativa = Column("FL_ATIVA", Boolean, default=True)
     dt_criacao = Column("DT_CRIACAO", DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index("IX_VARIACOES_PRODUTO", "ID_PRODUTO"),)
+
     produto = relationship("Produto", back_populates="variacoes")
     itens_pedido = relationship("ItemPedido", back_populates="variacao")
 
 
+class BuscaProduto(Base):
+    """
+    Mapeia a tabela TB_BUSCA_PRODUTOS.
+    Texto de busca de cada produto, já normalizado (minúsculo, sem acentos):
+    códigos (produto e SKUs das variações) e descrição. Indexado por FTS5
+    no SQLite e por tsvector (GIN) no PostgreSQL
+    (ver 'src.services.busca_produtos').
+    """
+
+    __tablename__ = "TB_BUSCA_PRODUTOS"
+
+    id_produto = Column(
+        "ID_PRODUTO",
+        Integer,
+        ForeignKey("TB_PRODUTOS.ID_PRODUTO", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    id_empresa = Column("ID_EMPRESA", Integer, nullable=False, index=True)
+    tx_codigos = Column("TX_CODIGOS", Text, nullable=False, default="")
+    tx_descricao = Column("TX_DESCRICAO", Text, nullable=False, default="")
+
+
 # ============================================
 # PAGAMENTOS E COMISSÕES
 # ============================================
@@ -519,6 +549,16 @@ class Pedido(Base):
         "ComissaoPedido", back_populates="pedido", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Numeração sequencial por empresa (NULL permitido em pedidos antigos)
+        Index("UK_PEDIDOS_EMPRESA_NUMERO", "ID_EMPRESA", "NR_PEDIDO", unique=True),
+        # Listagens paginadas por (DT_PEDIDO, ID_PEDIDO): vendedor e gestor
+        Index("IX_PEDIDOS_VENDEDOR_DATA", "ID_USUARIO", "ID_EMPRESA", "DT_PEDIDO", "ID_PEDIDO"),
+        Index("IX_PEDIDOS_EMPRESA_DATA", "ID_EMPRESA", "DT_PEDIDO", "ID_PEDIDO"),
+        # Períodos do vendedor em todas as empresas (ex: comissões do mês)
+        Index("IX_PEDIDOS_USUARIO_DATA", "ID_USUARIO", "DT_PEDIDO"),
+    )
+
 
 class ItemPedido(Base):
     __tablename__ = "TB_ITENS_PEDIDO"
@@ -552,6 +592,8 @@ class ItemPedido(Base):
     produto = relationship("Produto", back_populates="itens_pedido")
     variacao = relationship("VariacaoProduto", back_populates="itens_pedido")
 
+    __table_args__ = (Index("IX_ITENS_PEDIDO_PEDIDO", "ID_PEDIDO"),)
+
 
 class ComissaoPedido(Base):
     __tablename__ = "TB_COMISSOES_PEDIDO"
@@ -579,6 +621,9 @@ class ComissaoPedido(Base):
         "Usuario", back_populates="comissoes_pedido", foreign_keys=[id_usuario]
     )
 
+    # Relatórios partem dos pedidos do período e buscam o lançamento de cada um
+    __table_args__ = (Index("IX_COMISSOES_PEDIDO_PEDIDO", "ID_PEDIDO"),)
+
 
 # ============================================
 # AUDITORIA
@@ -621,6 +666,12 @@ class LogAuditoria(Base):
         "Usuario", back_populates="logs_auditoria", foreign_keys=[id_usuario]
     )
 
+    # Listagens de logs filtradas por período (gestor: da organização; admin: todas)
+    __table_args__ = (
+        Index("IX_LOGS_ORGANIZACAO_DATA", "ID_ORGANIZACAO", "DT_ACAO"),
+        Index("IX_LOGS_DATA", "DT_ACAO"),
+    )
+
 
 # ============================================
 # CATÁLOGOS E LISTAS DE PREÇO (NOVO)
@@ -683,6 +734,7 @@ class ItemCatalogo(Base):
 
     __table_args__ = (
         UniqueConstraint("ID_CATALOGO", "ID_PRODUTO", name="UK_CATALOGO_PRODUTO"),
+        Index("IX_ITENS_CATALOGO_PRODUTO", "ID_PRODUTO"),
     )
 
     # Relacionamentos
@@ -697,87 +749,131 @@ class ItemCatalogo(Base):
 # criar estas "tabelas" pois elas já existem no DB (são Views).
 
 
+# ============================================
+# RESUMOS MENSAIS DE VENDAS (ROLLUPS)
+# Mantidos incrementalmente a cada pedido gravado/cancelado
+# (ver 'src.services.resumos_vendas'). Substituem as antigas Views VW_*,
+# por isso os modelos mantêm os nomes Vw*.
+# ============================================
+
+
 class VwVendasVendedorMes(Base):
-    """Mapeia a View VW_VENDAS_VENDEDOR_MES"""
+    """Mapeia a tabela TB_RESUMO_VENDAS_VENDEDOR_MES"""
 
-    __tablename__ = "VW_VENDAS_VENDEDOR_MES"
+    __tablename__ = "TB_RESUMO_VENDAS_VENDEDOR_MES"
 
-    # Definimos as colunas exatamente como na sua View
-    # Precisamos de uma "chave primária" para o SQLAlchemy,
-    # mesmo que a View não tenha uma. Usamos uma combinação única.
     id_usuario = Column("ID_USUARIO", Integer, primary_key=True)
-    no_vendedor = Column("NO_VENDEDOR", String)
-    id_organizacao = Column("ID_ORGANIZACAO", Integer)
-    # Usamos .server_default para 'datas', pois elas não são definidas pelo Python
-    dt_mes_referencia = Column(
-        "DT_MES_REFERENCIA",
-        DateTime,
-        primary_key=True,
-        server_default=text("CURRENT_TIMESTAMP"),
+    dt_mes_referencia = Column("DT_MES_REFERENCIA", DateTime, primary_key=True)
+    id_organizacao = Column("ID_ORGANIZACAO", Integer, nullable=False)
+    qt_pedidos = Column("QT_PEDIDOS", Integer, nullable=False, default=0)
+    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric(15, 2), nullable=False, default=0)
+
+    # Nome e ticket médio são derivados na leitura (o nome nunca fica desatualizado)
+    no_vendedor = column_property(
+        select(Usuario.no_completo).where(Usuario.id_usuario == id_usuario).scalar_subquery()
+    )
+    vl_ticket_medio = column_property(
+        case((qt_pedidos > 0, vl_total_vendas / qt_pedidos), else_=0)
     )
-    qt_pedidos = Column("QT_PEDIDOS", Integer)
-    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric)
-    vl_ticket_medio = Column("VL_TICKET_MEDIO", Numeric)
 
+    __table_args__ = (
+        Index("IX_RESUMO_VENDEDOR_ORG_MES", "ID_ORGANIZACAO", "DT_MES_REFERENCIA"),
+    )
 
-class VwComissoesCalculadas(Base):
-    """Mapeia a View VW_COMISSOES_CALCULADAS"""
 
-    __tablename__ = "VW_COMISSOES_CALCULADAS"
+class VwVendasEmpresaMes(Base):
+    """Mapeia a tabela TB_RESUMO_VENDAS_EMPRESA_MES"""
 
-    # Precisamos definir uma chave primária para o SQLAlchemy
-    id_pedido = Column("ID_PEDIDO", Integer, primary_key=True)
+    __tablename__ = "TB_RESUMO_VENDAS_EMPRESA_MES"
 
-    nr_pedido = Column("NR_PEDIDO", String)
-    id_usuario = Column("ID_USUARIO", Integer)
-    no_vendedor = Column("NO_VENDEDOR", String)
-    id_empresa = Column("ID_EMPRESA", Integer)
-    no_empresa = Column("NO_EMPRESA", String)
-    vl_total = Column("VL_TOTAL", Numeric)
-    pc_comissao_aplicada = Column("PC_COMISSAO_APLICADA", Numeric)
-    vl_comissao_calculada = Column("VL_COMISSAO_CALCULADA", Numeric)
-    dt_pedido = Column("DT_PEDIDO", DateTime)
+    id_empresa = Column("ID_EMPRESA", Integer, primary_key=True)
+    dt_mes_referencia = Column("DT_MES_REFERENCIA", DateTime, primary_key=True)
+    id_organizacao = Column("ID_ORGANIZACAO", Integer, nullable=False)
+    qt_pedidos = Column("QT_PEDIDOS", Integer, nullable=False, default=0)
+    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric(15, 2), nullable=False, default=0)
+    # Clientes distintos no mês (mantido a partir de TB_RESUMO_VENDAS_CLIENTE_MES)
+    qt_clientes_atendidos = Column("QT_CLIENTES_ATENDIDOS", Integer, nullable=False, default=0)
 
+    no_empresa = column_property(
+        select(Empresa.no_empresa).where(Empresa.id_empresa == id_empresa).scalar_subquery()
+    )
 
-class VwVendasEmpresaMes(Base):
-    """Mapeia a View VW_VENDAS_EMPRESA_MES"""
+    __table_args__ = (
+        Index("IX_RESUMO_EMPRESA_ORG_MES", "ID_ORGANIZACAO", "DT_MES_REFERENCIA"),
+    )
 
-    __tablename__ = "VW_VENDAS_EMPRESA_MES"
 
-    # Chave primária composta para o SQLAlchemy
-    id_empresa = Column("ID_EMPRESA", Integer, primary_key=True)
-    dt_mes_referencia = Column(
-        "DT_MES_REFERENCIA",
-        DateTime,
-        primary_key=True,
-        server_default=text("CURRENT_TIMESTAMP"),
-    )
+class ResumoVendasClienteMes(Base):
+    """
+    Mapeia a tabela TB_RESUMO_VENDAS_CLIENTE_MES.
+    Pedidos por (empresa, cliente, mês): permite manter a contagem de
+    clientes distintos do resumo por empresa sem recontar os pedidos.
+    """
 
-    no_empresa = Column("NO_EMPRESA", String)
-    id_organizacao = Column("ID_ORGANIZACAO", Integer)
-    qt_pedidos = Column("QT_PEDIDOS", Integer)
-    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric)
-    qt_clientes_atendidos = Column("QT_CLIENTES_ATENDIDOS", Integer)
+    __tablename__ = "TB_RESUMO_VENDAS_CLIENTE_MES"
+
+    id_empresa = Column("ID_EMPRESA", Integer, primary_key=True)
+    dt_mes_referencia = Column("DT_MES_REFERENCIA", DateTime, primary_key=True)
+    id_cliente = Column("ID_CLIENTE", Integer, primary_key=True)
+    qt_pedidos = Column("QT_PEDIDOS", Integer, nullable=False, default=0)
 
 
 class VwVendasPorCidade(Base):
-    """Mapeia a View VW_VENDAS_POR_CIDADE"""
+    """Mapeia a tabela TB_RESUMO_VENDAS_CIDADE_MES (cidade do endereço de entrega)"""
 
-    __tablename__ = "VW_VENDAS_POR_CIDADE"
+    __tablename__ = "TB_RESUMO_VENDAS_CIDADE_MES"
 
-    # Chave primária composta (complexa) para o SQLAlchemy
-    no_cidade = Column("NO_CIDADE", String, primary_key=True)
-    sg_estado = Column("SG_ESTADO", String, primary_key=True)
     id_organizacao = Column("ID_ORGANIZACAO", Integer, primary_key=True)
-    dt_mes_referencia = Column(
-        "DT_MES_REFERENCIA",
-        DateTime,
-        primary_key=True,
-        server_default=text("CURRENT_TIMESTAMP"),
+    no_cidade = Column("NO_CIDADE", String(100), primary_key=True)
+    sg_estado = Column("SG_ESTADO", String(2), primary_key=True)
+    dt_mes_referencia = Column("DT_MES_REFERENCIA", DateTime, primary_key=True)
+    qt_pedidos = Column("QT_PEDIDOS", Integer, nullable=False, default=0)
+    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric(15, 2), nullable=False, default=0)
+
+
+class ResumoVendasProdutoMes(Base):
+    """
+    Mapeia a tabela TB_RESUMO_VENDAS_PRODUTO_MES.
+    Itens vendidos por (empresa, produto, variação, mês). ID_VARIACAO = 0
+    para itens sem variação (a coluna faz parte da chave primária).
+    O valor é o dos itens (VL_TOTAL_ITEM), antes do desconto geral do pedido.
+    """
+
+    __tablename__ = "TB_RESUMO_VENDAS_PRODUTO_MES"
+
+    id_empresa = Column("ID_EMPRESA", Integer, primary_key=True)
+    dt_mes_referencia = Column("DT_MES_REFERENCIA", DateTime, primary_key=True)
+    id_produto = Column("ID_PRODUTO", Integer, primary_key=True)
+    id_variacao = Column("ID_VARIACAO", Integer, primary_key=True, default=0)
+    id_organizacao = Column("ID_ORGANIZACAO", Integer, nullable=False)
+    qt_vendida = Column("QT_VENDIDA", Integer, nullable=False, default=0)
+    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric(15, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        Index("IX_RESUMO_PRODUTO_ORG_MES", "ID_ORGANIZACAO", "DT_MES_REFERENCIA"),
     )
 
-    qt_pedidos = Column("QT_PEDIDOS", Integer)
-    vl_total_vendas = Column("VL_TOTAL_VENDAS", Numeric)
+
+class SketchClientesMes(Base):
+    """
+    Mapeia a tabela TB_SKETCH_CLIENTES_MES.
+    Sketch HyperLogLog dos clientes atendidos por (empresa, vendedor, mês).
+    Sketches podem ser mesclados: "clientes atendidos" de qualquer período
+    ou agrupamento é estimado sem recontar pedidos
+    (ver 'src.services.sketches_clientes').
+    """
+
+    __tablename__ = "TB_SKETCH_CLIENTES_MES"
+
+    id_empresa = Column("ID_EMPRESA", Integer, primary_key=True)
+    id_usuario = Column("ID_USUARIO", Integer, primary_key=True)
+    dt_mes_referencia = Column("DT_MES_REFERENCIA", DateTime, primary_key=True)
+    id_organizacao = Column("ID_ORGANIZACAO", Integer, nullable=False)
+    bl_registros = Column("BL_REGISTROS", LargeBinary, nullable=False)
+
+    __table_args__ = (
+        Index("IX_SKETCH_CLIENTES_ORG_MES", "ID_ORGANIZACAO", "DT_MES_REFERENCIA"),
+    )
 
 
 class RecuperacaoSenha(Base):
@@ -795,3 +891,223 @@ class RecuperacaoSenha(Base):
     dt_criacao = Column("DT_CRIACAO", DateTime, default=datetime.utcnow)
 
     usuario = relationship("Usuario", backref="tokens_recuperacao")
+
+
+class ChaveIdempotencia(Base):
+    """
+    Mapeia a tabela TB_CHAVES_IDEMPOTENCIA.
+    Guarda a resposta de criações de pedido feitas com o header
+    'Idempotency-Key', para que reenvios retornem o mesmo pedido.
+    """
+
+    __tablename__ = "TB_CHAVES_IDEMPOTENCIA"
+
+    id_chave = Column("ID_CHAVE", Integer, primary_key=True)
+    id_usuario = Column(
+        "ID_USUARIO",
+        Integer,
+        ForeignKey("TB_USUARIOS.ID_USUARIO", ondelete="CASCADE"),
+        nullable=False,
+    )
+    ds_chave = Column("DS_CHAVE", String(255), nullable=False)
+    ds_hash_requisicao = Column("DS_HASH_REQUISICAO", String(64), nullable=False)
+    id_pedido = Column(
+        "ID_PEDIDO", Integer, ForeignKey("TB_PEDIDOS.ID_PEDIDO", ondelete="CASCADE")
+    )
+    ds_resposta = Column("DS_RESPOSTA", JSON)
+    dt_expiracao = Column("DT_EXPIRACAO", DateTime, nullable=False)
+    dt_criacao = Column("DT_CRIACAO", DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("ID_USUARIO", "DS_CHAVE", name="UK_CHAVES_IDEMPOTENCIA"),
+    )
+
+
+class FilaEmail(Base):
+    """
+    Mapeia a tabela TB_FILA_EMAILS (Outbox de e-mails).
+    As rotas apenas gravam aqui; o envio é feito pelo processo
+    separado 'src.services.email_worker'.
+    """
+
+    __tablename__ = "TB_FILA_EMAILS"
+
+    id_email = Column("ID_EMAIL", Integer, primary_key=True)
+    tp_email = Column("TP_EMAIL", String(50), nullable=False)
+    ds_destinatarios = Column("DS_DESTINATARIOS", JSON, nullable=False)
+    ds_assunto = Column("DS_ASSUNTO", String(255), nullable=False)
+    no_template = Column("NO_TEMPLATE", String(100), nullable=False)
+    ds_dados_template = Column("DS_DADOS_TEMPLATE", JSON)
+    st_envio = Column("ST_ENVIO", String(20), nullable=False, default="pendente")
+    qt_tentativas = Column("QT_TENTATIVAS", Integer, nullable=False, default=0)
+    ds_ultimo_erro = Column("DS_ULTIMO_ERRO", Text)
+    dt_proxima_tentativa = Column(
+        "DT_PROXIMA_TENTATIVA", DateTime, nullable=False, default=datetime.utcnow
+    )
+    dt_envio = Column("DT_ENVIO", DateTime)
+    dt_criacao = Column("DT_CRIACAO", DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("IX_FILA_EMAILS_PENDENTES", "ST_ENVIO", "DT_PROXIMA_TENTATIVA"),
+    )
+
+
+class SequenciaPedido(Base):
+    """
+    Mapeia a tabela TB_SEQUENCIAS_PEDIDO.
+    Guarda, por empresa, o último número de pedido já reservado.
+    Os workers reservam blocos de números (ver 'src.services.numeracao').
+    """
+
+    __tablename__ = "TB_SEQUENCIAS_PEDIDO"
+
+    id_empresa = Column(
+        "ID_EMPRESA",
+        Integer,
+        ForeignKey("TB_EMPRESAS.ID_EMPRESA", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    nr_ultimo_reservado = Column("NR_ULTIMO_RESERVADO", Integer, nullable=False, default=0)
+    dt_atualizacao = Column(
+        "DT_ATUALIZACAO", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class ReservaEstoquePedido(Base):
+    """
+    Mapeia a tabela TB_RESERVAS_ESTOQUE_PEDIDO.
+    Pedidos cujo estoque foi baixado na criação (ver 'src.services.estoque').
+    Só esses devolvem estoque ao serem cancelados: pedidos anteriores à
+    reserva de estoque não têm registro aqui.
+    """
+
+    __tablename__ = "TB_RESERVAS_ESTOQUE_PEDIDO"
+
+    id_pedido = Column(
+        "ID_PEDIDO",
+        Integer,
+        ForeignKey("TB_PEDIDOS.ID_PEDIDO", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    dt_reserva = Column("DT_RESERVA", DateTime, nullable=False, default=datetime.utcnow)
+
+
+class VersaoDadosOrganizacao(Base):
+    """
+    Mapeia a tabela TB_VERSOES_DADOS.
+    Versão dos dados de relatório da organização: incrementada a cada
+    gravação de pedido, invalida os relatórios em cache em todos os workers
+    (ver 'src.services.cache_relatorios').
+    """
+
+    __tablename__ = "TB_VERSOES_DADOS"
+
+    id_organizacao = Column(
+        "ID_ORGANIZACAO",
+        Integer,
+        ForeignKey("TB_ORGANIZACOES.ID_ORGANIZACAO", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    nr_versao = Column("NR_VERSAO", BigInteger, nullable=False, default=0)
+    dt_atualizacao = Column(
+        "DT_ATUALIZACAO", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class VersaoCatalogoEmpresa(Base):
+    """
+    Mapeia a tabela TB_VERSOES_CATALOGO.
+    Versão dos catálogos da empresa: incrementada a cada alteração de
+    catálogo, item de catálogo, produto, variação (inclusive estoque) ou
+    categoria, invalida os catálogos em cache e os ETags já enviados
+    (ver 'src.services.alteracoes_catalogo').
+    """
+
+    __tablename__ = "TB_VERSOES_CATALOGO"
+
+    id_empresa = Column(
+        "ID_EMPRESA",
+        Integer,
+        ForeignKey("TB_EMPRESAS.ID_EMPRESA", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    nr_versao = Column("NR_VERSAO", BigInteger, nullable=False, default=0)
+    dt_atualizacao = Column(
+        "DT_ATUALIZACAO", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class AlteracaoCatalogo(Base):
+    """
+    Mapeia a tabela TB_ALTERACOES_CATALOGO.
+    Log das alterações de catálogo de cada empresa, na versão
+    (TB_VERSOES_CATALOGO) em que aconteceram; base da sincronização
+    incremental do catálogo offline. ID_PRODUTO nulo = alteração do catálogo
+    inteiro (ex: catálogo desativado); ID_CATALOGO nulo = vale para todos os
+    catálogos da empresa (ex: produto ou estoque).
+    """
+
+    __tablename__ = "TB_ALTERACOES_CATALOGO"
+
+    id_alteracao = Column("ID_ALTERACAO", Integer, primary_key=True)
+    id_empresa = Column(
+        "ID_EMPRESA",
+        Integer,
+        ForeignKey("TB_EMPRESAS.ID_EMPRESA", ondelete="CASCADE"),
+        nullable=False,
+    )
+    nr_versao = Column("NR_VERSAO", BigInteger, nullable=False)
+    id_catalogo = Column("ID_CATALOGO", Integer)
+    id_produto = Column("ID_PRODUTO", Integer)
+    dt_alteracao = Column("DT_ALTERACAO", DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("IX_ALTERACOES_CATALOGO_EMPRESA_VERSAO", "ID_EMPRESA", "NR_VERSAO"),
+    )
+
+
+class ContadorSistema(Base):
+    """
+    Mapeia a tabela TB_CONTADORES_SISTEMA.
+    Totais globais do dashboard do Super Admin (organizações, usuários e
+    pedidos), ajustados na transação de cada gravação. Cada contador é
+    dividido em partições (pela organização) para que gravações de
+    organizações diferentes não disputem a mesma linha; o valor é a soma
+    das partições (ver 'src.services.contadores_sistema').
+    """
+
+    __tablename__ = "TB_CONTADORES_SISTEMA"
+
+    cd_contador = Column("CD_CONTADOR", String(50), primary_key=True)
+    nr_particao = Column("NR_PARTICAO", Integer, primary_key=True)
+    vl_contador = Column("VL_CONTADOR", Numeric(18, 2), nullable=False, default=0)
+    dt_atualizacao = Column(
+        "DT_ATUALIZACAO", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class RascunhoPedido(Base):
+    """
+    Mapeia a tabela TB_RASCUNHOS_PEDIDO (carrinho do vendedor).
+    O rascunho é um Pedido com ST_PEDIDO = 'rascunho'; aqui ficam os dados
+    que só existem enquanto ele é editado: o catálogo usado na precificação
+    e o subtotal dos itens, mantido incrementalmente a cada alteração.
+    """
+
+    __tablename__ = "TB_RASCUNHOS_PEDIDO"
+
+    id_pedido = Column(
+        "ID_PEDIDO",
+        Integer,
+        ForeignKey("TB_PEDIDOS.ID_PEDIDO", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    id_catalogo = Column(
+        "ID_CATALOGO", Integer, ForeignKey("TB_CATALOGOS.ID_CATALOGO"), nullable=False
+    )
+    vl_subtotal = Column("VL_SUBTOTAL", Numeric(15, 2), nullable=False, default=0.00)
+    dt_atualizacao = Column(
+        "DT_ATUALIZACAO", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    pedido = relationship("Pedido")
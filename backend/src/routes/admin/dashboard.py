@@ -1,12 +1,15 @@
 # /src/routes/admin/dashboard.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from decimal import Decimal
 
 from src.database import get_db
-from src.models import models
-from src.schemas import AdminDashboardKpiSchema
+from src.schemas import (
+    AdminDashboardKpiSchema, FilaEmailMetricasSchema, CacheRelatoriosMetricasSchema,
+    ContadoresReconciliacaoSchema
+)
+from src.services.email_worker import profundidade_fila
+from src.services.cache_relatorios import cache_relatorios
+from src.services.contadores_sistema import ler_contadores, reconciliar_contadores
 from src.core.security import get_current_super_admin  # Proteção da rota
 
 # Cria o router
@@ -24,48 +27,43 @@ def get_admin_dashboard_kpis(
     """
     (Super Admin) Retorna KPIs globais de todo o sistema SaaS.
     """
-    try:
-        # 1. KPIs de Organizações
-        total_ativas = db.query(models.Organizacao).filter(
-            models.Organizacao.st_assinatura == 'ativo'
-        ).count()
+    # Contadores mantidos a cada gravação (TB_CONTADORES_SISTEMA), lidos em uma consulta
+    contadores = ler_contadores(db)
+    return AdminDashboardKpiSchema(
+        total_organizacoes_ativas=int(contadores["organizacoes_ativas"]),
+        total_organizacoes_suspensas=int(contadores["organizacoes_suspensas"]),
+        total_gestores_ativos=int(contadores["gestores_ativos"]),
+        total_vendedores_ativos=int(contadores["vendedores_ativos"]),
+        total_pedidos_sistema=int(contadores["pedidos"]),
+        valor_total_pedidos_sistema=contadores["vl_pedidos"]
+    )
 
-        total_suspensas = db.query(models.Organizacao).filter(
-            models.Organizacao.st_assinatura == 'suspenso'
-        ).count()
 
-        # 2. KPIs de Usuários (apenas ativos)
-        total_gestores = db.query(models.Usuario).filter(
-            models.Usuario.tp_usuario == 'gestor',
-            models.Usuario.fl_ativo is True
-        ).count()
+@admin_dashboard_router.post("/contadores/reconciliar", response_model=ContadoresReconciliacaoSchema)
+def reconciliar_contadores_sistema(
+    db: Session = Depends(get_db)
+):
+    """
+    (Super Admin) Recalcula os contadores globais a partir das tabelas e
+    corrige divergências. Retorna as correções aplicadas.
+    """
+    return ContadoresReconciliacaoSchema(correcoes=reconciliar_contadores(db))
 
-        total_vendedores = db.query(models.Usuario).filter(
-            models.Usuario.tp_usuario == 'vendedor',
-            models.Usuario.fl_ativo is True
-        ).count()
 
-        # 3. KPIs de Pedidos (Globais)
-        # Agrega a contagem e a soma dos valores de todos os pedidos não cancelados
-        kpis_pedidos = db.query(
-            func.count(models.Pedido.id_pedido).label("total_pedidos"),
-            func.sum(models.Pedido.vl_total).label("valor_total")
-        ).filter(
-            models.Pedido.st_pedido != 'cancelado'
-        ).first()
+@admin_dashboard_router.get("/fila-emails", response_model=FilaEmailMetricasSchema)
+def get_metricas_fila_emails(
+    db: Session = Depends(get_db)
+):
+    """
+    (Super Admin) Profundidade da fila de e-mails processada pelo email_worker.
+    """
+    return FilaEmailMetricasSchema(**profundidade_fila(db))
 
-        return AdminDashboardKpiSchema(
-            total_organizacoes_ativas=total_ativas,
-            total_organizacoes_suspensas=total_suspensas,
-            total_gestores_ativos=total_gestores,
-            total_vendedores_ativos=total_vendedores,
-            total_pedidos_sistema=kpis_pedidos.total_pedidos or 0,
-            valor_total_pedidos_sistema=kpis_pedidos.valor_total or Decimal(0.0)
-        )
 
-    except Exception as e:
-        # Se as queries falharem
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erro ao calcular KPIs: {str(e)}"
-        )
\ No newline at end of file
+@admin_dashboard_router.get("/cache-relatorios", response_model=CacheRelatoriosMetricasSchema)
+def get_metricas_cache_relatorios():
+    """
+    (Super Admin) Acertos/falhas do cache de relatórios do gestor.
+    O cache é por worker: cada chamada mostra os números do worker que a atendeu.
+    """
+    return CacheRelatoriosMetricasSchema(**cache_relatorios.metricas())
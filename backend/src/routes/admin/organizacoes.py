@@ -14,6 +14,9 @@ from src.schemas import (
     UsuarioSchema,
 )
 from src.core.security import get_current_super_admin
+from src.services.contadores_sistema import (
+    contadores_organizacao, contadores_usuario, diferenca, somar_contadores
+)
 
 # Cria o router
 admin_orgs_router = APIRouter(
@@ -78,6 +81,10 @@ def create_organizacao_e_gestor(
         )
         db_gestor.set_password(org_in.gestor.password)
         db.add(db_gestor)
+        somar_contadores(db, {
+            **contadores_organizacao(db_org.st_assinatura),
+            **contadores_usuario(db_gestor.tp_usuario, db_gestor.fl_ativo),
+        }, db_org.id_organizacao)
 
         db.commit()
         db.refresh(db_org)
@@ -158,8 +165,12 @@ def update_organizacao(
                 status_code=409, detail="CNPJ já está em uso por outra organização."
             )
 
+    st_anterior = db_org.st_assinatura
     for key, value in update_data.items():
         setattr(db_org, key, value)
+    somar_contadores(db, diferenca(
+        contadores_organizacao(st_anterior), contadores_organizacao(db_org.st_assinatura)
+    ), id_organizacao)
 
     db.commit()
     db.refresh(db_org)
@@ -1,6 +1,6 @@
 # /src/routes/auth.py
 # VERSÃO CORRIGIDA E LIMPA (usando Pydantic v2 .model_validate())
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 import uuid
@@ -227,7 +227,6 @@ def get_current_user_session(
 @auth_router.post("/forgot-password", status_code=status.HTTP_200_OK)
 def forgot_password(
     request: ForgotPasswordRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -250,7 +249,6 @@ def forgot_password(
             id_usuario=user.id_usuario, ds_token=token, dt_expiracao=expires_at
         )
         db.add(recuperacao)
-        db.commit()
 
         # Monta o link (ajuste a URL do frontend conforme necessário)
         # Em produção, usar variável de ambiente para o domínio do front
@@ -259,10 +257,9 @@ def forgot_password(
         frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
         reset_link = f"{frontend_url}/redefinir-senha?token={token}"
 
-        # Envia email
-        EmailService.send_password_reset_email(
-            background_tasks, user.ds_email, reset_link
-        )
+        # Coloca o email na fila (gravado junto com o token)
+        EmailService.send_password_reset_email(db, user.ds_email, reset_link)
+        db.commit()
 
         return {"message": "Se o email existir, um link de recuperação será enviado."}
 
@@ -0,0 +1,74 @@
+# /src/routes/gestor/analises.py
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+
+from src.database import get_db
+from src.schemas import CurvaAbcItemSchema, TabelaCruzadaSchema
+from src.core.security import get_current_gestor_org_id
+from src.services.periodos import intervalo_periodo
+from src.services.analise_pedidos import (
+    DIMENSOES, PADRAO_DIMENSAO, PADRAO_METRICA,
+    curva_abc, frame_pedidos, tabela_cruzada
+)
+
+# Cria o router
+gestor_analises_router = APIRouter(
+    prefix="/api/gestor/analises",
+    tags=["17. Gestor - Análises"],
+    dependencies=[Depends(get_current_gestor_org_id)]
+)
+
+
+@gestor_analises_router.get("/curva-abc", response_model=List[CurvaAbcItemSchema])
+def get_curva_abc(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    dimensao: str = Query("cliente", pattern="^(cliente|produto|vendedor|empresa)$"),
+    metrica: str = Query("vl_total", pattern=PADRAO_METRICA),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    pc_limite_a: float = Query(80, gt=0, lt=100),
+    pc_limite_b: float = Query(95, gt=0, le=100)
+):
+    """
+    Curva ABC de clientes, produtos, vendedores ou empresas no período
+    (sem datas, o mês atual).
+    """
+    if pc_limite_b < pc_limite_a:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="pc_limite_b deve ser maior ou igual a pc_limite_a."
+        )
+
+    frame = frame_pedidos(db, id_organizacao)
+    return curva_abc(
+        frame, dimensao, intervalo_periodo(start_date, end_date), metrica, pc_limite_a, pc_limite_b
+    )
+
+
+@gestor_analises_router.get("/tabela-cruzada", response_model=TabelaCruzadaSchema)
+def get_tabela_cruzada(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    linhas: List[str] = Query(["vendedor"]),
+    coluna: Optional[str] = Query(None, pattern=PADRAO_DIMENSAO),
+    metrica: str = Query("vl_total", pattern=PADRAO_METRICA),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    Tabela cruzada das vendas no período (sem datas, o mês atual).
+    Ex: ?linhas=vendedor&linhas=empresa&coluna=mes
+    """
+    dimensoes = linhas + ([coluna] if coluna else [])
+    if any(dimensao not in DIMENSOES for dimensao in linhas) or len(set(dimensoes)) != len(dimensoes):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Dimensões inválidas ou repetidas. Use: {', '.join(DIMENSOES)}."
+        )
+
+    frame = frame_pedidos(db, id_organizacao)
+    resultado = tabela_cruzada(frame, linhas, coluna, intervalo_periodo(start_date, end_date), metrica)
+    return TabelaCruzadaSchema(metrica=metrica, dimensoes_linhas=linhas, dimensao_coluna=coluna, **resultado)
@@ -11,6 +11,7 @@ from src.schemas import (
     RegraComissaoCreate, RegraComissaoSchema, RegraComissaoUpdate
 )
 from src.core.security import get_current_gestor_org_id
+from src.services.comissoes import invalidar_indice_regras
 
 # Cria o router
 gestor_config_router = APIRouter(
@@ -175,6 +176,7 @@ def create_regra_comissao(
     db.add(db_regra)
     db.commit()
     db.refresh(db_regra)
+    invalidar_indice_regras(id_organizacao)
     
     # Re-busca para carregar relacionamentos
     return db.query(models.RegraComissao).options(
@@ -205,6 +207,7 @@ def update_regra_comissao(
 
     db.commit()
     db.refresh(db_regra)
+    invalidar_indice_regras(id_organizacao)
     return db_regra
 
 @gestor_config_router.delete("/regras-comissao/{id_regra}", status_code=status.HTTP_204_NO_CONTENT)
@@ -223,4 +226,5 @@ def delete_regra_comissao(
         
     db.delete(db_regra)
     db.commit()
+    invalidar_indice_regras(id_organizacao)
     return
\ No newline at end of file
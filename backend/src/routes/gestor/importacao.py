@@ -13,6 +13,8 @@ from src.database import get_db
 from src.models import models
 from src.core.security import get_current_gestor_org_id
 from src.routes.gestor.produtos import get_catalogo_by_id, get_produto_by_id
+from src.services.alteracoes_catalogo import marcar_catalogo_alterado
+from src.services.busca_produtos import indexar_produtos
 
 importacao_router = APIRouter(
     prefix="/api/gestor/importacao",
@@ -117,6 +119,7 @@ async def importar_catalogo(
     df = df.iloc[1:]
 
     processed_count = 0
+    produtos_alterados = set()
     errors = []
 
     for index, row in df.iterrows():
@@ -247,10 +250,16 @@ async def importar_catalogo(
                 db.add(item_catalogo)
 
             processed_count += 1
+            produtos_alterados.add(produto.id_produto)
 
         except Exception as e:
             errors.append(f"Linha {index + 1}: {str(e)}")
 
+    # Variações valem para todos os catálogos da empresa (e os preços, para este)
+    if produtos_alterados:
+        marcar_catalogo_alterado(db, id_empresa, produtos_alterados)
+        db.flush()
+        indexar_produtos(db, produtos_alterados)
     db.commit()
 
     return {
@@ -8,7 +8,7 @@ from src.database import get_db
 from src.models import models
 from src.schemas import LogAuditoriaSchema
 from src.core.security import get_current_gestor_org_id
-from src.routes.gestor.relatorios import get_date_filters  # Reutiliza o helper de data
+from src.services.periodos import Intervalo, filtro_periodo, intervalo_datas
 
 # Cria o router
 gestor_logs_router = APIRouter(
@@ -18,21 +18,14 @@ gestor_logs_router = APIRouter(
 )
 
 
-@gestor_logs_router.get("/", response_model=List[LogAuditoriaSchema])
-def get_organizacao_logs(
-    id_organizacao: int = Depends(get_current_gestor_org_id),  # Pega a Org do token
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=500),
-    # Filtros
-    id_usuario: Optional[int] = Query(None),
-    tp_entidade: Optional[str] = Query(None),
-    start_date: Optional[date] = Query(None),
-    end_date: Optional[date] = Query(None)
+def consultar_logs_organizacao(
+    db: Session,
+    id_organizacao: int,
+    id_usuario: Optional[int] = None,
+    tp_entidade: Optional[str] = None,
+    intervalo: Optional[Intervalo] = None
 ):
-    """
-    (Gestor) Lista os logs de auditoria APENAS da sua organização.
-    """
+    """ Logs da organização, mais recentes primeiro (índice IX_LOGS_ORGANIZACAO_DATA) """
     # Filtro base OBRIGATÓRIO pela organização
     query = db.query(models.LogAuditoria).options(
         joinedload(models.LogAuditoria.usuario)
@@ -46,11 +39,30 @@ def get_organizacao_logs(
         query = query.filter(models.LogAuditoria.id_usuario == id_usuario)
     if tp_entidade:
         query = query.filter(models.LogAuditoria.tp_entidade == tp_entidade)
+    if intervalo:
+        query = query.filter(filtro_periodo(models.LogAuditoria.dt_acao, intervalo))
+
+    return query.order_by(models.LogAuditoria.dt_acao.desc())
 
-    if start_date and end_date:
-        start, end = get_date_filters(start_date, end_date)
-        query = query.filter(models.LogAuditoria.dt_acao.between(start, end))
 
-    logs = query.order_by(models.LogAuditoria.dt_acao.desc()).offset(skip).limit(limit).all()
+@gestor_logs_router.get("/", response_model=List[LogAuditoriaSchema])
+def get_organizacao_logs(
+    id_organizacao: int = Depends(get_current_gestor_org_id),  # Pega a Org do token
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    # Filtros
+    id_usuario: Optional[int] = Query(None),
+    tp_entidade: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    (Gestor) Lista os logs de auditoria APENAS da sua organização.
+    """
+    intervalo = intervalo_datas(start_date, end_date) if start_date and end_date else None
+    logs = consultar_logs_organizacao(
+        db, id_organizacao, id_usuario, tp_entidade, intervalo
+    ).offset(skip).limit(limit).all()
 
     return [LogAuditoriaSchema.model_validate(log, from_attributes=True) for log in logs]
\ No newline at end of file
@@ -1,13 +1,20 @@
 # /src/routes/gestor/pedidos.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
-from fastapi import BackgroundTasks
 from src.services.email import EmailService
+from src.services.comissoes import registrar_comissoes
+from src.services.resumos_vendas import registrar_sketches, registrar_vendas, registrar_vendas_produtos
+from src.services.contadores_sistema import registrar_contadores_pedidos
+from src.services.cache_relatorios import marcar_dados_alterados
+from src.services.estoque import devolver_estoque_pedido
+from src.services.paginacao import paginar_pedidos, definir_proximo_cursor
+from src.services.resumo_pedidos import consultar_resumo_pedidos
+from src.services.exportacao import PADRAO_FORMATO, resposta_exportacao
 from src.database import get_db
 from src.models import models
-from src.schemas import PedidoCompletoSchema, PedidoStatusUpdate
+from src.schemas import PedidoCompletoSchema, PedidoStatusUpdate, PedidoResumoSchema
 from src.core.security import get_current_gestor_org_id, get_current_user
 
 # Cria o router
@@ -39,7 +46,8 @@ def get_pedido_by_id_gestor(
         models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
     ).filter(
         models.Pedido.id_pedido == id_pedido,
-        models.Empresa.id_organizacao == id_organizacao  # Valida a organização
+        models.Empresa.id_organizacao == id_organizacao,  # Valida a organização
+        models.Pedido.st_pedido != 'rascunho'  # Rascunhos são privados do vendedor
     ).first()
 
     if not pedido:
@@ -50,12 +58,45 @@ def get_pedido_by_id_gestor(
     return pedido
 
 
+# Colunas de consultar_resumo_pedidos, na mesma ordem
+CABECALHO_EXPORTACAO_PEDIDOS = [
+    "ID Pedido", "Nº Pedido", "Status", "Valor Total", "Data Pedido", "ID Cliente", "Cliente",
+    "ID Vendedor", "Vendedor", "ID Empresa", "Empresa", "Qtd. Itens",
+]
+
+
+def filtrar_pedidos_organizacao(
+    query,
+    id_organizacao: int,
+    id_vendedor: Optional[int] = None,
+    id_empresa: Optional[int] = None,
+    id_cliente: Optional[int] = None,
+    st_pedido: Optional[str] = None
+):
+    """ Filtros da listagem do gestor (a consulta já deve ter o JOIN com Empresa) """
+    query = query.filter(
+        models.Empresa.id_organizacao == id_organizacao,
+        models.Pedido.st_pedido != 'rascunho'
+    )
+    if id_vendedor:
+        query = query.filter(models.Pedido.id_usuario == id_vendedor)
+    if id_empresa:
+        query = query.filter(models.Pedido.id_empresa == id_empresa)
+    if id_cliente:
+        query = query.filter(models.Pedido.id_cliente == id_cliente)
+    if st_pedido:
+        query = query.filter(models.Pedido.st_pedido == st_pedido)
+    return query
+
+
 @gestor_pedidos_router.get("/", response_model=List[PedidoCompletoSchema])
 def get_pedidos_da_organizacao(
+    response: Response,
     id_organizacao: int = Depends(get_current_gestor_org_id),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Valor do header X-Next-Cursor da página anterior"),
     # Filtros do PRD
     id_vendedor: Optional[int] = Query(None),
     id_empresa: Optional[int] = Query(None),
@@ -64,6 +105,7 @@ def get_pedidos_da_organizacao(
 ):
     """
     Lista todos os pedidos da organização, com filtros.
+    Páginas seguintes: use 'cursor' (header X-Next-Cursor) em vez de 'skip'.
     """
     query = db.query(models.Pedido).options(
         joinedload(models.Pedido.cliente),
@@ -71,25 +113,66 @@ def get_pedidos_da_organizacao(
         joinedload(models.Pedido.empresa)
     ).join(
         models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
-    ).filter(
-        models.Empresa.id_organizacao == id_organizacao
+    )
+    query = filtrar_pedidos_organizacao(
+        query, id_organizacao, id_vendedor, id_empresa, id_cliente, st_pedido
     )
 
-    # Aplica filtros
-    if id_vendedor:
-        query = query.filter(models.Pedido.id_usuario == id_vendedor)
-    if id_empresa:
-        query = query.filter(models.Pedido.id_empresa == id_empresa)
-    if id_cliente:
-        query = query.filter(models.Pedido.id_cliente == id_cliente)
-    if st_pedido:
-        query = query.filter(models.Pedido.st_pedido == st_pedido)
-
-    pedidos = query.order_by(models.Pedido.dt_pedido.desc()).offset(skip).limit(limit).all()
+    pedidos = paginar_pedidos(query, limit, skip, cursor).all()
+    definir_proximo_cursor(response, pedidos, limit)
 
     return [PedidoCompletoSchema.model_validate(p, from_attributes=True) for p in pedidos]
 
 
+@gestor_pedidos_router.get("/resumo", response_model=List[PedidoResumoSchema])
+def get_resumo_pedidos_da_organizacao(
+    response: Response,
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Valor do header X-Next-Cursor da página anterior"),
+    id_vendedor: Optional[int] = Query(None),
+    id_empresa: Optional[int] = Query(None),
+    id_cliente: Optional[int] = Query(None),
+    st_pedido: Optional[str] = Query(None)
+):
+    """
+    Listagem resumida (uma única consulta, só colunas) com os mesmos filtros
+    e paginação de GET /. O detalhe completo fica em GET /{id_pedido}.
+    """
+    query = filtrar_pedidos_organizacao(
+        consultar_resumo_pedidos(db), id_organizacao, id_vendedor, id_empresa, id_cliente, st_pedido
+    )
+
+    linhas = paginar_pedidos(query, limit, skip, cursor).all()
+    definir_proximo_cursor(response, linhas, limit)
+
+    return [PedidoResumoSchema.model_validate(linha, from_attributes=True) for linha in linhas]
+
+
+@gestor_pedidos_router.get("/exportar")
+def exportar_pedidos_da_organizacao(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    formato: str = Query("csv", pattern=PADRAO_FORMATO),
+    id_vendedor: Optional[int] = Query(None),
+    id_empresa: Optional[int] = Query(None),
+    id_cliente: Optional[int] = Query(None),
+    st_pedido: Optional[str] = Query(None)
+):
+    """
+    Exporta em CSV ou XLSX todos os pedidos da listagem (mesmos filtros),
+    com as colunas da listagem resumida. O arquivo é gerado em fluxo.
+    """
+    def montar_consulta(db: Session):
+        query = filtrar_pedidos_organizacao(
+            consultar_resumo_pedidos(db), id_organizacao, id_vendedor, id_empresa, id_cliente, st_pedido
+        )
+        return query.order_by(models.Pedido.dt_pedido.desc(), models.Pedido.id_pedido.desc())
+
+    return resposta_exportacao(formato, "pedidos", CABECALHO_EXPORTACAO_PEDIDOS, montar_consulta)
+
+
 @gestor_pedidos_router.get("/{id_pedido}", response_model=PedidoCompletoSchema)
 def get_pedido_especifico_gestor(
     id_pedido: int,
@@ -107,7 +190,6 @@ def get_pedido_especifico_gestor(
 @gestor_pedidos_router.post("/{id_pedido}/reenviar-email")
 def reenviar_email_pedido(
     id_pedido: int,
-    background_tasks: BackgroundTasks,
     id_organizacao: int = Depends(get_current_gestor_org_id),
     db: Session = Depends(get_db)
 ):
@@ -117,10 +199,11 @@ def reenviar_email_pedido(
         raise HTTPException(status_code=400, detail="Cliente não possui e-mail cadastrado.")
         
     EmailService.send_order_confirmation(
-        background_tasks=background_tasks,
+        db=db,
         pedido=db_pedido,
         emails_to=[db_pedido.cliente.ds_email]
     )
+    db.commit()
     return {"message": "E-mail enviado para a fila de processamento."}
 
 
@@ -128,7 +211,6 @@ def reenviar_email_pedido(
 def update_status_pedido(
     id_pedido: int,
     status_in: PedidoStatusUpdate,
-    background_tasks: BackgroundTasks,
     id_organizacao: int = Depends(get_current_gestor_org_id),
     current_user: models.Usuario = Depends(get_current_user),  # Pega o usuário (Gestor)
     db: Session = Depends(get_db)
@@ -159,18 +241,29 @@ def update_status_pedido(
     db_pedido.ds_observacoes = observacao
 
     try:
-        db.commit()
-        db.refresh(db_pedido)
+        if novo_status == 'cancelado':
+            devolver_estoque_pedido(db, db_pedido)
+            registrar_vendas(db, [db_pedido], sinal=-1)
+            registrar_vendas_produtos(db, [db_pedido], sinal=-1)
+            registrar_sketches(db, [db_pedido], sinal=-1)
+            registrar_contadores_pedidos(db, [db_pedido], sinal=-1)
+
+        # Atualiza o livro de comissões (ex: cancelamento remove a comissão)
+        registrar_comissoes(db, [db_pedido])
+        marcar_dados_alterados(db, id_organizacao)
 
-        # --- ENVIO DE EMAIL ---
+        # --- ENVIO DE EMAIL (fila gravada junto com a mudança de status) ---
         if db_pedido.cliente.ds_email:
             EmailService.send_order_confirmation(
-                background_tasks=background_tasks,
+                db=db,
                 pedido=db_pedido,
                 emails_to=[db_pedido.cliente.ds_email] # Envia para o cliente
                 # Pode adicionar o email do vendedor na lista se quiser cópia
             )
 
+        db.commit()
+        db.refresh(db_pedido)
+
         # (Aqui dispararia a lógica de Notificações em tempo real - Fase 2)
 
         return PedidoCompletoSchema.model_validate(db_pedido, from_attributes=True)
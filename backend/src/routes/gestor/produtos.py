@@ -1,5 +1,5 @@
 # /src/routes/gestor/produtos.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
@@ -19,6 +19,9 @@ from src.schemas import (
     ItemCatalogoCreate, ItemCatalogoUpdate, ItemCatalogoSchema
 )
 from src.core.security import get_current_gestor_org_id
+from src.services.alteracoes_catalogo import marcar_catalogo_alterado, marcar_catalogo_alterado_organizacao
+from src.services.busca_produtos import consulta_busca, indexar_produtos
+from src.services.paginacao import paginar_produtos, definir_proximo_cursor_produtos
 
 # Cria o router
 gestor_produtos_router = APIRouter(
@@ -125,6 +128,7 @@ def update_categoria(
     for key, value in update_data.items():
         setattr(db_categoria, key, value)
 
+    marcar_catalogo_alterado_organizacao(db, id_organizacao)
     db.commit()
     db.refresh(db_categoria)
     return CategoriaProdutoSchema.model_validate(db_categoria, from_attributes=True)
@@ -166,6 +170,9 @@ def create_produto(
     
     try:
         db.add(db_produto)
+        db.flush()
+        marcar_catalogo_alterado(db, db_produto.id_empresa, [db_produto.id_produto])
+        indexar_produtos(db, [db_produto.id_produto])
         db.commit()
         db.refresh(db_produto)
         
@@ -189,22 +196,74 @@ def create_produto(
 
 @gestor_produtos_router.get("/produtos", response_model=List[ProdutoCompletoSchema])
 def get_produtos_da_organizacao(
+    response: Response,
     id_organizacao: int = Depends(get_current_gestor_org_id),
     db: Session = Depends(get_db),
-    id_empresa: Optional[int] = None
+    id_empresa: Optional[int] = None,
+    id_categoria: Optional[int] = None,
+    fl_ativo: Optional[bool] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Valor do header X-Next-Cursor da página anterior")
 ):
-    """ Lista todos os PRODUTOS (definições) da organização """
+    """
+    Lista os PRODUTOS (definições) da organização em ordem alfabética, com filtros.
+    Páginas seguintes: use 'cursor' (header X-Next-Cursor).
+    """
+    # selectinload: uma consulta por relacionamento para a página toda
+    # (joinedload multiplicaria as linhas: produtos x variações x listas)
     query = db.query(models.Produto).join(models.Empresa).filter(
         models.Empresa.id_organizacao == id_organizacao
     ).options(
-        joinedload(models.Produto.variacoes),
-        joinedload(models.Produto.listas_de_preco)  # Carrega as listas de preço
+        selectinload(models.Produto.variacoes),
+        selectinload(models.Produto.categoria),
+        selectinload(models.Produto.listas_de_preco)  # Carrega as listas de preço
+    )
+
+    if id_empresa:
+        query = query.filter(models.Produto.id_empresa == id_empresa)
+    if id_categoria:
+        query = query.filter(models.Produto.id_categoria == id_categoria)
+    if fl_ativo is not None:
+        query = query.filter(models.Produto.fl_ativo == fl_ativo)
+
+    produtos = paginar_produtos(query, limit, cursor).all()
+    definir_proximo_cursor_produtos(response, produtos, limit)
+    return [ProdutoCompletoSchema.model_validate(p, from_attributes=True) for p in produtos]
+
+
+@gestor_produtos_router.get("/produtos/busca", response_model=List[ProdutoCompletoSchema])
+def buscar_produtos_da_organizacao(
+    q: str = Query(..., min_length=1, description="Código, descrição ou SKU (ex: 'cami azul', 'CAM-001')"),
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    id_empresa: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Busca textual de PRODUTOS da organização por código, descrição e SKU
+    (sem acentos, por prefixo), dos mais relevantes para os menos.
+    """
+    busca = consulta_busca(db, q)
+    if busca is None:
+        return []
+
+    query = db.query(models.Produto).join(
+        busca, busca.c.id_produto == models.Produto.id_produto
+    ).join(models.Empresa).filter(
+        models.Empresa.id_organizacao == id_organizacao
+    ).options(
+        selectinload(models.Produto.variacoes),
+        joinedload(models.Produto.categoria),
+        selectinload(models.Produto.listas_de_preco)
     )
 
     if id_empresa:
         query = query.filter(models.Produto.id_empresa == id_empresa)
 
-    produtos = query.order_by(models.Produto.ds_produto).all()
+    produtos = query.order_by(
+        busca.c.nr_relevancia.desc(), models.Produto.ds_produto
+    ).offset(skip).limit(limit).all()
     return [ProdutoCompletoSchema.model_validate(p, from_attributes=True) for p in produtos]
 
 
@@ -264,6 +323,9 @@ def create_variacao(
         id_produto=db_produto.id_produto
     )
     db.add(db_variacao)
+    marcar_catalogo_alterado(db, db_produto.id_empresa, [db_produto.id_produto])
+    db.flush()
+    indexar_produtos(db, [db_produto.id_produto])  # SKU novo
     db.commit()
     db.refresh(db_variacao)
     return VariacaoProdutoSchema.model_validate(db_variacao, from_attributes=True)
@@ -295,6 +357,9 @@ def update_variacao(
     for key, value in update_data.items():
         setattr(db_variacao, key, value)
 
+    marcar_catalogo_alterado(db, db_variacao.produto.id_empresa, [db_variacao.id_produto])
+    db.flush()
+    indexar_produtos(db, [db_variacao.id_produto])
     db.commit()
     db.refresh(db_variacao)
     return VariacaoProdutoSchema.model_validate(db_variacao, from_attributes=True)
@@ -315,7 +380,10 @@ def delete_variacao(
     if not db_variacao:
         raise HTTPException(status_code=404, detail="Variação não encontrada.")
 
+    marcar_catalogo_alterado(db, db_variacao.produto.id_empresa, [db_variacao.id_produto])
     db.delete(db_variacao)
+    db.flush()
+    indexar_produtos(db, [db_variacao.id_produto])
     db.commit()
     return
 
@@ -341,6 +409,8 @@ def create_catalogo(
 
     db_catalogo = models.Catalogo(**catalogo_in.model_dump())
     db.add(db_catalogo)
+    db.flush()
+    marcar_catalogo_alterado(db, db_catalogo.id_empresa, id_catalogo=db_catalogo.id_catalogo)
     db.commit()
     db.refresh(db_catalogo)
     return CatalogoSchema.model_validate(db_catalogo, from_attributes=True)
@@ -391,6 +461,7 @@ def update_catalogo(
     for key, value in update_data.items():
         setattr(db_catalogo, key, value)
 
+    marcar_catalogo_alterado(db, db_catalogo.id_empresa, id_catalogo=id_catalogo)
     db.commit()
     db.refresh(db_catalogo)
     return CatalogoSchema.model_validate(db_catalogo, from_attributes=True)
@@ -429,6 +500,7 @@ def add_item_ao_catalogo(
         id_catalogo=id_catalogo
     )
     db.add(db_item)
+    marcar_catalogo_alterado(db, db_catalogo.id_empresa, [item_in.id_produto], id_catalogo)
     db.commit()
     db.refresh(db_item)
     return ItemCatalogoSchema.model_validate(db_item, from_attributes=True)
@@ -500,6 +572,7 @@ def update_item_catalogo(
     for key, value in update_data.items():
         setattr(db_item, key, value)
 
+    marcar_catalogo_alterado(db, db_item.catalogo.id_empresa, [db_item.id_produto], db_item.id_catalogo)
     db.commit()
     db.refresh(db_item)
     return ItemCatalogoSchema.model_validate(db_item, from_attributes=True)
@@ -514,6 +587,7 @@ def delete_item_catalogo(
     """ (NOVO) Remove um item (produto) de um catálogo """
     db_item = get_item_catalogo_by_id(db, id_item_catalogo, id_organizacao)  # Valida
 
+    marcar_catalogo_alterado(db, db_item.catalogo.id_empresa, [db_item.id_produto], db_item.id_catalogo)
     db.delete(db_item)
     db.commit()
     return
\ No newline at end of file
@@ -3,16 +3,26 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from typing import List, Optional
-from datetime import datetime, date, timedelta  # <-- 1. CORREÇÃO: Importa o 'timedelta'
+from datetime import date, timedelta
 from decimal import Decimal
 
 from src.database import get_db
 from src.models import models
+from src.services.periodos import Intervalo, filtro_periodo, intervalo_mes, intervalo_periodo
+from src.services.cache_relatorios import relatorio_em_cache
+from src.services.exportacao import PADRAO_FORMATO, resposta_exportacao
+from src.services.consultas_paralelas import executar_em_paralelo
+from src.services.series_vendas import (
+    MAX_PONTOS, PADRAO_COMPARACAO, PADRAO_GRANULARIDADE,
+    avancar, calcular_serie_vendas, pontos_do_periodo
+)
+from src.services.sketches_clientes import contar_clientes
 from src.schemas import (
-    GestorDashboardKpiSchema, VendaVendedorMesSchema,
-    VendaEmpresaMesSchema, VendaPorCidadeSchema, ComissaoCalculadaSchema
+    GestorDashboardKpiSchema, GestorDashboardBundleSchema, VendaVendedorMesSchema,
+    VendaEmpresaMesSchema, VendaPorCidadeSchema, ComissaoCalculadaSchema, SerieVendasSchema,
+    ProdutoMaisVendidoSchema, ClientesAtendidosSchema, ClientesAtendidosGrupoSchema
 )
 from src.core.security import get_current_gestor_org_id
 
@@ -24,30 +34,128 @@ gestor_relatorios_router = APIRouter(
 )
 
 
-def get_date_filters(start_date: Optional[date], end_date: Optional[date]):
-    """ Helper para criar filtros de data (Mês Atual ou Intervalo Personalizado) """
-    if not start_date or not end_date:
-        # Padrão: Mês Atual
-        today = datetime.utcnow()
-        start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # Último dia do mês
-        next_month = (today.replace(day=28) + timedelta(days=4))
-        end = next_month - timedelta(days=next_month.day)
-        end = end.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        return start, end
-    
-    # Se as datas forem fornecidas (filtro manual), converte para datetime
-    # start vira 00:00:00
-    start_dt = datetime.combine(start_date, datetime.min.time())
+# --- CONSULTAS (usadas pelas rotas individuais e pelo /bundle) ---
+
+def consultar_total_comissoes(db: Session, id_organizacao: int, intervalo: Intervalo):
+    """
+    Soma das comissões (livro TB_COMISSOES_PEDIDO) dos pedidos da organização
+    no período. Junta com Pedido/Empresa para filtrar por data e organização
+    (índice IX_PEDIDOS_EMPRESA_DATA).
+    """
+    return db.query(
+        func.sum(models.ComissaoPedido.vl_comissao).label("comissoes")
+    ).join(
+        models.Pedido, models.ComissaoPedido.id_pedido == models.Pedido.id_pedido
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(
+        models.Empresa.id_organizacao == id_organizacao,
+        filtro_periodo(models.Pedido.dt_pedido, intervalo)
+    )
+
+
+def obter_kpis(db: Session, id_organizacao: int) -> GestorDashboardKpiSchema:
+    """ KPIs do mês atual (do cache ou calculados) """
+    mes_atual = intervalo_mes()
+
+    def calcular():
+        # 1. Total de Vendas e Pedidos (resumo mensal TB_RESUMO_VENDAS_EMPRESA_MES)
+        # Somamos os KPIs de todas as empresas da organização no mês
+        kpis_vendas = db.query(
+            func.sum(models.VwVendasEmpresaMes.vl_total_vendas).label("vendas"),
+            func.sum(models.VwVendasEmpresaMes.qt_pedidos).label("pedidos")
+        ).filter(
+            models.VwVendasEmpresaMes.id_organizacao == id_organizacao,
+            filtro_periodo(models.VwVendasEmpresaMes.dt_mes_referencia, mes_atual)
+        ).first()
+
+        # 2. Total de Comissões (livro TB_COMISSOES_PEDIDO, já resolvido por pedido)
+        kpis_comissoes = consultar_total_comissoes(db, id_organizacao, mes_atual).scalar()
+
+        vendas = kpis_vendas.vendas or Decimal(0.0)
+        pedidos = kpis_vendas.pedidos or 0
+        # Clientes distintos não podem ser somados entre empresas (o mesmo
+        # cliente compra de várias): mescla os sketches do mês
+        clientes = contar_clientes(db, id_organizacao, mes_atual)[None]
     
-    # end vira 23:59:59 (CORREÇÃO DO BUG DE FILTRO)
-    end_dt = datetime.combine(end_date, datetime.max.time())
+        # Evita divisão por zero
+        ticket_medio = (vendas / pedidos) if pedidos > 0 else Decimal(0.0)
     
-    return start_dt, end_dt
+        return GestorDashboardKpiSchema(
+            vendas_mes_atual=vendas,
+            pedidos_mes_atual=pedidos,
+            ticket_medio_mes_atual=ticket_medio,
+            clientes_atendidos_mes_atual=clientes,
+            comissoes_pendentes_mes_atual=kpis_comissoes or Decimal(0.0)
+        )
+
+    return relatorio_em_cache(db, id_organizacao, "kpis", mes_atual, calcular)
+
+
+def filtrar_vendas_mes(query, modelo, id_organizacao: int, start_date: Optional[date], end_date: Optional[date]):
+    """
+    Filtros dos resumos mensais ('modelo': vendedor, empresa ou cidade):
+    meses que começam no período (sem datas, o mês atual).
+    """
+    return query.filter(
+        modelo.id_organizacao == id_organizacao,
+        filtro_periodo(modelo.dt_mes_referencia, intervalo_periodo(start_date, end_date))
+    ).order_by(modelo.vl_total_vendas.desc())
+
+
+def consultar_comissoes(db: Session, id_organizacao: int, start_date: Optional[date], end_date: Optional[date]):
+    """ Lê o livro de comissões (pedidos cancelados não têm lançamento) """
+    return db.query(
+        models.Pedido.id_pedido,
+        models.Pedido.nr_pedido,
+        models.Usuario.no_completo.label("no_vendedor"),
+        models.Empresa.no_empresa,
+        models.Pedido.vl_total,
+        models.ComissaoPedido.pc_comissao.label("pc_comissao_aplicada"),
+        models.ComissaoPedido.vl_comissao.label("vl_comissao_calculada"),
+        models.Pedido.dt_pedido
+    ).join(
+        models.Pedido, models.ComissaoPedido.id_pedido == models.Pedido.id_pedido
+    ).join(
+        models.Usuario, models.ComissaoPedido.id_usuario == models.Usuario.id_usuario
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(
+        models.Empresa.id_organizacao == id_organizacao,
+        filtro_periodo(models.Pedido.dt_pedido, intervalo_periodo(start_date, end_date))
+    ).order_by(models.Pedido.dt_pedido.desc())
+
+
+# relatório -> (modelo do resumo mensal, schema de resposta)
+RELATORIOS_VENDAS_MES = {
+    "vendas-vendedor": (models.VwVendasVendedorMes, VendaVendedorMesSchema),
+    "vendas-empresa": (models.VwVendasEmpresaMes, VendaEmpresaMesSchema),
+    "vendas-cidade": (models.VwVendasPorCidade, VendaPorCidadeSchema),
+}
+
+
+def obter_vendas_mes(db: Session, id_organizacao: int, relatorio: str, start_date: Optional[date], end_date: Optional[date]):
+    """ Relatório de vendas a partir de um dos resumos mensais (do cache ou calculado) """
+    modelo, schema = RELATORIOS_VENDAS_MES[relatorio]
+
+    def calcular():
+        dados = filtrar_vendas_mes(db.query(modelo), modelo, id_organizacao, start_date, end_date).all()
+        return [schema.model_validate(d, from_attributes=True) for d in dados]
+
+    return relatorio_em_cache(db, id_organizacao, relatorio, intervalo_periodo(start_date, end_date), calcular)
 
 
+def obter_comissoes(db: Session, id_organizacao: int, start_date: Optional[date], end_date: Optional[date]):
+    """ Relatório de comissões (do cache ou calculado) """
+    def calcular():
+        dados = consultar_comissoes(db, id_organizacao, start_date, end_date).all()
+        return [ComissaoCalculadaSchema.model_validate(d, from_attributes=True) for d in dados]
+
+    return relatorio_em_cache(db, id_organizacao, "comissoes", intervalo_periodo(start_date, end_date), calcular)
+
+
+# --- ROTAS ---
+
 @gestor_relatorios_router.get("/kpis", response_model=GestorDashboardKpiSchema)
 def get_dashboard_gestor_kpis(
     id_organizacao: int = Depends(get_current_gestor_org_id),
@@ -57,54 +165,65 @@ def get_dashboard_gestor_kpis(
     Retorna os KPIs (Indicadores Chave) para o dashboard principal do gestor
     (Focado no Mês Atual).
     """
-    # Usa a data atual para extrair Mês e Ano
-    # (Essa abordagem é mais segura para SQLite + Views do que comparar datas completas)
-    hoje = datetime.utcnow()
-    mes_atual = hoje.month
-    ano_atual = hoje.year
-
-    # 1. Total de Vendas, Pedidos e Clientes (usando VW_VENDAS_EMPRESA_MES)
-    # Somamos os KPIs de todas as empresas da organização no mês
-    kpis_vendas = db.query(
-        func.sum(models.VwVendasEmpresaMes.vl_total_vendas).label("vendas"),
-        func.sum(models.VwVendasEmpresaMes.qt_pedidos).label("pedidos"),
-        func.sum(models.VwVendasEmpresaMes.qt_clientes_atendidos).label("clientes")
-    ).filter(
-        models.VwVendasEmpresaMes.id_organizacao == id_organizacao,
-        # --- ALTERAÇÃO AQUI: Usa extract() igual ao Vendedor ---
-        extract('year', models.VwVendasEmpresaMes.dt_mes_referencia) == ano_atual,
-        extract('month', models.VwVendasEmpresaMes.dt_mes_referencia) == mes_atual
-        # -------------------------------------------------------
-    ).first()
-
-    # 2. Total de Comissões (usando VW_COMISSOES_CALCULADAS)
-    # Precisamos juntar com Empresa para filtrar pela Organização
-    kpis_comissoes = db.query(
-        func.sum(models.VwComissoesCalculadas.vl_comissao_calculada).label("comissoes")
-    ).join(
-        models.Empresa, models.VwComissoesCalculadas.id_empresa == models.Empresa.id_empresa
-    ).filter(
-        models.Empresa.id_organizacao == id_organizacao,
-        # --- ALTERAÇÃO AQUI: Usa extract() igual ao Vendedor ---
-        extract('year', models.VwComissoesCalculadas.dt_pedido) == ano_atual,
-        extract('month', models.VwComissoesCalculadas.dt_pedido) == mes_atual
-        # -------------------------------------------------------
-    ).scalar()
-
-    vendas = kpis_vendas.vendas or Decimal(0.0)
-    pedidos = kpis_vendas.pedidos or 0
-    clientes = kpis_vendas.clientes or 0
-    
-    # Evita divisão por zero
-    ticket_medio = (vendas / pedidos) if pedidos > 0 else Decimal(0.0)
-    
-    return GestorDashboardKpiSchema(
-        vendas_mes_atual=vendas,
-        pedidos_mes_atual=pedidos,
-        ticket_medio_mes_atual=ticket_medio,
-        clientes_atendidos_mes_atual=clientes,
-        comissoes_pendentes_mes_atual=kpis_comissoes or Decimal(0.0)
-    )
+    return obter_kpis(db, id_organizacao)
+
+
+@gestor_relatorios_router.get("/bundle", response_model=GestorDashboardBundleSchema)
+def get_dashboard_gestor_bundle(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    KPIs e relatórios do dashboard em uma única requisição.
+    As consultas rodam ao mesmo tempo, cada uma com a sua conexão
+    (e passando pelo cache de relatórios); o período vale para os relatórios,
+    os KPIs são sempre do mês atual.
+    """
+    return GestorDashboardBundleSchema(**executar_em_paralelo({
+        "kpis": lambda db: obter_kpis(db, id_organizacao),
+        "vendas_vendedor": lambda db: obter_vendas_mes(db, id_organizacao, "vendas-vendedor", start_date, end_date),
+        "vendas_empresa": lambda db: obter_vendas_mes(db, id_organizacao, "vendas-empresa", start_date, end_date),
+        "vendas_cidade": lambda db: obter_vendas_mes(db, id_organizacao, "vendas-cidade", start_date, end_date),
+        "comissoes": lambda db: obter_comissoes(db, id_organizacao, start_date, end_date),
+    }))
+
+
+@gestor_relatorios_router.get("/serie-vendas", response_model=SerieVendasSchema)
+def get_serie_vendas(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    granularidade: str = Query("dia", pattern=PADRAO_GRANULARIDADE),
+    comparacao: Optional[str] = Query(None, pattern=PADRAO_COMPARACAO),
+    id_empresa: Optional[int] = Query(None),
+    id_vendedor: Optional[int] = Query(None)
+):
+    """
+    Série temporal de vendas por dia, semana ou mês (sem datas, o mês atual),
+    opcionalmente comparada ao período anterior ou ao mesmo período do ano anterior.
+    """
+    pontos = pontos_do_periodo(intervalo_periodo(start_date, end_date), granularidade)
+    if len(pontos) > MAX_PONTOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Período muito longo para a granularidade '{granularidade}' (máximo de {MAX_PONTOS} pontos)."
+        )
+
+    def calcular():
+        return SerieVendasSchema(
+            granularidade=granularidade,
+            comparacao=comparacao,
+            dt_inicio=pontos[0].date(),
+            dt_fim=(avancar(pontos[-1], granularidade, 1) - timedelta(days=1)).date(),
+            pontos=calcular_serie_vendas(
+                db, id_organizacao, pontos, granularidade, comparacao, id_empresa, id_vendedor
+            )
+        )
+
+    parametros = (pontos[0], pontos[-1], granularidade, comparacao, id_empresa, id_vendedor)
+    return relatorio_em_cache(db, id_organizacao, "serie-vendas", parametros, calcular)
 
 
 @gestor_relatorios_router.get("/relatorio/vendas-vendedor", response_model=List[VendaVendedorMesSchema])
@@ -115,34 +234,7 @@ def get_relatorio_vendas_vendedor(
     end_date: Optional[date] = Query(None)
 ):
     """ Relatório de Vendas por Vendedor (filtrável por data) """
-    # Se datas não fornecidas, retorna apenas o mês atual
-    if not start_date or not end_date:
-        hoje = datetime.utcnow()
-        mes_atual = hoje.month
-        ano_atual = hoje.year
-        
-        dados = db.query(models.VwVendasVendedorMes).filter(
-            models.VwVendasVendedorMes.id_organizacao == id_organizacao,
-            extract('year', models.VwVendasVendedorMes.dt_mes_referencia) == ano_atual,
-            extract('month', models.VwVendasVendedorMes.dt_mes_referencia) == mes_atual
-        ).order_by(models.VwVendasVendedorMes.vl_total_vendas.desc()).all()
-    else:
-        # Converte date para strings YYYY-MM-DD para comparação com a view (que retorna strings)
-        start_str = start_date.isoformat()
-        end_str = end_date.isoformat()
-        
-        print(f"[DEBUG] Filtrando vendas-vendedor entre {start_str} e {end_str}, org_id={id_organizacao}")
-        
-        # Filtra por intervalo de datas personalizado
-        dados = db.query(models.VwVendasVendedorMes).filter(
-            models.VwVendasVendedorMes.id_organizacao == id_organizacao,
-            models.VwVendasVendedorMes.dt_mes_referencia >= start_str,
-            models.VwVendasVendedorMes.dt_mes_referencia <= end_str
-        ).order_by(models.VwVendasVendedorMes.vl_total_vendas.desc()).all()
-        
-        print(f"[DEBUG] Encontrados {len(dados)} registros")
-
-    return [VendaVendedorMesSchema.model_validate(d, from_attributes=True) for d in dados]
+    return obter_vendas_mes(db, id_organizacao, "vendas-vendedor", start_date, end_date)
 
 
 @gestor_relatorios_router.get("/relatorio/vendas-empresa", response_model=List[VendaEmpresaMesSchema])
@@ -153,34 +245,7 @@ def get_relatorio_vendas_empresa(
     end_date: Optional[date] = Query(None)
 ):
     """ Relatório de Vendas por Empresa Representada (filtrável por data) """
-    # Se datas não fornecidas, retorna apenas o mês atual
-    if not start_date or not end_date:
-        hoje = datetime.utcnow()
-        mes_atual = hoje.month
-        ano_atual = hoje.year
-        
-        dados = db.query(models.VwVendasEmpresaMes).filter(
-            models.VwVendasEmpresaMes.id_organizacao == id_organizacao,
-            extract('year', models.VwVendasEmpresaMes.dt_mes_referencia) == ano_atual,
-            extract('month', models.VwVendasEmpresaMes.dt_mes_referencia) == mes_atual
-        ).order_by(models.VwVendasEmpresaMes.vl_total_vendas.desc()).all()
-    else:
-        # Converte date para strings YYYY-MM-DD para comparação com a view (que retorna strings)
-        start_str = start_date.isoformat()
-        end_str = end_date.isoformat()
-        
-        print(f"[DEBUG] Filtrando vendas entre {start_str} e {end_str}, org_id={id_organizacao}")
-        
-        # Filtra por intervalo de datas personalizado
-        dados = db.query(models.VwVendasEmpresaMes).filter(
-            models.VwVendasEmpresaMes.id_organizacao == id_organizacao,
-            models.VwVendasEmpresaMes.dt_mes_referencia >= start_str,
-            models.VwVendasEmpresaMes.dt_mes_referencia <= end_str
-        ).order_by(models.VwVendasEmpresaMes.vl_total_vendas.desc()).all()
-        
-        print(f"[DEBUG] Encontrados {len(dados)} registros")
-
-    return [VendaEmpresaMesSchema.model_validate(d, from_attributes=True) for d in dados]
+    return obter_vendas_mes(db, id_organizacao, "vendas-empresa", start_date, end_date)
 
 
 @gestor_relatorios_router.get("/relatorio/vendas-cidade", response_model=List[VendaPorCidadeSchema])
@@ -191,14 +256,7 @@ def get_relatorio_vendas_cidade(
     end_date: Optional[date] = Query(None)
 ):
     """ Relatório de Vendas por Cidade (filtrável por data) """
-    start, end = get_date_filters(start_date, end_date)
-
-    dados = db.query(models.VwVendasPorCidade).filter(
-        models.VwVendasPorCidade.id_organizacao == id_organizacao,
-        models.VwVendasPorCidade.dt_mes_referencia.between(start, end)
-    ).order_by(models.VwVendasPorCidade.vl_total_vendas.desc()).all()
-
-    return [VendaPorCidadeSchema.model_validate(d, from_attributes=True) for d in dados]
+    return obter_vendas_mes(db, id_organizacao, "vendas-cidade", start_date, end_date)
 
 
 @gestor_relatorios_router.get("/relatorio/comissoes", response_model=List[ComissaoCalculadaSchema])
@@ -209,15 +267,172 @@ def get_relatorio_comissoes(
     end_date: Optional[date] = Query(None)
 ):
     """ Relatório de Comissões Calculadas (filtrável por data) """
-    start, end = get_date_filters(start_date, end_date)
+    return obter_comissoes(db, id_organizacao, start_date, end_date)
 
-    # --- 3. CORREÇÃO DA QUERY DE COMISSÕES (Refinamento) ---
-    # Juntamos a View direto com a Empresa (pois a View já tem id_empresa)
-    dados = db.query(models.VwComissoesCalculadas).join(
-        models.Empresa, models.VwComissoesCalculadas.id_empresa == models.Empresa.id_empresa
-    ).filter(
-        models.Empresa.id_organizacao == id_organizacao,
-        models.VwComissoesCalculadas.dt_pedido.between(start, end)
-    ).order_by(models.VwComissoesCalculadas.dt_pedido.desc()).all()
 
-    return [ComissaoCalculadaSchema.model_validate(d, from_attributes=True) for d in dados]
\ No newline at end of file
+# agrupamento -> colunas do ranking (além das quantidades)
+AGRUPAMENTOS_PRODUTOS = {
+    "produto": (models.Produto.id_produto, models.Produto.cd_produto, models.Produto.ds_produto),
+    "variacao": (models.Produto.id_produto, models.Produto.cd_produto, models.Produto.ds_produto,
+                 func.nullif(models.ResumoVendasProdutoMes.id_variacao, 0).label("id_variacao"),
+                 models.VariacaoProduto.ds_tamanho, models.VariacaoProduto.ds_cor),
+    "tamanho": (models.VariacaoProduto.ds_tamanho,),
+    "cor": (models.VariacaoProduto.ds_cor,),
+}
+
+
+@gestor_relatorios_router.get("/relatorio/produtos-mais-vendidos", response_model=List[ProdutoMaisVendidoSchema])
+def get_relatorio_produtos_mais_vendidos(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    agrupar_por: str = Query("produto", pattern="^(produto|variacao|tamanho|cor)$"),
+    ordenar_por: str = Query("quantidade", pattern="^(quantidade|faturamento)$"),
+    limite: int = Query(10, ge=1, le=100),
+    id_empresa: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    Top-N de produtos, variações, tamanhos ou cores por quantidade ou faturamento
+    (filtrável por data e empresa). Lê o resumo TB_RESUMO_VENDAS_PRODUTO_MES.
+    """
+    def calcular():
+        resumo = models.ResumoVendasProdutoMes
+        colunas = AGRUPAMENTOS_PRODUTOS[agrupar_por]
+        qt_vendida = func.sum(resumo.qt_vendida).label("qt_vendida")
+        vl_total_vendas = func.sum(resumo.vl_total_vendas).label("vl_total_vendas")
+
+        query = db.query(*colunas, qt_vendida, vl_total_vendas).join(
+            models.Produto, resumo.id_produto == models.Produto.id_produto
+        )
+        if agrupar_por in ("tamanho", "cor"):
+            # Só itens com variação; o agrupamento é pelo texto (ex: "M" de todos os produtos)
+            query = query.join(models.VariacaoProduto, resumo.id_variacao == models.VariacaoProduto.id_variacao)
+            query = query.filter(colunas[0].isnot(None))
+        elif agrupar_por == "variacao":
+            query = query.outerjoin(models.VariacaoProduto, resumo.id_variacao == models.VariacaoProduto.id_variacao)
+
+        query = query.filter(
+            resumo.id_organizacao == id_organizacao,
+            filtro_periodo(resumo.dt_mes_referencia, intervalo_periodo(start_date, end_date))
+        )
+        if id_empresa:
+            query = query.filter(resumo.id_empresa == id_empresa)
+
+        ordem = qt_vendida if ordenar_por == "quantidade" else vl_total_vendas
+        dados = query.group_by(*colunas).order_by(ordem.desc()).limit(limite).all()
+        return [ProdutoMaisVendidoSchema.model_validate(d, from_attributes=True) for d in dados]
+
+    parametros = (intervalo_periodo(start_date, end_date), agrupar_por, ordenar_por, limite, id_empresa)
+    return relatorio_em_cache(db, id_organizacao, "produtos-mais-vendidos", parametros, calcular)
+
+
+@gestor_relatorios_router.get("/relatorio/clientes-atendidos", response_model=ClientesAtendidosSchema)
+def get_relatorio_clientes_atendidos(
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    db: Session = Depends(get_db),
+    agrupar_por: Optional[str] = Query(None, pattern="^(empresa|vendedor)$"),
+    id_empresa: Optional[int] = Query(None),
+    id_vendedor: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    Clientes distintos atendidos nos meses do período (sem datas, o mês atual),
+    no total e opcionalmente por empresa ou vendedor. Estimativa pelos sketches
+    HyperLogLog de TB_SKETCH_CLIENTES_MES (erro ~1,6%): o mesmo cliente em
+    vários meses, empresas ou vendedores conta uma vez no total.
+    """
+    intervalo = intervalo_periodo(start_date, end_date)
+
+    def calcular():
+        total = contar_clientes(db, id_organizacao, intervalo, id_empresa, id_vendedor)[None]
+        grupos = []
+        if agrupar_por:
+            por_grupo = contar_clientes(db, id_organizacao, intervalo, id_empresa, id_vendedor, agrupar_por)
+            if agrupar_por == "empresa":
+                nomes = dict(db.query(models.Empresa.id_empresa, models.Empresa.no_empresa).filter(
+                    models.Empresa.id_empresa.in_(por_grupo)
+                ).all())
+            else:
+                nomes = dict(db.query(models.Usuario.id_usuario, models.Usuario.no_completo).filter(
+                    models.Usuario.id_usuario.in_(por_grupo)
+                ).all())
+            grupos = sorted((
+                ClientesAtendidosGrupoSchema(id=id_grupo, ds_nome=nomes.get(id_grupo), qt_clientes_atendidos=qt)
+                for id_grupo, qt in por_grupo.items()
+            ), key=lambda grupo: grupo.qt_clientes_atendidos, reverse=True)
+
+        return ClientesAtendidosSchema(
+            dt_inicio=intervalo[0].date(),
+            dt_fim=(intervalo[1] - timedelta(days=1)).date(),
+            agrupar_por=agrupar_por,
+            qt_clientes_atendidos=total,
+            grupos=grupos
+        )
+
+    parametros = (intervalo, agrupar_por, id_empresa, id_vendedor)
+    return relatorio_em_cache(db, id_organizacao, "clientes-atendidos", parametros, calcular)
+
+
+# --- EXPORTAÇÃO (CSV/XLSX) ---
+# relatório -> (cabeçalho, função(db, id_organizacao, start_date, end_date) -> consulta)
+RELATORIOS_EXPORTACAO = {
+    "vendas-vendedor": (
+        ["Vendedor", "Mês", "Pedidos", "Total Vendas", "Ticket Médio"],
+        lambda db, org, inicio, fim: filtrar_vendas_mes(db.query(
+            models.VwVendasVendedorMes.no_vendedor,
+            models.VwVendasVendedorMes.dt_mes_referencia,
+            models.VwVendasVendedorMes.qt_pedidos,
+            models.VwVendasVendedorMes.vl_total_vendas,
+            models.VwVendasVendedorMes.vl_ticket_medio
+        ), models.VwVendasVendedorMes, org, inicio, fim),
+    ),
+    "vendas-empresa": (
+        ["Empresa", "Mês", "Pedidos", "Total Vendas", "Clientes Atendidos"],
+        lambda db, org, inicio, fim: filtrar_vendas_mes(db.query(
+            models.VwVendasEmpresaMes.no_empresa,
+            models.VwVendasEmpresaMes.dt_mes_referencia,
+            models.VwVendasEmpresaMes.qt_pedidos,
+            models.VwVendasEmpresaMes.vl_total_vendas,
+            models.VwVendasEmpresaMes.qt_clientes_atendidos
+        ), models.VwVendasEmpresaMes, org, inicio, fim),
+    ),
+    "vendas-cidade": (
+        ["Cidade", "UF", "Mês", "Pedidos", "Total Vendas"],
+        lambda db, org, inicio, fim: filtrar_vendas_mes(db.query(
+            models.VwVendasPorCidade.no_cidade,
+            models.VwVendasPorCidade.sg_estado,
+            models.VwVendasPorCidade.dt_mes_referencia,
+            models.VwVendasPorCidade.qt_pedidos,
+            models.VwVendasPorCidade.vl_total_vendas
+        ), models.VwVendasPorCidade, org, inicio, fim),
+    ),
+    "comissoes": (
+        ["ID Pedido", "Nº Pedido", "Vendedor", "Empresa", "Valor Pedido",
+         "% Comissão", "Valor Comissão", "Data Pedido"],
+        consultar_comissoes,
+    ),
+}
+
+
+@gestor_relatorios_router.get("/relatorio/{relatorio}/exportar")
+def exportar_relatorio(
+    relatorio: str,
+    id_organizacao: int = Depends(get_current_gestor_org_id),
+    formato: str = Query("csv", pattern=PADRAO_FORMATO),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    Exporta o relatório (mesmos filtros da rota JSON) em CSV ou XLSX.
+    O arquivo é gerado em fluxo, sem carregar todas as linhas em memória.
+    """
+    if relatorio not in RELATORIOS_EXPORTACAO:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Relatório não encontrado.")
+
+    cabecalho, montar = RELATORIOS_EXPORTACAO[relatorio]
+    return resposta_exportacao(
+        formato, f"relatorio_{relatorio}", cabecalho,
+        lambda db: montar(db, id_organizacao, start_date, end_date)
+    )
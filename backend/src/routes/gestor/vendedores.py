@@ -16,6 +16,7 @@ from src.schemas import (
     UsuarioSchema,
 )
 from src.core.security import get_current_gestor_org_id
+from src.services.contadores_sistema import contadores_usuario, diferenca, somar_contadores
 
 # Cria o router
 gestor_vendedores_router = APIRouter(
@@ -83,6 +84,7 @@ def create_vendedor(
 
     try:
         db.add(db_vendedor)
+        somar_contadores(db, contadores_usuario(db_vendedor.tp_usuario, db_vendedor.fl_ativo), id_organizacao)
         db.commit()
         db.refresh(db_vendedor)
         # Retorna o schema de Vendedor (que é vazio de empresas por enquanto)
@@ -198,8 +200,13 @@ def update_vendedor(
             )
 
     # Aplica as atualizações
+    fl_ativo_anterior = db_vendedor.fl_ativo
     for key, value in update_data.items():
         setattr(db_vendedor, key, value)
+    somar_contadores(db, diferenca(
+        contadores_usuario(db_vendedor.tp_usuario, fl_ativo_anterior),
+        contadores_usuario(db_vendedor.tp_usuario, db_vendedor.fl_ativo)
+    ), id_organizacao)
 
     try:
         db.commit()
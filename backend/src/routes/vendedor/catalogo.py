@@ -1,15 +1,23 @@
 # /backend/src/routes/vendedor/catalogo.py
 # (VERSÃO REATORADA PARA CATÁLOGOS)
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session, joinedload, selectinload
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from src.database import get_db
 from src.models import models
 # --- IMPORTAÇÃO CORRIGIDA ---
-from src.schemas import CategoriaProdutoSchema, ItemCatalogoVendaSchema, CatalogoSchema
+from src.schemas import CategoriaProdutoSchema, ItemCatalogoVendaSchema, CatalogoSchema, CatalogoAlteracoesSchema
 from src.core.security import get_current_vendedor_contexto
+from src.services.alteracoes_catalogo import alteracoes_desde, versao_catalogo
+from src.services.cache_catalogo import catalogo_em_cache, etag_catalogo, etag_corresponde
+from src.services.busca_produtos import consulta_busca
+from src.services.catalogo_compacto import (
+    FORMATO_COMPACTO, FORMATO_COMPLETO, FORMATO_MSGPACK, TIPO_MSGPACK,
+    formato_solicitado, montar_catalogo_compacto, serializar_compacto
+)
 
 vendedor_catalogo_router = APIRouter(
     prefix="/api/vendedor/catalogo",
@@ -38,13 +46,68 @@ def get_catalogo_vendedor(
     contexto: tuple = Depends(get_current_vendedor_contexto),
     db: Session = Depends(get_db),
     id_catalogo: int = Query(..., description="ID do Catálogo é obrigatório"), # <-- Agora obrigatório
-    id_categoria: Optional[int] = Query(None)
+    id_categoria: Optional[int] = Query(None),
+    formato: Optional[Literal["completo", "compacto", "msgpack"]] = Query(
+        None, alias="format", description="'compacto' (JSON em colunas) ou 'msgpack'; padrão pelo header Accept"
+    ),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
     """
     Lista os itens de venda de um catálogo específico.
+    A resposta traz um ETag; reenviado em If-None-Match, devolve 304 enquanto
+    o catálogo não mudar. O JSON fica em cache por versão do catálogo.
+    Catálogos grandes: 'format=compacto' (ou 'msgpack') devolve as mesmas
+    informações em colunas (ver 'catalogo_compacto').
     """
     _, id_organizacao, id_empresa_ativa = contexto
+    formato = formato_solicitado(formato, accept)
+
+    versao = versao_catalogo(db, id_empresa_ativa)
+    etag = etag_catalogo(id_empresa_ativa, versao, id_catalogo, id_categoria, formato)
+    cabecalhos = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept"}
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+
+    conteudo = catalogo_em_cache(
+        id_empresa_ativa, versao, id_catalogo, id_categoria,
+        lambda: _serializar_catalogo(db, id_empresa_ativa, id_catalogo, id_categoria, formato),
+        formato
+    )
+    media_type = TIPO_MSGPACK if formato == FORMATO_MSGPACK else "application/json"
+    return Response(content=conteudo, media_type=media_type, headers=cabecalhos)
+
+
+_itens_catalogo_json = TypeAdapter(List[ItemCatalogoVendaSchema])
+
 
+def _serializar_catalogo(
+    db: Session,
+    id_empresa_ativa: int,
+    id_catalogo: int,
+    id_categoria: Optional[int],
+    formato: str = FORMATO_COMPLETO
+) -> bytes:
+    """ Monta o catálogo (itens, produtos, variações e categoria) já no formato pedido """
+    itens_catalogo = _consultar_itens_catalogo(db, id_empresa_ativa, id_catalogo, id_categoria)
+
+    if formato in (FORMATO_COMPACTO, FORMATO_MSGPACK):
+        return serializar_compacto(montar_catalogo_compacto(id_catalogo, itens_catalogo), formato)
+
+    # Pydantic v2 faz a conversão para ItemCatalogoVendaSchema e o JSON de uma vez
+    return _itens_catalogo_json.dump_json(
+        [ItemCatalogoVendaSchema.model_validate(ic, from_attributes=True) for ic in itens_catalogo]
+    )
+
+
+def _consultar_itens_catalogo(
+    db: Session,
+    id_empresa_ativa: int,
+    id_catalogo: int,
+    id_categoria: Optional[int] = None,
+    ids_produto: Optional[set] = None
+) -> List[models.ItemCatalogo]:
+    """ Itens ativos do catálogo (vazio se o catálogo não estiver ativo), opcionalmente só de alguns produtos """
     # 1. Encontra o catálogo ATIVO da empresa
     catalogo_ativo = db.query(models.Catalogo).filter(
         models.Catalogo.id_catalogo == id_catalogo,
@@ -76,9 +139,87 @@ def get_catalogo_vendedor(
     if id_categoria:
         query = query.filter(models.Produto.id_categoria == id_categoria)
 
-    itens_catalogo = query.order_by(models.Produto.ds_produto).all()
+    if ids_produto is not None:
+        query = query.filter(models.ItemCatalogo.id_produto.in_(ids_produto))
+
+    return query.order_by(models.Produto.ds_produto).all()
+
+
+@vendedor_catalogo_router.get("/changes", response_model=CatalogoAlteracoesSchema)
+def get_alteracoes_catalogo(
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db),
+    id_catalogo: int = Query(...),
+    desde: int = Query(0, alias="since", ge=0, description="Versão já sincronizada pelo cliente (0 = nenhuma)")
+):
+    """
+    Sincronização incremental do catálogo (modo offline).
+    Devolve só os itens dos produtos alterados desde a versão 'since' e os
+    produtos que saíram do catálogo; o cliente guarda 'nr_versao' para a
+    próxima chamada. Com 'fl_completo' os itens são o catálogo inteiro e a
+    cópia local deve ser substituída.
+    """
+    _, _, id_empresa_ativa = contexto
+
+    versao = versao_catalogo(db, id_empresa_ativa)
+    ids_produto = None
+    if 0 < desde <= versao:
+        ids_produto = alteracoes_desde(db, id_empresa_ativa, id_catalogo, desde, versao)
+
+    if ids_produto is None:
+        itens = _consultar_itens_catalogo(db, id_empresa_ativa, id_catalogo)
+    else:
+        itens = _consultar_itens_catalogo(db, id_empresa_ativa, id_catalogo, ids_produto=ids_produto) if ids_produto else []
+
+    return CatalogoAlteracoesSchema(
+        nr_versao=versao,
+        fl_completo=ids_produto is None,
+        itens=[ItemCatalogoVendaSchema.model_validate(ic, from_attributes=True) for ic in itens],
+        ids_produtos_removidos=sorted(ids_produto - {ic.id_produto for ic in itens}) if ids_produto else []
+    )
+
+
+@vendedor_catalogo_router.get("/busca", response_model=List[ItemCatalogoVendaSchema])
+def buscar_no_catalogo(
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db),
+    id_catalogo: int = Query(...),
+    q: str = Query(..., min_length=1, description="Código, descrição ou SKU (ex: 'cami azul', 'CAM-001')"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(30, ge=1, le=100)
+):
+    """
+    Busca textual nos itens de venda do catálogo por código, descrição e SKU
+    (sem acentos, por prefixo), dos mais relevantes para os menos.
+    """
+    _, _, id_empresa_ativa = contexto
+
+    busca = consulta_busca(db, q)
+    if busca is None:
+        return []
+
+    query = db.query(models.ItemCatalogo).options(
+        joinedload(models.ItemCatalogo.produto).options(
+            selectinload(models.Produto.variacoes),
+            joinedload(models.Produto.categoria)
+        )
+    ).join(
+        models.Catalogo, models.ItemCatalogo.id_catalogo == models.Catalogo.id_catalogo
+    ).join(
+        models.Produto, models.ItemCatalogo.id_produto == models.Produto.id_produto
+    ).join(
+        busca, busca.c.id_produto == models.ItemCatalogo.id_produto
+    ).filter(
+        models.Catalogo.id_catalogo == id_catalogo,
+        models.Catalogo.id_empresa == id_empresa_ativa,
+        models.Catalogo.fl_ativo == True,
+        models.ItemCatalogo.fl_ativo_no_catalogo == True,
+        models.Produto.fl_ativo == True
+    )
 
-    # Pydantic v2 fará a conversão para ItemCatalogoVendaSchema
+    itens_catalogo = query.order_by(
+        busca.c.nr_relevancia.desc(), models.Produto.ds_produto
+    ).offset(skip).limit(limit).all()
     return [ItemCatalogoVendaSchema.model_validate(ic, from_attributes=True) for ic in itens_catalogo]
 
 
@@ -1,13 +1,13 @@
 # /src/routes/vendedor/dashboard.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from typing import List
-from datetime import datetime
 from decimal import Decimal
 
 from src.database import get_db
 from src.models import models
+from src.services.periodos import Intervalo, filtro_periodo, intervalo_mes
 from src.schemas import DashboardVendedorKpiSchema
 from src.core.security import get_current_vendedor_contexto  # Reutiliza a dependência
 
@@ -19,6 +19,22 @@ vendedor_dashboard_router = APIRouter(
 )
 
 
+def consultar_comissoes_vendedor(db: Session, id_usuario: int, intervalo: Intervalo):
+    """
+    Soma das comissões (livro TB_COMISSOES_PEDIDO) do vendedor no período.
+    O lançamento é sempre do vendedor do pedido: filtrar pelo pedido usa o
+    índice IX_PEDIDOS_USUARIO_DATA (vendedor + data).
+    """
+    return db.query(
+        func.sum(models.ComissaoPedido.vl_comissao).label("total_comissao")
+    ).join(
+        models.Pedido, models.ComissaoPedido.id_pedido == models.Pedido.id_pedido
+    ).filter(
+        models.Pedido.id_usuario == id_usuario,
+        filtro_periodo(models.Pedido.dt_pedido, intervalo)
+    )
+
+
 @vendedor_dashboard_router.get("/kpis", response_model=DashboardVendedorKpiSchema)
 def get_dashboard_vendedor(
     contexto: tuple = Depends(get_current_vendedor_contexto),
@@ -26,27 +42,19 @@ def get_dashboard_vendedor(
 ):
     """
     Retorna os KPIs (Indicadores Chave) para o dashboard do vendedor logado.
-    Utiliza as Views pré-calculadas do banco de dados.
+    Utiliza os resumos mensais de vendas (mantidos a cada pedido).
     """
     id_usuario_logado, _, _ = contexto
-    mes_atual = datetime.utcnow().month
-    ano_atual = datetime.utcnow().year
+    mes_atual = intervalo_mes()
 
-    # 1. Busca dados da View de Vendas
+    # 1. Busca dados do resumo mensal de vendas
     vendas_mes = db.query(models.VwVendasVendedorMes).filter(
         models.VwVendasVendedorMes.id_usuario == id_usuario_logado,
-        extract('year', models.VwVendasVendedorMes.dt_mes_referencia) == ano_atual,
-        extract('month', models.VwVendasVendedorMes.dt_mes_referencia) == mes_atual
+        filtro_periodo(models.VwVendasVendedorMes.dt_mes_referencia, mes_atual)
     ).first()
 
-    # 2. Busca dados da View de Comissões
-    comissoes_mes = db.query(
-        func.sum(models.VwComissoesCalculadas.vl_comissao_calculada).label("total_comissao")
-    ).filter(
-        models.VwComissoesCalculadas.id_usuario == id_usuario_logado,
-        extract('year', models.VwComissoesCalculadas.dt_pedido) == ano_atual,
-        extract('month', models.VwComissoesCalculadas.dt_pedido) == mes_atual
-    ).scalar()  # .scalar() retorna o valor da primeira coluna da primeira linha
+    # 2. Busca as comissões do mês no livro (TB_COMISSOES_PEDIDO)
+    comissoes_mes = consultar_comissoes_vendedor(db, id_usuario_logado, mes_atual).scalar()
 
     # 3. Monta a resposta
     if vendas_mes:
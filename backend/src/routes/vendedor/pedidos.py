@@ -1,15 +1,30 @@
 # /backend/src/routes/vendedor/pedidos.py
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Response
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import Iterable, List, Optional
 from decimal import Decimal
 from datetime import datetime
 from src.services.email import EmailService
+from src.services.precificacao import TabelaPrecos, total_pedido
+from src.services.comissoes import registrar_comissoes
+from src.services.resumos_vendas import registrar_sketches, registrar_vendas, registrar_vendas_produtos
+from src.services.contadores_sistema import registrar_contadores_pedidos
+from src.services.cache_relatorios import marcar_dados_alterados
+from src.services.numeracao import alocador_numero_pedido
+from src.services.estoque import (
+    quantidades_por_variacao, reservar_estoque, registrar_reservas, devolver_estoque_pedido
+)
+from src.services.paginacao import paginar_pedidos, definir_proximo_cursor
+from src.services.resumo_pedidos import consultar_resumo_pedidos
+from src.services.idempotencia import (
+    hash_requisicao, buscar_chave, reservar_chave, resposta_repetida
+)
 from src.database import get_db
 from src.models import models
 from src.schemas import (
     PedidoCreate, PedidoCompletoSchema,
-    PedidoUpdate, PedidoCancelRequest
+    PedidoUpdate, PedidoCancelRequest,
+    PedidoLoteResultadoSchema, PedidoLoteResponse, PedidoResumoSchema
 )
 from src.core.security import get_current_vendedor_contexto
 
@@ -39,7 +54,8 @@ def get_pedido_by_id_vendedor(
         joinedload(models.Pedido.itens).joinedload(models.ItemPedido.produto)
     ).filter(
         models.Pedido.id_pedido == id_pedido,
-        models.Pedido.id_usuario == id_usuario
+        models.Pedido.id_usuario == id_usuario,
+        models.Pedido.st_pedido != 'rascunho'  # Rascunhos: ver /api/vendedor/rascunhos
     ).first()
 
     if not pedido:
@@ -50,19 +66,85 @@ def get_pedido_by_id_vendedor(
     return pedido
 
 
+def montar_pedido(
+    pedido_in: PedidoCreate,
+    tabela_precos: TabelaPrecos,
+    id_usuario: int,
+    id_empresa: int,
+    nr_pedido: Optional[str] = None
+) -> models.Pedido:
+    """
+    Monta (sem persistir) o Pedido e seus itens usando uma tabela de
+    preços já carregada. Levanta HTTPException se algum item for inválido.
+    Sem 'nr_pedido', aloca o próximo número da empresa.
+    """
+    db_itens_pedido, vl_total_calculado = tabela_precos.precificar_itens(
+        pedido_in.id_catalogo, pedido_in.itens
+    )
+
+    vl_final_pedido = total_pedido(vl_total_calculado, pedido_in.pc_desconto)
+
+    db_pedido = models.Pedido(
+        id_usuario=id_usuario,
+        id_empresa=id_empresa,
+        nr_pedido=nr_pedido or alocador_numero_pedido.proximo(id_empresa),
+        id_cliente=pedido_in.id_cliente,
+        id_endereco_entrega=pedido_in.id_endereco_entrega,
+        id_endereco_cobranca=pedido_in.id_endereco_cobranca,
+        id_forma_pagamento=pedido_in.id_forma_pagamento,
+        pc_desconto=pedido_in.pc_desconto,
+        vl_total=vl_final_pedido,
+        st_pedido='pendente',
+        ds_observacoes=pedido_in.ds_observacoes,
+    )
+    db_pedido.itens.extend(db_itens_pedido)
+    return db_pedido
+
+
+def enfileirar_confirmacoes(db: Session, pedidos: Iterable[models.Pedido]):
+    """
+    Coloca na fila de e-mails a confirmação de cada pedido, na transação
+    que grava os pedidos (uma consulta para todos eles).
+    """
+    ids_pedido = [p.id_pedido for p in pedidos]
+    db.expire_all()  # Relê os valores como gravados (arredondamento do banco)
+    pedidos_completos = db.query(models.Pedido).options(
+        joinedload(models.Pedido.cliente),
+        joinedload(models.Pedido.vendedor),
+        joinedload(models.Pedido.itens).joinedload(models.ItemPedido.produto)
+    ).filter(models.Pedido.id_pedido.in_(ids_pedido)).all()
+
+    for db_pedido in pedidos_completos:
+        if db_pedido.cliente.ds_email:
+            EmailService.send_order_confirmation(
+                db=db,
+                pedido=db_pedido,
+                emails_to=[db_pedido.cliente.ds_email]
+            )
+
+
 # --- ROTA CREATE ---
 @vendedor_pedidos_router.post("/", response_model=PedidoCompletoSchema, status_code=status.HTTP_201_CREATED)
 def create_pedido(
     pedido_in: PedidoCreate,
-    background_tasks: BackgroundTasks,
     contexto: tuple = Depends(get_current_vendedor_contexto),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Cria um novo pedido.
+    Com o header 'Idempotency-Key', reenvios da mesma requisição (ex: conexão
+    instável) devolvem o pedido já criado em vez de criar um duplicado.
     """
     id_usuario, id_organizacao, id_empresa_ativa = contexto
 
+    ds_hash = None
+    if idempotency_key:
+        ds_hash = hash_requisicao(pedido_in)
+        chave_existente = buscar_chave(db, id_usuario, idempotency_key)
+        if chave_existente:
+            return resposta_repetida(chave_existente, ds_hash)
+
     if not pedido_in.itens:
         raise HTTPException(status_code=422, detail="O pedido deve conter pelo menos um item.")
 
@@ -80,87 +162,57 @@ def create_pedido(
         if not db_cliente or db_cliente.id_organizacao != id_organizacao:
             raise HTTPException(status_code=404, detail="Cliente não encontrado.")
 
-        vl_total_calculado = Decimal(0.00)
-        db_itens_pedido = []
-
-        for item_in in pedido_in.itens:
-            
-            variacoes_produto = db.query(models.VariacaoProduto).filter(
-                models.VariacaoProduto.id_produto == item_in.id_produto,
-                models.VariacaoProduto.fl_ativa == True
-            ).count()
-
-            # Regra: Se tem variação, id_variacao é obrigatório
-            if variacoes_produto > 0 and not item_in.id_variacao:
-                 raise HTTPException(
-                    status_code=422, 
-                    detail=f"O produto {item_in.id_produto} possui grade (tamanho/cor). É necessário especificar a variação."
-                )
-            
-            # Regra: Se NÃO tem variação, id_variacao deve ser nulo (ou ignorado)
-            if variacoes_produto == 0 and item_in.id_variacao:
-                 item_in.id_variacao = None
-            
-            item_catalogo = db.query(models.ItemCatalogo).filter(
-                models.ItemCatalogo.id_catalogo == catalogo_ativo.id_catalogo,
-                models.ItemCatalogo.id_produto == item_in.id_produto,
-                models.ItemCatalogo.fl_ativo_no_catalogo == True
-            ).first()
-
-            if not item_catalogo:
-                raise HTTPException(status_code=404, detail=f"Produto ID {item_in.id_produto} não encontrado ou inativo no catálogo.")
-
-            preco_base = item_catalogo.vl_preco_catalogo
-
-            if item_in.id_variacao:
-                variacao = db.get(models.VariacaoProduto, item_in.id_variacao)
-                if not variacao or variacao.id_produto != item_in.id_produto:
-                    raise HTTPException(status_code=404, detail="Variação inválida.")
-                preco_base += variacao.vl_ajuste_preco
-
-            vl_unitario_seguro = preco_base
-            vl_total_item = (vl_unitario_seguro * item_in.qt_quantidade) * (1 - (item_in.pc_desconto_item / 100))
-            vl_total_calculado += vl_total_item
-
-            db_itens_pedido.append(models.ItemPedido(
-                id_produto=item_in.id_produto,
-                id_variacao=item_in.id_variacao,
-                qt_quantidade=item_in.qt_quantidade,
-                vl_unitario=vl_unitario_seguro,
-                pc_desconto_item=item_in.pc_desconto_item,
-                vl_total_item=vl_total_item
-            ))
-
-        vl_final_pedido = vl_total_calculado * (1 - (pedido_in.pc_desconto / 100))
-
-        db_pedido = models.Pedido(
-            id_usuario=id_usuario,
-            id_empresa=id_empresa_ativa,
-            id_cliente=pedido_in.id_cliente,
-            id_endereco_entrega=pedido_in.id_endereco_entrega,
-            id_endereco_cobranca=pedido_in.id_endereco_cobranca,
-            id_forma_pagamento=pedido_in.id_forma_pagamento,
-            pc_desconto=pedido_in.pc_desconto,
-            vl_total=vl_final_pedido,
-            st_pedido='pendente',
-            ds_observacoes=pedido_in.ds_observacoes,
-        )
+        # O bloco de números é reservado antes de qualquer escrita: a reserva
+        # usa uma transação própria, que no SQLite esperaria o lock desta
+        alocador_numero_pedido.garantir_bloco(id_empresa_ativa)
+
+        # Reserva a chave antes do número e da precificação: um reenvio
+        # concorrente esbarra na constraint única e devolve a resposta do
+        # vencedor sem consumir número nem gravar nada
+        chave = None
+        if idempotency_key:
+            chave = reservar_chave(db, id_usuario, idempotency_key, ds_hash)
+            if chave is None:
+                return resposta_repetida(buscar_chave(db, id_usuario, idempotency_key), ds_hash)
+
+        nr_pedido = alocador_numero_pedido.proximo(id_empresa_ativa)
+
+        # Resolve preços, grades e ajustes de todos os itens em lote
+        tabela_precos = TabelaPrecos.carregar(db, [catalogo_ativo.id_catalogo], pedido_in.itens)
+        db_pedido = montar_pedido(pedido_in, tabela_precos, id_usuario, id_empresa_ativa, nr_pedido)
+
+        # Baixa o estoque de todas as variações do pedido (um único UPDATE)
+        reservar_estoque(db, quantidades_por_variacao(pedido_in.itens))
 
-        db_pedido.itens.extend(db_itens_pedido)
         db.add(db_pedido)
-        db.commit()
-        db.refresh(db_pedido)
+        db.flush()
+        registrar_reservas(db, [db_pedido])
+        db.expire_all()  # Relê os valores como gravados (arredondamento do banco)
 
         db_pedido_completo = get_pedido_by_id_vendedor(db, db_pedido.id_pedido, id_usuario)
-    
-        # --- ENVIO DE EMAIL ---
+        registrar_comissoes(db, [db_pedido_completo])
+        registrar_vendas(db, [db_pedido_completo])
+        registrar_vendas_produtos(db, [db_pedido_completo])
+        registrar_sketches(db, [db_pedido_completo])
+        registrar_contadores_pedidos(db, [db_pedido_completo])
+        marcar_dados_alterados(db, id_organizacao)
+        resposta = PedidoCompletoSchema.model_validate(db_pedido_completo, from_attributes=True)
+
+        # A resposta é gravada na mesma transação do pedido
+        if chave:
+            chave.id_pedido = db_pedido.id_pedido
+            chave.ds_resposta = resposta.model_dump(mode="json")
+
+        # --- ENVIO DE EMAIL (fila gravada junto com o pedido) ---
         if db_pedido_completo.cliente.ds_email:
             EmailService.send_order_confirmation(
-                background_tasks=background_tasks,
+                db=db,
                 pedido=db_pedido_completo,
                 emails_to=[db_pedido_completo.cliente.ds_email]
             )
-        return PedidoCompletoSchema.model_validate(db_pedido_completo, from_attributes=True)
+
+        db.commit()
+        return resposta
 
     except HTTPException as e:
         db.rollback()
@@ -173,28 +225,205 @@ def create_pedido(
         )
 
 
+# --- ROTA CREATE EM LOTE (SINCRONIZAÇÃO OFFLINE) ---
+MAX_PEDIDOS_LOTE = 500
+
+
+@vendedor_pedidos_router.post("/lote", response_model=PedidoLoteResponse)
+def create_pedidos_lote(
+    pedidos_in: List[PedidoCreate],
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """
+    Cria vários pedidos de uma vez (sincronização de pedidos feitos offline).
+    Catálogos, clientes, preços e variações são resolvidos uma única vez para
+    todo o lote e os pedidos válidos são gravados juntos. Pedidos inválidos
+    não impedem a gravação dos demais: cada um recebe seu próprio resultado.
+    """
+    id_usuario, id_organizacao, id_empresa_ativa = contexto
+
+    if not pedidos_in:
+        raise HTTPException(status_code=422, detail="O lote deve conter pelo menos um pedido.")
+    if len(pedidos_in) > MAX_PEDIDOS_LOTE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"O lote pode conter no máximo {MAX_PEDIDOS_LOTE} pedidos."
+        )
+
+    # 1. Consultas compartilhadas por todo o lote
+    ids_catalogo_ativos = {
+        id_catalogo for (id_catalogo,) in db.query(models.Catalogo.id_catalogo).filter(
+            models.Catalogo.id_catalogo.in_({p.id_catalogo for p in pedidos_in}),
+            models.Catalogo.id_empresa == id_empresa_ativa,
+            models.Catalogo.fl_ativo == True
+        )
+    }
+    ids_cliente_validos = {
+        id_cliente for (id_cliente,) in db.query(models.Cliente.id_cliente).filter(
+            models.Cliente.id_cliente.in_({p.id_cliente for p in pedidos_in}),
+            models.Cliente.id_organizacao == id_organizacao
+        )
+    }
+    tabela_precos = TabelaPrecos.carregar(
+        db, ids_catalogo_ativos, [item for p in pedidos_in for item in p.itens]
+    )
+
+    # 2. Valida e precifica cada pedido (sem acesso ao banco)
+    resultados = {}
+    validos = {}  # indice -> Pedido pronto para gravação
+
+    def falha(indice: int, e: HTTPException):
+        resultados[indice] = PedidoLoteResultadoSchema(
+            indice=indice, sucesso=False, status_code=e.status_code, detail=str(e.detail)
+        )
+
+    for indice, pedido_in in enumerate(pedidos_in):
+        try:
+            if not pedido_in.itens:
+                raise HTTPException(status_code=422, detail="O pedido deve conter pelo menos um item.")
+            if pedido_in.id_catalogo not in ids_catalogo_ativos:
+                raise HTTPException(status_code=400, detail="Nenhum catálogo de preços ativo encontrado para esta empresa.")
+            if pedido_in.id_cliente not in ids_cliente_validos:
+                raise HTTPException(status_code=404, detail="Cliente não encontrado.")
+            validos[indice] = montar_pedido(pedido_in, tabela_precos, id_usuario, id_empresa_ativa)
+        except HTTPException as e:
+            falha(indice, e)
+
+    # 3. Reserva o estoque (na ordem do lote) e grava os pedidos válidos
+    #    em uma única transação (INSERTs em lote)
+    numeros = {indice: db_pedido.nr_pedido for indice, db_pedido in validos.items()}
+    try:
+        for indice in list(validos):
+            try:
+                reservar_estoque(db, quantidades_por_variacao(pedidos_in[indice].itens))
+            except HTTPException as e:
+                del validos[indice]
+                falha(indice, e)
+
+        db.add_all(validos.values())
+        db.flush()
+        registrar_reservas(db, validos.values())
+        registrar_comissoes(db, validos.values())
+        registrar_vendas(db, validos.values())
+        registrar_vendas_produtos(db, validos.values())
+        registrar_sketches(db, validos.values())
+        registrar_contadores_pedidos(db, validos.values())
+        marcar_dados_alterados(db, id_organizacao)
+        enfileirar_confirmacoes(db, validos.values())
+        db.commit()
+        criados = validos
+    except Exception:
+        # Algum pedido violou uma restrição do banco (ex: endereço inexistente).
+        # Regrava um a um para isolar os pedidos com problema.
+        db.rollback()
+        criados = {}
+        for indice in validos:
+            db_pedido = montar_pedido(
+                pedidos_in[indice], tabela_precos, id_usuario, id_empresa_ativa,
+                nr_pedido=numeros[indice]  # Mantém o número já alocado
+            )
+            try:
+                reservar_estoque(db, quantidades_por_variacao(pedidos_in[indice].itens))
+                db.add(db_pedido)
+                db.flush()
+                registrar_reservas(db, [db_pedido])
+                registrar_comissoes(db, [db_pedido])
+                registrar_vendas(db, [db_pedido])
+                registrar_vendas_produtos(db, [db_pedido])
+                registrar_sketches(db, [db_pedido])
+                registrar_contadores_pedidos(db, [db_pedido])
+                marcar_dados_alterados(db, id_organizacao)
+                enfileirar_confirmacoes(db, [db_pedido])
+                db.commit()
+                criados[indice] = db_pedido
+            except HTTPException as e:
+                db.rollback()
+                falha(indice, e)
+            except Exception as e:
+                db.rollback()
+                resultados[indice] = PedidoLoteResultadoSchema(
+                    indice=indice,
+                    sucesso=False,
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Erro interno ao criar pedido: {str(e)}"
+                )
+
+    for indice, db_pedido in criados.items():
+        resultados[indice] = PedidoLoteResultadoSchema(
+            indice=indice,
+            sucesso=True,
+            status_code=status.HTTP_201_CREATED,
+            id_pedido=db_pedido.id_pedido,
+            nr_pedido=db_pedido.nr_pedido,
+            vl_total=db_pedido.vl_total
+        )
+
+    return PedidoLoteResponse(
+        qt_recebidos=len(pedidos_in),
+        qt_criados=len(criados),
+        qt_falhas=len(pedidos_in) - len(criados),
+        resultados=[resultados[indice] for indice in range(len(pedidos_in))]
+    )
+
+
 # --- ROTA GET LIST ---
 @vendedor_pedidos_router.get("/", response_model=List[PedidoCompletoSchema])
 def get_meus_pedidos(
+    response: Response,
     contexto: tuple = Depends(get_current_vendedor_contexto),
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 25
+    limit: int = 25,
+    cursor: Optional[str] = Query(None, description="Valor do header X-Next-Cursor da página anterior")
 ):
+    """
+    Lista os pedidos do vendedor na empresa ativa (mais recentes primeiro).
+    Páginas seguintes: use 'cursor' (header X-Next-Cursor) em vez de 'skip'.
+    """
     id_usuario, _, id_empresa_ativa = contexto
 
-    pedidos = db.query(models.Pedido).options(
+    query = db.query(models.Pedido).options(
         joinedload(models.Pedido.cliente),
         joinedload(models.Pedido.empresa),
         joinedload(models.Pedido.forma_pagamento)
     ).filter(
         models.Pedido.id_usuario == id_usuario,
-        models.Pedido.id_empresa == id_empresa_ativa
-    ).order_by(models.Pedido.dt_pedido.desc()).offset(skip).limit(limit).all()
+        models.Pedido.id_empresa == id_empresa_ativa,
+        models.Pedido.st_pedido != 'rascunho'
+    )
+    pedidos = paginar_pedidos(query, limit, skip, cursor).all()
+    definir_proximo_cursor(response, pedidos, limit)
 
     return [PedidoCompletoSchema.model_validate(p, from_attributes=True) for p in pedidos]
 
 
+@vendedor_pedidos_router.get("/resumo", response_model=List[PedidoResumoSchema])
+def get_resumo_meus_pedidos(
+    response: Response,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 25,
+    cursor: Optional[str] = Query(None, description="Valor do header X-Next-Cursor da página anterior")
+):
+    """
+    Listagem resumida (uma única consulta, só colunas) com a mesma paginação
+    de GET /. O detalhe completo fica em GET /{id_pedido}.
+    """
+    id_usuario, _, id_empresa_ativa = contexto
+
+    query = consultar_resumo_pedidos(db).filter(
+        models.Pedido.id_usuario == id_usuario,
+        models.Pedido.id_empresa == id_empresa_ativa,
+        models.Pedido.st_pedido != 'rascunho'
+    )
+    linhas = paginar_pedidos(query, limit, skip, cursor).all()
+    definir_proximo_cursor(response, linhas, limit)
+
+    return [PedidoResumoSchema.model_validate(linha, from_attributes=True) for linha in linhas]
+
+
 # --- ROTA GET BY ID ---
 @vendedor_pedidos_router.get("/{id_pedido}", response_model=PedidoCompletoSchema)
 def get_meu_pedido_especifico(
@@ -211,7 +440,6 @@ def get_meu_pedido_especifico(
 @vendedor_pedidos_router.post("/{id_pedido}/reenviar-email")
 def reenviar_email_pedido_vendedor(
     id_pedido: int,
-    background_tasks: BackgroundTasks,
     contexto: tuple = Depends(get_current_vendedor_contexto),
     db: Session = Depends(get_db)
 ):
@@ -222,10 +450,11 @@ def reenviar_email_pedido_vendedor(
         raise HTTPException(status_code=400, detail="Cliente não possui e-mail cadastrado.")
         
     EmailService.send_order_confirmation(
-        background_tasks=background_tasks,
+        db=db,
         pedido=db_pedido,
         emails_to=[db_pedido.cliente.ds_email]
     )
+    db.commit()
     return {"message": "E-mail enviado para a fila de processamento."}
 
 
@@ -274,7 +503,7 @@ def cancelar_meu_pedido(
     contexto: tuple = Depends(get_current_vendedor_contexto),
     db: Session = Depends(get_db)
 ):
-    id_usuario, _, _ = contexto
+    id_usuario, id_organizacao, _ = contexto
     db_pedido = get_pedido_by_id_vendedor(db, id_pedido, id_usuario)
 
     if db_pedido.st_pedido in ('cancelado', 'entregue'):
@@ -288,6 +517,13 @@ def cancelar_meu_pedido(
         f"\n[CANCELADO PELO VENDEDOR]: {cancel_in.motivo}"
 
     try:
+        devolver_estoque_pedido(db, db_pedido)
+        registrar_comissoes(db, [db_pedido])  # Remove a comissão do pedido cancelado
+        registrar_vendas(db, [db_pedido], sinal=-1)
+        registrar_vendas_produtos(db, [db_pedido], sinal=-1)
+        registrar_sketches(db, [db_pedido], sinal=-1)
+        registrar_contadores_pedidos(db, [db_pedido], sinal=-1)
+        marcar_dados_alterados(db, id_organizacao)
         db.commit()
         db.refresh(db_pedido)
         return PedidoCompletoSchema.model_validate(db_pedido, from_attributes=True)
@@ -0,0 +1,457 @@
+# /backend/src/routes/vendedor/rascunhos.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session, joinedload
+from typing import List
+from decimal import Decimal
+from datetime import datetime
+from src.services.email import EmailService
+from src.services.precificacao import TabelaPrecos, arredondar, total_item, total_pedido
+from src.services.comissoes import registrar_comissoes
+from src.services.resumos_vendas import registrar_sketches, registrar_vendas, registrar_vendas_produtos
+from src.services.contadores_sistema import registrar_contadores_pedidos
+from src.services.cache_relatorios import marcar_dados_alterados
+from src.services.numeracao import alocador_numero_pedido
+from src.services.estoque import quantidades_por_variacao, reservar_estoque, registrar_reservas
+from src.database import get_db
+from src.models import models
+from src.schemas import (
+    PedidoCompletoSchema, ItemPedidoCreate, ItemPedidoSchema, ClienteSchema,
+    RascunhoCreate, RascunhoUpdate, ItemRascunhoUpdate,
+    RascunhoResumoSchema, RascunhoSchema
+)
+from src.core.security import get_current_vendedor_contexto
+from src.routes.vendedor.pedidos import get_pedido_by_id_vendedor
+
+# Cria o router
+vendedor_rascunhos_router = APIRouter(
+    prefix="/api/vendedor/rascunhos",
+    tags=["10. Vendedor - Pedidos"],  # Mesmo grupo
+    dependencies=[Depends(get_current_vendedor_contexto)]
+)
+
+
+# --- FUNÇÕES HELPER ---
+def get_rascunho(
+    db: Session,
+    id_pedido: int,
+    contexto: tuple,
+    travar: bool = False
+) -> models.RascunhoPedido:
+    """
+    Busca o rascunho do vendedor logado (na empresa ativa).
+    Com 'travar', bloqueia a linha até o fim da transação (edições simultâneas
+    do mesmo carrinho não perdem atualizações do subtotal).
+    """
+    id_usuario, _, id_empresa_ativa = contexto
+
+    query = db.query(models.RascunhoPedido).join(
+        models.Pedido, models.RascunhoPedido.id_pedido == models.Pedido.id_pedido
+    ).options(
+        joinedload(models.RascunhoPedido.pedido)
+    ).filter(
+        models.RascunhoPedido.id_pedido == id_pedido,
+        models.Pedido.id_usuario == id_usuario,
+        models.Pedido.id_empresa == id_empresa_ativa,
+        models.Pedido.st_pedido == 'rascunho'
+    )
+    if travar:
+        query = query.with_for_update(of=models.RascunhoPedido)
+
+    rascunho = query.first()
+    if not rascunho:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rascunho não encontrado ou não pertence a este vendedor."
+        )
+    return rascunho
+
+
+def get_item_rascunho(db: Session, rascunho: models.RascunhoPedido, id_item_pedido: int) -> models.ItemPedido:
+    db_item = db.query(models.ItemPedido).filter(
+        models.ItemPedido.id_item_pedido == id_item_pedido,
+        models.ItemPedido.id_pedido == rascunho.id_pedido
+    ).first()
+    if not db_item:
+        raise HTTPException(status_code=404, detail="Item não encontrado neste rascunho.")
+    return db_item
+
+
+def validar_catalogo(db: Session, id_catalogo: int, id_empresa: int):
+    catalogo_ativo = db.query(models.Catalogo.id_catalogo).filter(
+        models.Catalogo.id_catalogo == id_catalogo,
+        models.Catalogo.id_empresa == id_empresa,
+        models.Catalogo.fl_ativo == True
+    ).first()
+    if not catalogo_ativo:
+        raise HTTPException(status_code=400, detail="Nenhum catálogo de preços ativo encontrado para esta empresa.")
+
+
+def validar_cliente(db: Session, id_cliente: int, id_organizacao: int):
+    db_cliente = db.get(models.Cliente, id_cliente)
+    if not db_cliente or db_cliente.id_organizacao != id_organizacao:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado.")
+
+
+def validar_quantidade(qt_quantidade: int):
+    if qt_quantidade is None or qt_quantidade <= 0:
+        raise HTTPException(status_code=422, detail="A quantidade deve ser maior que zero.")
+
+
+def atualizar_total(rascunho: models.RascunhoPedido):
+    """ Aplica o desconto do cabeçalho sobre o subtotal mantido no rascunho """
+    pedido = rascunho.pedido
+    rascunho.vl_subtotal = arredondar(rascunho.vl_subtotal)
+    pedido.vl_total = total_pedido(rascunho.vl_subtotal, pedido.pc_desconto)
+    rascunho.dt_atualizacao = datetime.utcnow()
+
+
+def adicionar_itens(
+    db: Session,
+    rascunho: models.RascunhoPedido,
+    itens_in: List[ItemPedidoCreate]
+) -> List[models.ItemPedido]:
+    """ Precifica apenas os itens novos e soma ao subtotal """
+    for item_in in itens_in:
+        validar_quantidade(item_in.qt_quantidade)
+
+    tabela_precos = TabelaPrecos.carregar(db, [rascunho.id_catalogo], itens_in)
+    novos = []
+    for item_in in itens_in:
+        db_item = tabela_precos.precificar_item(rascunho.id_catalogo, item_in)
+        db_item.id_pedido = rascunho.id_pedido  # Sem carregar a coleção de itens do pedido
+        db.add(db_item)
+        rascunho.vl_subtotal = Decimal(rascunho.vl_subtotal or 0) + db_item.vl_total_item
+        novos.append(db_item)
+    return novos
+
+
+def resumo(rascunho: models.RascunhoPedido, itens: List[models.ItemPedido]) -> RascunhoResumoSchema:
+    return RascunhoResumoSchema(
+        id_pedido=rascunho.id_pedido,
+        vl_subtotal=rascunho.vl_subtotal,
+        pc_desconto=arredondar(rascunho.pedido.pc_desconto or 0),
+        vl_total=rascunho.pedido.vl_total,
+        dt_atualizacao=rascunho.dt_atualizacao,
+        itens=[ItemPedidoSchema.model_validate(i, from_attributes=True) for i in itens]
+    )
+
+
+def completo(db: Session, rascunho: models.RascunhoPedido) -> RascunhoSchema:
+    pedido = rascunho.pedido
+    itens = db.query(models.ItemPedido).options(
+        joinedload(models.ItemPedido.produto)
+    ).filter(
+        models.ItemPedido.id_pedido == rascunho.id_pedido
+    ).order_by(models.ItemPedido.id_item_pedido).all()
+
+    return RascunhoSchema(
+        **resumo(rascunho, itens).model_dump(),
+        id_cliente=pedido.id_cliente,
+        id_catalogo=rascunho.id_catalogo,
+        id_endereco_entrega=pedido.id_endereco_entrega,
+        id_endereco_cobranca=pedido.id_endereco_cobranca,
+        id_forma_pagamento=pedido.id_forma_pagamento,
+        ds_observacoes=pedido.ds_observacoes,
+        cliente=ClienteSchema.model_validate(pedido.cliente, from_attributes=True)
+    )
+
+
+# --- ROTAS DO RASCUNHO ---
+@vendedor_rascunhos_router.post("/", response_model=RascunhoSchema, status_code=status.HTTP_201_CREATED)
+def create_rascunho(
+    rascunho_in: RascunhoCreate,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """ Abre um rascunho de pedido (carrinho), opcionalmente já com itens """
+    id_usuario, id_organizacao, id_empresa_ativa = contexto
+
+    validar_catalogo(db, rascunho_in.id_catalogo, id_empresa_ativa)
+    validar_cliente(db, rascunho_in.id_cliente, id_organizacao)
+
+    try:
+        db_pedido = models.Pedido(
+            id_usuario=id_usuario,
+            id_empresa=id_empresa_ativa,
+            id_cliente=rascunho_in.id_cliente,
+            id_endereco_entrega=rascunho_in.id_endereco_entrega,
+            id_endereco_cobranca=rascunho_in.id_endereco_cobranca,
+            id_forma_pagamento=rascunho_in.id_forma_pagamento,
+            pc_desconto=rascunho_in.pc_desconto or 0,
+            vl_total=0,
+            st_pedido='rascunho',
+            ds_observacoes=rascunho_in.ds_observacoes,
+        )
+        db.add(db_pedido)
+        db.flush()
+
+        rascunho = models.RascunhoPedido(
+            id_pedido=db_pedido.id_pedido,
+            id_catalogo=rascunho_in.id_catalogo,
+            vl_subtotal=Decimal(0)
+        )
+        rascunho.pedido = db_pedido
+        db.add(rascunho)
+
+        if rascunho_in.itens:
+            adicionar_itens(db, rascunho, rascunho_in.itens)
+        atualizar_total(rascunho)
+
+        db.commit()
+        return completo(db, rascunho)
+    except HTTPException as e:
+        db.rollback()
+        raise e
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno ao criar rascunho: {str(e)}"
+        )
+
+
+@vendedor_rascunhos_router.get("/", response_model=List[RascunhoResumoSchema])
+def get_meus_rascunhos(
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """ Lista os rascunhos abertos do vendedor (apenas totais) """
+    id_usuario, _, id_empresa_ativa = contexto
+
+    rascunhos = db.query(models.RascunhoPedido).join(
+        models.Pedido, models.RascunhoPedido.id_pedido == models.Pedido.id_pedido
+    ).options(
+        joinedload(models.RascunhoPedido.pedido)
+    ).filter(
+        models.Pedido.id_usuario == id_usuario,
+        models.Pedido.id_empresa == id_empresa_ativa,
+        models.Pedido.st_pedido == 'rascunho'
+    ).order_by(models.RascunhoPedido.dt_atualizacao.desc()).all()
+
+    return [resumo(r, []) for r in rascunhos]
+
+
+@vendedor_rascunhos_router.get("/{id_pedido}", response_model=RascunhoSchema)
+def get_meu_rascunho(
+    id_pedido: int,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    return completo(db, get_rascunho(db, id_pedido, contexto))
+
+
+@vendedor_rascunhos_router.patch("/{id_pedido}", response_model=RascunhoSchema)
+def update_rascunho(
+    id_pedido: int,
+    rascunho_in: RascunhoUpdate,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """
+    Atualiza o cabeçalho do rascunho. Mudar o desconto só recalcula o total;
+    apenas a troca de catálogo reprecifica todos os itens.
+    """
+    _, id_organizacao, id_empresa_ativa = contexto
+    rascunho = get_rascunho(db, id_pedido, contexto, travar=True)
+    pedido = rascunho.pedido
+    update_data = rascunho_in.model_dump(exclude_unset=True)
+
+    try:
+        if update_data.get('id_cliente'):
+            validar_cliente(db, update_data['id_cliente'], id_organizacao)
+            pedido.id_cliente = update_data['id_cliente']
+
+        for campo in ('id_endereco_entrega', 'id_endereco_cobranca', 'id_forma_pagamento', 'ds_observacoes'):
+            if campo in update_data:
+                setattr(pedido, campo, update_data[campo])
+
+        if update_data.get('pc_desconto') is not None:
+            pedido.pc_desconto = update_data['pc_desconto']
+
+        if update_data.get('id_catalogo') and update_data['id_catalogo'] != rascunho.id_catalogo:
+            validar_catalogo(db, update_data['id_catalogo'], id_empresa_ativa)
+            rascunho.id_catalogo = update_data['id_catalogo']
+
+            itens = db.query(models.ItemPedido).filter(
+                models.ItemPedido.id_pedido == rascunho.id_pedido
+            ).all()
+            # Reprecifica cópias: 'precificar_item' normaliza o item recebido
+            itens_in = [
+                ItemPedidoCreate(
+                    id_produto=db_item.id_produto, id_variacao=db_item.id_variacao,
+                    qt_quantidade=db_item.qt_quantidade, pc_desconto_item=db_item.pc_desconto_item
+                )
+                for db_item in itens
+            ]
+            tabela_precos = TabelaPrecos.carregar(db, [rascunho.id_catalogo], itens_in)
+            subtotal = Decimal(0)
+            for db_item, item_in in zip(itens, itens_in):
+                repreco = tabela_precos.precificar_item(rascunho.id_catalogo, item_in)
+                db_item.id_variacao = repreco.id_variacao
+                db_item.vl_unitario = repreco.vl_unitario
+                db_item.vl_total_item = repreco.vl_total_item
+                subtotal += db_item.vl_total_item
+            rascunho.vl_subtotal = subtotal
+
+        atualizar_total(rascunho)
+        db.commit()
+        return completo(db, rascunho)
+    except HTTPException as e:
+        db.rollback()
+        raise e
+
+
+@vendedor_rascunhos_router.delete("/{id_pedido}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rascunho(
+    id_pedido: int,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """ Descarta o rascunho (e seus itens) """
+    rascunho = get_rascunho(db, id_pedido, contexto, travar=True)
+    pedido = rascunho.pedido
+    db.delete(rascunho)
+    db.delete(pedido)
+    db.commit()
+    return
+
+
+# --- ROTAS DOS ITENS (reprecificação incremental) ---
+@vendedor_rascunhos_router.post("/{id_pedido}/itens", response_model=RascunhoResumoSchema, status_code=status.HTTP_201_CREATED)
+def add_itens_rascunho(
+    id_pedido: int,
+    itens_in: List[ItemPedidoCreate],
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """ Adiciona itens: só os novos itens são precificados """
+    rascunho = get_rascunho(db, id_pedido, contexto, travar=True)
+    try:
+        novos = adicionar_itens(db, rascunho, itens_in)
+        atualizar_total(rascunho)
+        db.commit()
+        return resumo(rascunho, novos)
+    except HTTPException as e:
+        db.rollback()
+        raise e
+
+
+@vendedor_rascunhos_router.patch("/{id_pedido}/itens/{id_item_pedido}", response_model=RascunhoResumoSchema)
+def update_item_rascunho(
+    id_pedido: int,
+    id_item_pedido: int,
+    item_in: ItemRascunhoUpdate,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """
+    Altera quantidade/desconto de um item. Usa o preço já resolvido da linha
+    e ajusta o subtotal pela diferença (nenhum outro item é recalculado).
+    """
+    rascunho = get_rascunho(db, id_pedido, contexto, travar=True)
+    db_item = get_item_rascunho(db, rascunho, id_item_pedido)
+    update_data = item_in.model_dump(exclude_unset=True)
+
+    if 'qt_quantidade' in update_data:
+        validar_quantidade(update_data['qt_quantidade'])
+        db_item.qt_quantidade = update_data['qt_quantidade']
+    if update_data.get('pc_desconto_item') is not None:
+        db_item.pc_desconto_item = update_data['pc_desconto_item']
+
+    total_anterior = Decimal(db_item.vl_total_item)
+    db_item.vl_total_item = total_item(db_item.vl_unitario, db_item.qt_quantidade, db_item.pc_desconto_item)
+    rascunho.vl_subtotal = Decimal(rascunho.vl_subtotal) + db_item.vl_total_item - total_anterior
+
+    atualizar_total(rascunho)
+    db.commit()
+    return resumo(rascunho, [db_item])
+
+
+@vendedor_rascunhos_router.delete("/{id_pedido}/itens/{id_item_pedido}", response_model=RascunhoResumoSchema)
+def delete_item_rascunho(
+    id_pedido: int,
+    id_item_pedido: int,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    rascunho = get_rascunho(db, id_pedido, contexto, travar=True)
+    db_item = get_item_rascunho(db, rascunho, id_item_pedido)
+
+    rascunho.vl_subtotal = Decimal(rascunho.vl_subtotal) - Decimal(db_item.vl_total_item)
+    db.delete(db_item)
+
+    atualizar_total(rascunho)
+    db.commit()
+    return resumo(rascunho, [])
+
+
+# --- ENVIO (promove o rascunho a pedido) ---
+@vendedor_rascunhos_router.post("/{id_pedido}/enviar", response_model=PedidoCompletoSchema)
+def enviar_rascunho(
+    id_pedido: int,
+    contexto: tuple = Depends(get_current_vendedor_contexto),
+    db: Session = Depends(get_db)
+):
+    """
+    Transforma o rascunho em pedido 'pendente'. Os preços já estão resolvidos
+    nos itens: aqui apenas reservamos o estoque, numeramos e confirmamos.
+    """
+    id_usuario, id_organizacao, id_empresa_ativa = contexto
+    rascunho = get_rascunho(db, id_pedido, contexto, travar=True)
+    pedido = rascunho.pedido
+
+    if not (pedido.id_endereco_entrega and pedido.id_endereco_cobranca and pedido.id_forma_pagamento):
+        raise HTTPException(
+            status_code=422,
+            detail="Informe os endereços de entrega/cobrança e a forma de pagamento antes de enviar."
+        )
+
+    itens = db.query(models.ItemPedido.id_variacao, models.ItemPedido.qt_quantidade).filter(
+        models.ItemPedido.id_pedido == pedido.id_pedido
+    ).all()
+    if not itens:
+        raise HTTPException(status_code=422, detail="O pedido deve conter pelo menos um item.")
+
+    validar_catalogo(db, rascunho.id_catalogo, id_empresa_ativa)
+
+    try:
+        # Número alocado antes de qualquer escrita (ver services/numeracao.py)
+        pedido.nr_pedido = alocador_numero_pedido.proximo(id_empresa_ativa)
+
+        reservar_estoque(db, quantidades_por_variacao(itens))
+
+        pedido.st_pedido = 'pendente'
+        pedido.dt_pedido = datetime.utcnow()
+        db.delete(rascunho)
+        db.flush()
+        registrar_reservas(db, [pedido])
+
+        db_pedido_completo = get_pedido_by_id_vendedor(db, pedido.id_pedido, id_usuario)
+        registrar_comissoes(db, [db_pedido_completo])
+        registrar_vendas(db, [db_pedido_completo])
+        registrar_vendas_produtos(db, [db_pedido_completo])
+        registrar_sketches(db, [db_pedido_completo])
+        registrar_contadores_pedidos(db, [db_pedido_completo])
+        marcar_dados_alterados(db, id_organizacao)
+        resposta = PedidoCompletoSchema.model_validate(db_pedido_completo, from_attributes=True)
+
+        # --- ENVIO DE EMAIL (fila gravada junto com o pedido) ---
+        if db_pedido_completo.cliente.ds_email:
+            EmailService.send_order_confirmation(
+                db=db,
+                pedido=db_pedido_completo,
+                emails_to=[db_pedido_completo.cliente.ds_email]
+            )
+
+        db.commit()
+        return resposta
+
+    except HTTPException as e:
+        db.rollback()
+        raise e
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno ao enviar pedido: {str(e)}"
+        )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from datetime import datetime, date
 from decimal import Decimal
 
@@ -386,6 +386,22 @@ class ItemCatalogoVendaSchema(BaseModel):
         from_attributes = True
 
 
+class CatalogoAlteracoesSchema(BaseModel):
+    """
+    Sincronização incremental do catálogo do vendedor (modo offline).
+    Com fl_completo, 'itens' é o catálogo inteiro (substitui a cópia local);
+    senão, só os itens alterados desde a versão do cliente.
+    """
+
+    nr_versao: int  # Versão a enviar em 'since' na próxima sincronização
+    fl_completo: bool
+    itens: List[ItemCatalogoVendaSchema] = []
+    ids_produtos_removidos: List[int] = []  # Produtos que saíram do catálogo (ou foram desativados)
+
+    class ConfigDict:
+        from_attributes = True
+
+
 # ============================================
 # Schemas CRUD: Catálogos (Listas de Preço)
 # ============================================
@@ -676,6 +692,23 @@ class PedidoCompletoSchema(BaseModel):
         from_attributes = True
 
 
+class PedidoResumoSchema(BaseModel):
+    """Linha da listagem resumida de pedidos (GET /pedidos/resumo)"""
+
+    id_pedido: int
+    nr_pedido: Optional[str] = None
+    st_pedido: str
+    vl_total: Decimal
+    dt_pedido: datetime
+    id_cliente: int
+    no_cliente: Optional[str] = None  # Nome fantasia (ou razão social)
+    id_usuario: int
+    no_vendedor: Optional[str] = None
+    id_empresa: int
+    no_empresa: Optional[str] = None
+    qt_itens: int = 0
+
+
 class PedidoUpdate(BaseModel):
     """Schema para atualizar campos de um pedido PENDENTE"""
 
@@ -691,6 +724,85 @@ class PedidoCancelRequest(BaseModel):
     motivo: str  # Motivo do cancelamento (será salvo nas observações)
 
 
+class PedidoLoteResultadoSchema(BaseModel):
+    """Resultado de um pedido dentro do envio em lote (POST /pedidos/lote)"""
+
+    indice: int  # Posição do pedido na lista enviada
+    sucesso: bool
+    status_code: int
+    id_pedido: Optional[int] = None
+    nr_pedido: Optional[str] = None
+    vl_total: Optional[Decimal] = None
+    detail: Optional[str] = None  # Mensagem de erro (quando sucesso = False)
+
+
+class PedidoLoteResponse(BaseModel):
+    """Schema de resposta para POST /pedidos/lote"""
+
+    qt_recebidos: int
+    qt_criados: int
+    qt_falhas: int
+    resultados: List[PedidoLoteResultadoSchema] = []
+
+
+# --- Schemas de Rascunho (Carrinho) ---
+
+
+class RascunhoCreate(BaseModel):
+    """Schema para POST /rascunhos (endereços e pagamento podem vir depois)"""
+
+    id_cliente: int
+    id_catalogo: int
+    id_endereco_entrega: Optional[int] = None
+    id_endereco_cobranca: Optional[int] = None
+    id_forma_pagamento: Optional[int] = None
+    pc_desconto: Optional[Decimal] = 0.00  # type: ignore
+    ds_observacoes: Optional[str] = None
+    itens: List[ItemPedidoCreate] = []
+
+
+class RascunhoUpdate(BaseModel):
+    """Schema para PATCH /rascunhos/{id} (dados do cabeçalho)"""
+
+    id_cliente: Optional[int] = None
+    id_catalogo: Optional[int] = None  # Trocar o catálogo reprecifica todos os itens
+    id_endereco_entrega: Optional[int] = None
+    id_endereco_cobranca: Optional[int] = None
+    id_forma_pagamento: Optional[int] = None
+    pc_desconto: Optional[Decimal] = None
+    ds_observacoes: Optional[str] = None
+
+
+class ItemRascunhoUpdate(BaseModel):
+    """Schema para PATCH /rascunhos/{id}/itens/{id_item}"""
+
+    qt_quantidade: Optional[int] = None
+    pc_desconto_item: Optional[Decimal] = None
+
+
+class RascunhoResumoSchema(BaseModel):
+    """Totais do rascunho + apenas os itens afetados pela alteração"""
+
+    id_pedido: int
+    vl_subtotal: Decimal
+    pc_desconto: Decimal
+    vl_total: Decimal
+    dt_atualizacao: Optional[datetime] = None
+    itens: List[ItemPedidoSchema] = []
+
+
+class RascunhoSchema(RascunhoResumoSchema):
+    """Schema de resposta do rascunho completo (GET /rascunhos/{id})"""
+
+    id_cliente: int
+    id_catalogo: int
+    id_endereco_entrega: Optional[int] = None
+    id_endereco_cobranca: Optional[int] = None
+    id_forma_pagamento: Optional[int] = None
+    ds_observacoes: Optional[str] = None
+    cliente: Optional[ClienteSchema] = None
+
+
 class PedidoStatusUpdate(BaseModel):
     """Schema para o body de PUT /{id_pedido}/status"""
 
@@ -738,7 +850,7 @@ class VendaVendedorMesSchema(BaseModel):
 
 
 class ComissaoCalculadaSchema(BaseModel):
-    """Schema para a View VW_COMISSOES_CALCULADAS"""
+    """Schema do relatório de comissões (livro TB_COMISSOES_PEDIDO)"""
 
     id_pedido: int
     nr_pedido: Optional[str] = None
@@ -841,6 +953,41 @@ class VendaPorCidadeSchema(BaseModel):
         from_attributes = True
 
 
+class ProdutoMaisVendidoSchema(BaseModel):
+    """Uma linha do ranking de produtos/variações/tamanhos/cores mais vendidos"""
+
+    # Preenchidos conforme o agrupamento (produto, variacao, tamanho ou cor)
+    id_produto: Optional[int] = None
+    cd_produto: Optional[str] = None
+    ds_produto: Optional[str] = None
+    id_variacao: Optional[int] = None
+    ds_tamanho: Optional[str] = None
+    ds_cor: Optional[str] = None
+    qt_vendida: int
+    vl_total_vendas: Decimal  # Valor dos itens, antes do desconto geral do pedido
+
+    class ConfigDict:
+        from_attributes = True
+
+
+class ClientesAtendidosGrupoSchema(BaseModel):
+    """Clientes atendidos de uma empresa ou vendedor"""
+
+    id: int
+    ds_nome: Optional[str] = None
+    qt_clientes_atendidos: int
+
+
+class ClientesAtendidosSchema(BaseModel):
+    """Clientes distintos atendidos no período (estimativa, erro ~1,6%)"""
+
+    dt_inicio: date
+    dt_fim: date
+    agrupar_por: Optional[str] = None
+    qt_clientes_atendidos: int
+    grupos: List[ClientesAtendidosGrupoSchema] = []
+
+
 class GestorDashboardKpiSchema(BaseModel):
     """Schema de resposta para o Dashboard principal do Gestor"""
 
@@ -853,6 +1000,68 @@ class GestorDashboardKpiSchema(BaseModel):
     )
 
 
+class PontoSerieVendasSchema(BaseModel):
+    """Um ponto (dia, semana ou mês) da série temporal de vendas"""
+
+    dt_inicio: date
+    qt_pedidos: int
+    vl_total_vendas: Decimal
+    vl_acumulado: Decimal
+    # Preenchidos apenas com 'comparacao'
+    dt_inicio_comparacao: Optional[date] = None
+    qt_pedidos_comparacao: Optional[int] = None
+    vl_total_vendas_comparacao: Optional[Decimal] = None
+    vl_acumulado_comparacao: Optional[Decimal] = None
+    pc_variacao: Optional[Decimal] = None  # Nulo se o ponto de comparação não teve vendas
+
+
+class SerieVendasSchema(BaseModel):
+    """Schema de resposta de GET /serie-vendas"""
+
+    granularidade: str
+    comparacao: Optional[str] = None
+    dt_inicio: date
+    dt_fim: date  # Último dia incluído (o período é ampliado para pontos completos)
+    pontos: List[PontoSerieVendasSchema]
+
+
+class CurvaAbcItemSchema(BaseModel):
+    """Uma linha da curva ABC (cliente, produto, vendedor ou empresa)"""
+
+    id: int
+    ds_nome: str
+    vl_metrica: float  # Valor da métrica pedida (vl_total, qt_itens ou qt_pedidos)
+    pc_participacao: float
+    pc_acumulado: float
+    classe: str  # A, B ou C
+
+
+class TabelaCruzadaLinhaSchema(BaseModel):
+    chaves: List[str]  # Um rótulo por dimensão de 'linhas'
+    valores: List[float]  # Um valor por item de 'colunas' (vazio sem 'coluna')
+    total: float
+
+
+class TabelaCruzadaSchema(BaseModel):
+    """Schema de resposta da tabela cruzada (ex: vendedor x empresa x mês)"""
+
+    metrica: str
+    dimensoes_linhas: List[str]
+    dimensao_coluna: Optional[str] = None
+    colunas: List[str]
+    linhas: List[TabelaCruzadaLinhaSchema]
+
+
+class GestorDashboardBundleSchema(BaseModel):
+    """Schema de resposta de GET /bundle: KPIs e relatórios do dashboard em uma chamada"""
+
+    kpis: GestorDashboardKpiSchema
+    vendas_vendedor: List[VendaVendedorMesSchema]
+    vendas_empresa: List[VendaEmpresaMesSchema]
+    vendas_cidade: List[VendaPorCidadeSchema]
+    comissoes: List[ComissaoCalculadaSchema]
+
+
 # ============================================
 # Schemas Super Admin: Organizações
 # ============================================
@@ -943,6 +1152,34 @@ class AdminDashboardKpiSchema(BaseModel):
     valor_total_pedidos_sistema: Decimal  # Soma do VL_TOTAL (não cancelados)
 
 
+class ContadoresReconciliacaoSchema(BaseModel):
+    """Schema de resposta da reconciliação dos contadores do sistema"""
+
+    correcoes: Dict[str, Decimal]  # contador -> diferença corrigida (vazio se estava correto)
+
+
+class FilaEmailMetricasSchema(BaseModel):
+    """Schema de resposta com a profundidade da fila de e-mails (TB_FILA_EMAILS)"""
+
+    qt_pendentes: int
+    qt_enviados: int
+    qt_erros: int  # Descartados após o número máximo de tentativas
+    dt_pendente_mais_antigo: Optional[datetime] = None
+
+
+class CacheRelatoriosMetricasSchema(BaseModel):
+    """Schema de resposta com as métricas do cache de relatórios (do worker que respondeu)"""
+
+    pid: int
+    qt_acertos: int
+    qt_falhas: int
+    pc_acertos: float
+    qt_entradas: int
+    qt_bytes: int
+    qt_bytes_limite: int
+    qt_descartes: int  # Entradas removidas pelo limite de memória (LRU)
+
+
 # ============================================
 # RESOLUÇÃO DE REFERÊNCIAS (FINAL DO ARQUIVO)
 # ============================================
@@ -0,0 +1,137 @@
+# /backend/src/services/alteracoes_catalogo.py
+"""
+Versões e log de alterações dos catálogos de cada empresa.
+
+Toda alteração que muda o catálogo do vendedor (catálogo, item/preço,
+produto, variação, estoque ou categoria) chama 'marcar_catalogo_alterado'
+na mesma transação (exceto a baixa de estoque dos pedidos, marcada logo
+após o commit; ver 'estoque'):
+- incrementa a versão da empresa (TB_VERSOES_CATALOGO), que invalida o
+  cache e os ETags do catálogo ('cache_catalogo');
+- grava no log (TB_ALTERACOES_CATALOGO) os produtos alterados nessa versão.
+
+O UPSERT da versão trava a linha da empresa até o commit, então as versões
+de uma empresa são confirmadas em ordem: um cliente que já leu a versão N
+nunca deixa de receber uma alteração <= N confirmada depois.
+
+A sincronização incremental ('alteracoes_desde') devolve só os produtos
+alterados desde a versão do cliente; alterações do catálogo inteiro, ou uma
+versão mais antiga que o log guardado, pedem a carga completa.
+
+Limite (variável de ambiente, ver core/config.py):
+- CATALOG_CHANGES_RETENTION_DAYS: dias de log mantidos (padrão 90).
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import models
+
+DIAS_RETENCAO = settings.CATALOG_CHANGES_RETENTION_DAYS
+
+
+def versao_catalogo(db: Session, id_empresa: int) -> int:
+    """ Versão atual dos catálogos da empresa """
+    return db.query(models.VersaoCatalogoEmpresa.nr_versao).filter(
+        models.VersaoCatalogoEmpresa.id_empresa == id_empresa
+    ).scalar() or 0
+
+
+def marcar_catalogo_alterado(
+    db: Session,
+    id_empresa: int,
+    ids_produto: Iterable[int] = (),
+    id_catalogo: Optional[int] = None
+):
+    """
+    Incrementa a versão dos catálogos da empresa e registra a alteração, na
+    transação corrente. Sem 'ids_produto', a alteração é do catálogo inteiro
+    ('id_catalogo') ou, sem ele também, de todos os catálogos da empresa.
+    """
+    tabela = models.VersaoCatalogoEmpresa.__table__
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(tabela).values(ID_EMPRESA=id_empresa, NR_VERSAO=1)
+    nr_versao = db.execute(stmt.on_conflict_do_update(
+        index_elements=[tabela.c.ID_EMPRESA],
+        set_={tabela.c.NR_VERSAO: tabela.c.NR_VERSAO + 1},
+    ).returning(tabela.c.NR_VERSAO)).scalar_one()
+
+    agora = datetime.utcnow()
+    db.execute(models.AlteracaoCatalogo.__table__.insert(), [
+        {"ID_EMPRESA": id_empresa, "NR_VERSAO": nr_versao, "ID_CATALOGO": id_catalogo,
+         "ID_PRODUTO": id_produto, "DT_ALTERACAO": agora}
+        for id_produto in (sorted(set(ids_produto)) or [None])
+    ])
+
+
+def marcar_catalogo_alterado_organizacao(db: Session, id_organizacao: int):
+    """ Alterações que valem para todas as empresas da organização (ex: categorias) """
+    for id_empresa in db.execute(
+        select(models.Empresa.id_empresa)
+        .where(models.Empresa.id_organizacao == id_organizacao)
+        .order_by(models.Empresa.id_empresa)  # Mesma ordem em todas as transações (evita deadlock)
+    ).scalars().all():
+        marcar_catalogo_alterado(db, id_empresa)
+
+
+def marcar_catalogo_alterado_variacoes(db: Session, ids_variacao: Iterable[int]):
+    """ Alterações de variações feitas por UPDATE direto (ex: baixa de estoque) """
+    ids_variacao = list(ids_variacao)
+    if not ids_variacao:
+        return
+
+    produtos: Dict[int, Set[int]] = {}
+    for id_empresa, id_produto in db.execute(
+        select(models.Produto.id_empresa, models.Produto.id_produto).distinct().join(
+            models.VariacaoProduto, models.VariacaoProduto.id_produto == models.Produto.id_produto
+        ).where(models.VariacaoProduto.id_variacao.in_(ids_variacao))
+    ):
+        produtos.setdefault(id_empresa, set()).add(id_produto)
+
+    for id_empresa in sorted(produtos):
+        marcar_catalogo_alterado(db, id_empresa, produtos[id_empresa])
+
+
+def alteracoes_desde(db: Session, id_empresa: int, id_catalogo: int, desde: int, ate: int) -> Optional[Set[int]]:
+    """
+    Produtos do catálogo alterados nas versões (desde, ate].
+    Retorna None quando o cliente precisa da carga completa: alteração do
+    catálogo inteiro ou versão anterior ao log guardado.
+    """
+    if desde >= ate:
+        return set()
+
+    alteracao = models.AlteracaoCatalogo
+    # As versões do log são contínuas; se a seguinte à do cliente já foi
+    # apagada (retenção), não dá para saber o que mudou
+    primeira = db.query(alteracao.nr_versao).filter(
+        alteracao.id_empresa == id_empresa,
+        alteracao.nr_versao > desde
+    ).order_by(alteracao.nr_versao).limit(1).scalar()
+    if primeira != desde + 1:
+        return None
+
+    produtos: Set[int] = set()
+    for (id_produto,) in db.query(alteracao.id_produto).filter(
+        alteracao.id_empresa == id_empresa,
+        alteracao.nr_versao > desde,
+        alteracao.nr_versao <= ate,
+        or_(alteracao.id_catalogo.is_(None), alteracao.id_catalogo == id_catalogo)
+    ).distinct():
+        if id_produto is None:
+            return None
+        produtos.add(id_produto)
+    return produtos
+
+
+def limpar_alteracoes_antigas(db: Session) -> int:
+    """ Apaga o log mais antigo que a retenção e faz commit. Retorna as linhas apagadas """
+    apagadas = db.query(models.AlteracaoCatalogo).filter(
+        models.AlteracaoCatalogo.dt_alteracao < datetime.utcnow() - timedelta(days=DIAS_RETENCAO)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return apagadas
@@ -0,0 +1,309 @@
+# /backend/src/services/analise_pedidos.py
+"""
+Análises ad hoc dos pedidos da organização (curva ABC, tabelas cruzadas),
+calculadas em memória com pandas.
+
+Cada worker guarda, por organização, um DataFrame com os itens dos pedidos
+(uma linha por item, colunas tipadas: ids int32, nomes 'category'). Ele é
+montado com uma única consulta e, depois, atualizado de forma incremental:
+- a versão dos dados (TB_VERSOES_DADOS) diz se algum pedido mudou;
+- se mudou, buscamos só os pedidos com DT_ATUALIZACAO a partir da última
+  carga (menos uma margem, para transações ainda abertas naquele instante)
+  e trocamos as linhas desses pedidos no DataFrame.
+A cada ANALYTICS_RELOAD_SECONDS o DataFrame é recarregado por inteiro
+(nomes de clientes/produtos alterados, pedidos removidos).
+
+Rascunhos e pedidos cancelados ficam de fora. O valor de cada item é
+proporcional ao VL_TOTAL do pedido (já com o desconto do pedido).
+
+Limites (variáveis de ambiente, ver core/config.py):
+- ANALYTICS_CACHE_MAX_BYTES: memória total por worker (padrão 128 MB);
+  ao passar do limite, saem as organizações usadas há mais tempo (LRU).
+- ANALYTICS_MAX_BYTES_PER_ORG: tamanho máximo do DataFrame de uma
+  organização (padrão 64 MB). Acima disso ele é usado na requisição e
+  descartado, sem ocupar o cache.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import models
+from src.services.cache_relatorios import versao_dados
+from src.services.periodos import Intervalo
+
+logger = logging.getLogger("analise_pedidos")
+
+MAX_BYTES = settings.ANALYTICS_CACHE_MAX_BYTES
+MAX_BYTES_ORGANIZACAO = settings.ANALYTICS_MAX_BYTES_PER_ORG
+TTL_RECARGA_SEGUNDOS = settings.ANALYTICS_RELOAD_SECONDS
+MARGEM_ATUALIZACAO = timedelta(minutes=5)
+
+STATUS_FORA_ANALISE = ('cancelado', 'rascunho')
+
+# dimensão -> (coluna do id, coluna do nome)
+DIMENSOES = {
+    "vendedor": ("id_usuario", "no_vendedor"),
+    "empresa": ("id_empresa", "no_empresa"),
+    "cliente": ("id_cliente", "no_cliente"),
+    "produto": ("id_produto", "ds_produto"),
+    "mes": ("mes", None),
+}
+METRICAS = ("vl_total", "qt_itens", "qt_pedidos")
+
+# Aceitos em Query(..., pattern=...)
+PADRAO_DIMENSAO = "^(vendedor|empresa|cliente|produto|mes)$"
+PADRAO_METRICA = "^(vl_total|qt_itens|qt_pedidos)$"
+
+_COLUNAS_INT = ["id_pedido", "id_usuario", "id_empresa", "id_cliente", "id_produto", "qt_itens"]
+_COLUNAS_NOME = ["no_vendedor", "no_empresa", "no_cliente", "ds_produto"]
+
+
+# --- CARGA ---
+
+def _consulta_itens(db: Session, id_organizacao: int, desde: Optional[datetime] = None):
+    # Rótulos explícitos: sem eles as colunas viriam com o nome do banco (ID_PEDIDO...)
+    consulta = db.query(
+        models.Pedido.id_pedido.label("id_pedido"),
+        models.Pedido.dt_pedido.label("dt_pedido"),
+        models.Pedido.st_pedido.label("st_pedido"),
+        models.Pedido.dt_atualizacao.label("dt_atualizacao"),
+        models.Pedido.vl_total.label("vl_pedido"),
+        models.Pedido.id_usuario.label("id_usuario"),
+        models.Usuario.no_completo.label("no_vendedor"),
+        models.Pedido.id_empresa.label("id_empresa"),
+        models.Empresa.no_empresa.label("no_empresa"),
+        models.Pedido.id_cliente.label("id_cliente"),
+        models.Cliente.no_razao_social.label("no_cliente"),
+        models.ItemPedido.id_produto.label("id_produto"),
+        models.Produto.ds_produto.label("ds_produto"),
+        models.ItemPedido.qt_quantidade.label("qt_itens"),
+        models.ItemPedido.vl_total_item.label("vl_total_item"),
+    ).join(
+        models.ItemPedido, models.ItemPedido.id_pedido == models.Pedido.id_pedido
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).join(
+        models.Usuario, models.Pedido.id_usuario == models.Usuario.id_usuario
+    ).join(
+        models.Cliente, models.Pedido.id_cliente == models.Cliente.id_cliente
+    ).join(
+        models.Produto, models.ItemPedido.id_produto == models.Produto.id_produto
+    ).filter(
+        models.Empresa.id_organizacao == id_organizacao,
+        models.Pedido.st_pedido != 'rascunho'
+    )
+    if desde is not None:
+        consulta = consulta.filter(models.Pedido.dt_atualizacao >= desde)
+    return consulta
+
+
+def _ler(db: Session, id_organizacao: int, desde: Optional[datetime] = None) -> Tuple[pd.DataFrame, Optional[datetime]]:
+    """ Uma consulta -> (itens dos pedidos válidos, maior DT_ATUALIZACAO lida) """
+    linhas = pd.read_sql(
+        _consulta_itens(db, id_organizacao, desde).statement, db.connection(),
+        parse_dates=["dt_pedido", "dt_atualizacao"]
+    )
+    marca = linhas["dt_atualizacao"].max() if len(linhas) else None
+
+    # Valor do item proporcional ao total do pedido (aplica o desconto do pedido)
+    soma_itens = linhas.groupby("id_pedido")["vl_total_item"].transform("sum")
+    linhas["vl_total"] = np.where(
+        soma_itens > 0, linhas["vl_total_item"] * linhas["vl_pedido"] / soma_itens, 0.0
+    )
+    linhas["mes"] = linhas["dt_pedido"].dt.to_period("M").dt.to_timestamp()
+    return linhas, (marca.to_pydatetime() if marca is not None else None)
+
+
+def _tipar(frame: pd.DataFrame) -> pd.DataFrame:
+    """ Tipos compactos: ids int32, nomes 'category' """
+    return frame.astype(
+        {**{coluna: "int32" for coluna in _COLUNAS_INT},
+         **{coluna: "category" for coluna in _COLUNAS_NOME},
+         "vl_total": "float64"}
+    )
+
+
+def _compactar(linhas: pd.DataFrame) -> pd.DataFrame:
+    """ Remove pedidos fora da análise e as colunas usadas só na carga """
+    linhas = linhas.loc[~linhas["st_pedido"].isin(STATUS_FORA_ANALISE),
+                        ["id_pedido", "dt_pedido", "mes", "vl_total"] + _COLUNAS_INT[1:] + _COLUNAS_NOME]
+    return _tipar(linhas).reset_index(drop=True)
+
+
+def _carregar(db: Session, id_organizacao: int) -> Tuple[pd.DataFrame, Optional[datetime]]:
+    linhas, marca = _ler(db, id_organizacao)
+    return _compactar(linhas), marca
+
+
+def _atualizar(db: Session, id_organizacao: int, frame: pd.DataFrame,
+               marca: Optional[datetime]) -> Tuple[pd.DataFrame, Optional[datetime]]:
+    """ Troca no frame as linhas dos pedidos alterados desde a última carga """
+    if marca is None:
+        return _carregar(db, id_organizacao)
+
+    linhas, nova_marca = _ler(db, id_organizacao, desde=marca - MARGEM_ATUALIZACAO)
+    if not len(linhas):
+        return frame, marca
+
+    mantidas = frame.loc[~frame["id_pedido"].isin(linhas["id_pedido"].unique())]
+    # concat de 'category' com categorias diferentes vira texto: tipa de novo
+    frame = _tipar(pd.concat([mantidas, _compactar(linhas)], ignore_index=True))
+    return frame, max(marca, nova_marca)
+
+
+# --- CACHE ---
+
+class CacheAnalises:
+    """ DataFrames por organização, em LRU limitado por memória """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, max_bytes_organizacao: int = MAX_BYTES_ORGANIZACAO):
+        self.max_bytes = max_bytes
+        self.max_bytes_organizacao = max_bytes_organizacao
+        # id_organizacao -> (versao, marca, carregado_em, tamanho, frame)
+        self.entradas: "OrderedDict[int, tuple]" = OrderedDict()
+        self.qt_bytes = 0
+        self.lock = threading.Lock()
+
+    def obter(self, id_organizacao: int) -> Optional[tuple]:
+        with self.lock:
+            entrada = self.entradas.get(id_organizacao)
+            if entrada:
+                self.entradas.move_to_end(id_organizacao)
+            return entrada
+
+    def gravar(self, id_organizacao: int, versao: int, marca: Optional[datetime],
+               carregado_em: float, frame: pd.DataFrame):
+        tamanho = int(frame.memory_usage(deep=True).sum())
+        with self.lock:
+            if id_organizacao in self.entradas:
+                self.qt_bytes -= self.entradas.pop(id_organizacao)[3]
+
+            if tamanho > self.max_bytes_organizacao:
+                logger.warning("Análises: organização %s ocupa %s bytes (limite %s); não será mantida em cache",
+                               id_organizacao, tamanho, self.max_bytes_organizacao)
+                return
+
+            self.entradas[id_organizacao] = (versao, marca, carregado_em, tamanho, frame)
+            self.qt_bytes += tamanho
+            while self.qt_bytes > self.max_bytes:
+                _, removida = self.entradas.popitem(last=False)
+                self.qt_bytes -= removida[3]
+
+
+cache_analises = CacheAnalises()
+
+
+def frame_pedidos(db: Session, id_organizacao: int) -> pd.DataFrame:
+    """
+    DataFrame dos itens de pedidos da organização, atualizado.
+    Não altere o retorno: ele é compartilhado entre as requisições.
+    """
+    versao = versao_dados(db, id_organizacao)
+    entrada = cache_analises.obter(id_organizacao)
+
+    if entrada and time.monotonic() - entrada[2] < TTL_RECARGA_SEGUNDOS:
+        versao_cache, marca, carregado_em, _, frame = entrada
+        if versao_cache == versao:
+            return frame
+        frame, marca = _atualizar(db, id_organizacao, frame, marca)
+    else:
+        carregado_em = time.monotonic()
+        frame, marca = _carregar(db, id_organizacao)
+
+    cache_analises.gravar(id_organizacao, versao, marca, carregado_em, frame)
+    return frame
+
+
+# --- ANÁLISES ---
+
+def _no_periodo(frame: pd.DataFrame, intervalo: Intervalo) -> pd.DataFrame:
+    inicio, fim = intervalo
+    return frame.loc[(frame["dt_pedido"] >= inicio) & (frame["dt_pedido"] < fim)]
+
+
+def _agregar(agrupado, metrica: str):
+    if metrica == "qt_pedidos":
+        return agrupado["id_pedido"].nunique()
+    if metrica == "qt_itens":
+        return agrupado["qt_itens"].sum()
+    return agrupado["vl_total"].sum()
+
+
+def _nomes(frame: pd.DataFrame, dimensao: str) -> Dict:
+    """ id -> nome da dimensão (mes: 'AAAA-MM') """
+    coluna_id, coluna_nome = DIMENSOES[dimensao]
+    if coluna_nome is None:
+        return {mes: mes.strftime("%Y-%m") for mes in frame["mes"].unique()}
+    pares = frame[[coluna_id, coluna_nome]].drop_duplicates(coluna_id)
+    return dict(zip(pares[coluna_id], pares[coluna_nome].astype(str)))
+
+
+def curva_abc(frame: pd.DataFrame, dimensao: str, intervalo: Intervalo, metrica: str = "vl_total",
+              pc_limite_a: float = 80, pc_limite_b: float = 95) -> List[dict]:
+    """
+    Curva ABC de clientes, produtos, vendedores ou empresas: classe A até
+    pc_limite_a% do total acumulado, B até pc_limite_b%, C no restante
+    (o item que cruza o limite fica na classe de cima).
+    """
+    periodo = _no_periodo(frame, intervalo)
+    coluna_id = DIMENSOES[dimensao][0]
+    totais = _agregar(periodo.groupby(coluna_id, observed=True), metrica).sort_values(ascending=False, kind="stable")
+    totais = totais[totais > 0]
+    if totais.empty:
+        return []
+
+    pc_participacao = totais.to_numpy(dtype="float64") * 100 / totais.sum()
+    pc_acumulado = np.cumsum(pc_participacao)
+    pc_anterior = pc_acumulado - pc_participacao
+    classes = np.select([pc_anterior < pc_limite_a, pc_anterior < pc_limite_b], ["A", "B"], default="C")
+
+    nomes = _nomes(periodo, dimensao)
+    return [
+        {"id": int(id_), "ds_nome": nomes.get(id_, ""), "vl_metrica": round(float(valor), 2),
+         "pc_participacao": round(float(participacao), 2), "pc_acumulado": round(float(acumulado), 2),
+         "classe": str(classe)}
+        for id_, valor, participacao, acumulado, classe
+        in zip(totais.index, totais.to_numpy(), pc_participacao, pc_acumulado, classes)
+    ]
+
+
+def tabela_cruzada(frame: pd.DataFrame, linhas: List[str], coluna: Optional[str],
+                   intervalo: Intervalo, metrica: str = "vl_total") -> dict:
+    """
+    Tabela dinâmica: uma linha por combinação das dimensões em 'linhas'
+    e, se houver 'coluna', um valor por item dessa dimensão.
+    """
+    periodo = _no_periodo(frame, intervalo)
+    chaves = [DIMENSOES[dimensao][0] for dimensao in linhas]
+    agrupamento = chaves + ([DIMENSOES[coluna][0]] if coluna else [])
+
+    valores = _agregar(periodo.groupby(agrupamento, observed=True), metrica)
+    if coluna:
+        tabela = valores.unstack(fill_value=0).sort_index(axis=1)
+        # Total da linha: qt_pedidos não é somável entre colunas (o mesmo pedido pode ter várias empresas/produtos)
+        totais = _agregar(periodo.groupby(chaves, observed=True), metrica).reindex(tabela.index)
+    else:
+        tabela = valores.to_frame("valor")
+        totais = valores
+    ordem = np.argsort(-totais.to_numpy(dtype="float64"), kind="stable")
+    tabela, totais = tabela.iloc[ordem], totais.iloc[ordem]
+
+    nomes = {dimensao: _nomes(periodo, dimensao) for dimensao in linhas + ([coluna] if coluna else [])}
+    indices = tabela.index if len(chaves) > 1 else [(chave,) for chave in tabela.index]
+    return {
+        "colunas": [nomes[coluna][c] for c in tabela.columns] if coluna else [],
+        "linhas": [
+            {"chaves": [nomes[dimensao][chave] for dimensao, chave in zip(linhas, indice)],
+             "valores": [round(float(v), 2) for v in valores_linha] if coluna else [],
+             "total": round(float(total), 2)}
+            for indice, valores_linha, total in zip(indices, tabela.to_numpy(), totais.to_numpy())
+        ],
+    }
@@ -0,0 +1,216 @@
+# /backend/src/services/busca_produtos.py
+"""
+Busca textual de produtos por código, descrição e SKU das variações.
+
+O texto de cada produto fica em TB_BUSCA_PRODUTOS já normalizado (minúsculo,
+sem acentos, só letras e números), então "calca" encontra "Calça" e
+"cam001" encontra "CAM-001" nos dois bancos. A tabela é atualizada na
+transação de cada gravação de produto/variação ('indexar_produtos') e pela
+importação de planilhas.
+
+O índice depende do banco ('criar_indice_busca', na inicialização):
+- SQLite: tabela FTS5 (TB_BUSCA_PRODUTOS_FTS) com conteúdo externo,
+  mantida por triggers; relevância por bm25.
+- PostgreSQL: índice GIN sobre o tsvector dos códigos (peso A) e da
+  descrição (peso B); relevância por ts_rank.
+Cada termo digitado é tratado como prefixo e todos precisam aparecer
+("cami azul" encontra "Camiseta Básica Azul").
+
+Para reconstruir o índice:
+    python -m src.services.busca_produtos rebuild
+"""
+import re
+import sys
+import unicodedata
+from typing import Dict, Iterable, List
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, func, literal_column, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.models import models
+
+TABELA_FTS = "TB_BUSCA_PRODUTOS_FTS"
+TAMANHO_LOTE = 1000
+
+# Peso dos códigos em relação à descrição no bm25 (SQLite)
+PESO_CODIGOS = 10.0
+
+
+def termos(texto) -> List[str]:
+    """ Minúsculo, sem acentos, separado em sequências de letras/números """
+    texto = unicodedata.normalize("NFKD", str(texto or "")).lower()
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return re.findall(r"[0-9a-z]+", texto)
+
+
+def _texto_codigos(codigos: Iterable[str]) -> str:
+    """ Partes de cada código e o código inteiro sem separadores ("CAM-001" -> "cam 001 cam001") """
+    partes: List[str] = []
+    for codigo in codigos:
+        termos_codigo = termos(codigo)
+        partes.extend(termos_codigo)
+        if len(termos_codigo) > 1:
+            partes.append("".join(termos_codigo))
+    return " ".join(dict.fromkeys(partes))
+
+
+def indexar_produtos(db: Session, ids_produto: Iterable[int]):
+    """ Atualiza o texto de busca dos produtos, na transação corrente """
+    ids_produto = sorted(set(ids_produto))
+    if not ids_produto:
+        return
+
+    skus: Dict[int, List[str]] = {}
+    for id_produto, cd_sku in db.query(models.VariacaoProduto.id_produto, models.VariacaoProduto.cd_sku).filter(
+        models.VariacaoProduto.id_produto.in_(ids_produto),
+        models.VariacaoProduto.cd_sku.isnot(None)
+    ).order_by(models.VariacaoProduto.id_variacao):
+        skus.setdefault(id_produto, []).append(cd_sku)
+
+    linhas = [
+        {"ID_PRODUTO": id_produto, "ID_EMPRESA": id_empresa,
+         "TX_CODIGOS": _texto_codigos([cd_produto] + skus.get(id_produto, [])),
+         "TX_DESCRICAO": " ".join(termos(ds_produto))}
+        for id_produto, id_empresa, cd_produto, ds_produto in db.query(
+            models.Produto.id_produto, models.Produto.id_empresa,
+            models.Produto.cd_produto, models.Produto.ds_produto
+        ).filter(models.Produto.id_produto.in_(ids_produto))
+    ]
+    if not linhas:
+        return
+
+    tabela = models.BuscaProduto.__table__
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(tabela).values(linhas)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[tabela.c.ID_PRODUTO],
+        set_={coluna: stmt.excluded[coluna] for coluna in ("ID_EMPRESA", "TX_CODIGOS", "TX_DESCRICAO")},
+    ))
+
+
+def reconstruir_indice(db: Session) -> int:
+    """ Recalcula o texto de busca de todos os produtos e faz commit. Retorna a quantidade """
+    db.query(models.BuscaProduto).delete(synchronize_session=False)
+    ids_produto = [id_produto for id_produto, in db.query(models.Produto.id_produto).order_by(models.Produto.id_produto)]
+    for inicio in range(0, len(ids_produto), TAMANHO_LOTE):
+        indexar_produtos(db, ids_produto[inicio:inicio + TAMANHO_LOTE])
+    db.commit()
+    return len(ids_produto)
+
+
+def indice_vazio(db: Session) -> bool:
+    """ Banco com produtos mas sem texto de busca (ex: primeira execução) """
+    return (
+        db.query(models.BuscaProduto.id_produto).first() is None
+        and db.query(models.Produto.id_produto).first() is not None
+    )
+
+
+def _tsvector():
+    """ Mesma expressão do índice GIN (precisa ser idêntica para o índice ser usado) """
+    tabela = models.BuscaProduto.__table__
+    return func.setweight(
+        func.to_tsvector(literal_column("'simple'"), tabela.c.TX_CODIGOS), literal_column("'A'")
+    ).op("||")(func.setweight(
+        func.to_tsvector(literal_column("'simple'"), tabela.c.TX_DESCRICAO), literal_column("'B'")
+    ))
+
+
+def criar_indice_busca(db: Session):
+    """ Cria o índice textual do banco em uso (se ainda não existir) e faz commit """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS "IX_BUSCA_PRODUTOS_TSV" ON "TB_BUSCA_PRODUTOS" USING GIN ((
+                setweight(to_tsvector('simple', "TX_CODIGOS"), 'A')
+                || setweight(to_tsvector('simple', "TX_DESCRICAO"), 'B')
+            ))
+        """))
+        db.commit()
+        return
+
+    existe = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"), {"nome": TABELA_FTS}
+    ).scalar()
+    if existe:
+        return
+
+    db.execute(text(f"""
+        CREATE VIRTUAL TABLE {TABELA_FTS} USING fts5(
+            TX_CODIGOS, TX_DESCRICAO,
+            content='TB_BUSCA_PRODUTOS', content_rowid='ID_PRODUTO',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """))
+    # Triggers do FTS5 com conteúdo externo: remove o texto antigo e indexa o novo
+    db.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS tg_busca_produtos_ins AFTER INSERT ON TB_BUSCA_PRODUTOS BEGIN
+            INSERT INTO {TABELA_FTS} (rowid, TX_CODIGOS, TX_DESCRICAO)
+            VALUES (NEW.ID_PRODUTO, NEW.TX_CODIGOS, NEW.TX_DESCRICAO);
+        END
+    """))
+    db.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS tg_busca_produtos_del AFTER DELETE ON TB_BUSCA_PRODUTOS BEGIN
+            INSERT INTO {TABELA_FTS} ({TABELA_FTS}, rowid, TX_CODIGOS, TX_DESCRICAO)
+            VALUES ('delete', OLD.ID_PRODUTO, OLD.TX_CODIGOS, OLD.TX_DESCRICAO);
+        END
+    """))
+    db.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS tg_busca_produtos_upd AFTER UPDATE ON TB_BUSCA_PRODUTOS BEGIN
+            INSERT INTO {TABELA_FTS} ({TABELA_FTS}, rowid, TX_CODIGOS, TX_DESCRICAO)
+            VALUES ('delete', OLD.ID_PRODUTO, OLD.TX_CODIGOS, OLD.TX_DESCRICAO);
+            INSERT INTO {TABELA_FTS} (rowid, TX_CODIGOS, TX_DESCRICAO)
+            VALUES (NEW.ID_PRODUTO, NEW.TX_CODIGOS, NEW.TX_DESCRICAO);
+        END
+    """))
+    # Textos gravados antes da criação do índice
+    db.execute(text(f"INSERT INTO {TABELA_FTS} ({TABELA_FTS}) VALUES ('rebuild')"))
+    db.commit()
+
+
+def consulta_busca(db: Session, busca: str):
+    """
+    Subconsulta (id_produto, nr_relevancia) dos produtos que contêm todos os
+    termos da busca (como prefixo), para juntar à listagem e ordenar por
+    nr_relevancia (maior = mais relevante). None se a busca não tiver termos.
+    """
+    termos_busca = termos(busca)
+    if not termos_busca:
+        return None
+
+    if db.get_bind().dialect.name == "postgresql":
+        tabela = models.BuscaProduto.__table__
+        consulta = func.to_tsquery(
+            literal_column("'simple'"),
+            bindparam("busca", " & ".join(f"{termo}:*" for termo in termos_busca))
+        )
+        vetor = _tsvector()
+        return select(
+            tabela.c.ID_PRODUTO.label("id_produto"),
+            func.ts_rank(vetor, consulta).label("nr_relevancia")
+        ).where(vetor.op("@@")(consulta)).subquery()
+
+    fts = literal_column(TABELA_FTS)
+    return select(
+        literal_column("rowid").label("id_produto"),
+        (-func.bm25(fts, PESO_CODIGOS, 1.0)).label("nr_relevancia")
+    ).select_from(text(TABELA_FTS)).where(
+        fts.op("MATCH")(bindparam("busca", " ".join(f'"{termo}"*' for termo in termos_busca)))
+    ).subquery()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    from src.database import SessionLocal
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Uso: python -m src.services.busca_produtos rebuild")
+        sys.exit(1)
+
+    db: Session = SessionLocal()
+    try:
+        criar_indice_busca(db)
+        print(f"✅ Índice de busca reconstruído: {reconstruir_indice(db)} produtos.")
+    finally:
+        db.close()
@@ -0,0 +1,73 @@
+# /backend/src/services/cache_catalogo.py
+"""
+Cache do catálogo de venda do vendedor (/api/vendedor/catalogo/).
+
+Todos os vendedores de uma empresa pedem o mesmo catálogo várias vezes ao
+dia. Cada worker guarda o JSON pronto (bytes) por (empresa, catálogo,
+categoria), válido enquanto a versão dos catálogos da empresa
+(TB_VERSOES_CATALOGO) não mudar. A versão é incrementada na transação de
+cada alteração de catálogo, item, produto, variação, estoque ou categoria
+(ver 'alteracoes_catalogo').
+
+A versão também forma o ETag da resposta: o aplicativo reenvia o ETag em
+If-None-Match e, se nada mudou, recebe 304 sem corpo (o único acesso ao
+banco é a leitura da versão).
+
+Cada formato de resposta ('catalogo_compacto') tem sua própria entrada e
+seu próprio ETag.
+
+Limites (variáveis de ambiente, ver core/config.py):
+- CATALOG_CACHE_MAX_BYTES: memória aproximada por worker (padrão 32 MB, LRU).
+- CATALOG_CACHE_TTL_SECONDS: idade máxima de uma entrada (padrão 3600 s).
+"""
+from typing import Callable, Optional
+
+from src.core.config import settings
+from src.services.cache_relatorios import CacheRelatorios
+
+cache_catalogos = CacheRelatorios(
+    max_bytes=settings.CATALOG_CACHE_MAX_BYTES,
+    ttl_segundos=settings.CATALOG_CACHE_TTL_SECONDS,
+)
+
+
+def etag_catalogo(
+    id_empresa: int,
+    versao: int,
+    id_catalogo: int,
+    id_categoria: Optional[int],
+    formato: str = "completo"
+) -> str:
+    sufixo = "" if formato == "completo" else f"-{formato}"
+    return f'"{id_empresa}-{versao}-{id_catalogo}-{id_categoria or 0}{sufixo}"'
+
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    """ Compara o If-None-Match recebido (lista ou '*', com ou sem W/) com o ETag atual """
+    if not if_none_match:
+        return False
+    recebidos = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+    return "*" in recebidos or etag in recebidos
+
+
+def catalogo_em_cache(
+    id_empresa: int,
+    versao: int,
+    id_catalogo: int,
+    id_categoria: Optional[int],
+    serializar: Callable[[], bytes],
+    formato: str = "completo"
+) -> bytes:
+    """
+    Retorna o JSON do catálogo do cache ou o gera (e guarda).
+    'versao' deve ser lida ANTES de gerar: uma alteração commitada durante a
+    geração incrementa a versão e a entrada recém-gravada já nasce inválida.
+    """
+    chave = (id_empresa, id_catalogo, id_categoria, formato)
+    encontrado, conteudo = cache_catalogos.obter(chave, versao)
+    if encontrado:
+        return conteudo
+
+    conteudo = serializar()
+    cache_catalogos.gravar(chave, versao, conteudo)
+    return conteudo
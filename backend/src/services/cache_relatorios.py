@@ -0,0 +1,153 @@
+# /backend/src/services/cache_relatorios.py
+"""
+Cache dos relatórios e KPIs do gestor (/api/gestor/dashboard/*).
+
+Cada worker guarda em memória o resultado pronto de cada relatório, por
+(organização, relatório, período). A validade de uma entrada é a versão
+dos dados da organização (TB_VERSOES_DADOS), incrementada na mesma
+transação de cada pedido gravado/cancelado: qualquer worker que gravar um
+pedido invalida o cache de todos, e a conferência custa uma leitura por
+chave primária.
+
+Limites (variáveis de ambiente, ver core/config.py):
+- REPORT_CACHE_MAX_BYTES: memória aproximada por worker (padrão 32 MB);
+  ao passar do limite, saem os relatórios usados há mais tempo (LRU).
+- REPORT_CACHE_TTL_SECONDS: idade máxima de uma entrada (padrão 300 s),
+  para alterações que não passam por pedidos (ex: nome de um vendedor).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from pydantic_core import to_json
+from sqlalchemy import exists, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import models
+
+MAX_BYTES = settings.REPORT_CACHE_MAX_BYTES
+TTL_SEGUNDOS = settings.REPORT_CACHE_TTL_SECONDS
+
+
+def versao_dados(db: Session, id_organizacao: int) -> int:
+    """ Versão atual dos dados de relatório da organização """
+    return db.query(models.VersaoDadosOrganizacao.nr_versao).filter(
+        models.VersaoDadosOrganizacao.id_organizacao == id_organizacao
+    ).scalar() or 0
+
+
+def marcar_dados_alterados(db: Session, id_organizacao: Optional[int] = None):
+    """
+    Incrementa a versão dos dados da organização (ou de todas), na transação
+    corrente: os relatórios em cache deixam de valer quando ela for commitada.
+    """
+    tabela = models.VersaoDadosOrganizacao.__table__
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    if id_organizacao is None:
+        db.execute(update(tabela).values(NR_VERSAO=tabela.c.NR_VERSAO + 1))
+        # Organizações ainda sem linha (versão 0) passam para a versão 1
+        organizacoes = models.Organizacao.__table__
+        sem_versao = select(organizacoes.c.ID_ORGANIZACAO, literal(1)).where(
+            ~exists().where(tabela.c.ID_ORGANIZACAO == organizacoes.c.ID_ORGANIZACAO)
+        )
+        db.execute(insert(tabela).from_select(["ID_ORGANIZACAO", "NR_VERSAO"], sem_versao).on_conflict_do_nothing())
+        return
+
+    stmt = insert(tabela).values(ID_ORGANIZACAO=id_organizacao, NR_VERSAO=1)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[tabela.c.ID_ORGANIZACAO],
+        set_={tabela.c.NR_VERSAO: tabela.c.NR_VERSAO + 1},
+    ))
+
+
+class CacheRelatorios:
+    """ LRU limitado por memória (tamanho aproximado = JSON do resultado) """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, ttl_segundos: int = TTL_SEGUNDOS):
+        self.max_bytes = max_bytes
+        self.ttl_segundos = ttl_segundos
+        # chave -> (versao, criado_em, tamanho, resultado)
+        self.entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.qt_bytes = 0
+        self.qt_acertos = 0
+        self.qt_falhas = 0
+        self.qt_descartes = 0
+        self.lock = threading.Lock()
+
+    def obter(self, chave: Hashable, versao: int):
+        """ Retorna (True, resultado) se houver entrada válida; senão (False, None) """
+        with self.lock:
+            entrada = self.entradas.get(chave)
+            if entrada and entrada[0] == versao and time.monotonic() - entrada[1] < self.ttl_segundos:
+                self.entradas.move_to_end(chave)
+                self.qt_acertos += 1
+                return True, entrada[3]
+
+            if entrada:
+                self._remover(chave)
+            self.qt_falhas += 1
+            return False, None
+
+    def gravar(self, chave: Hashable, versao: int, resultado: Any):
+        # Conteúdo já serializado (ex: catálogo em JSON/MessagePack) é medido direto
+        tamanho = len(resultado) if isinstance(resultado, bytes) else len(to_json(resultado))
+        if tamanho > self.max_bytes:
+            return  # Maior que o cache inteiro: não vale guardar
+
+        with self.lock:
+            if chave in self.entradas:
+                self._remover(chave)
+            self.entradas[chave] = (versao, time.monotonic(), tamanho, resultado)
+            self.qt_bytes += tamanho
+
+            while self.qt_bytes > self.max_bytes:
+                self._remover(next(iter(self.entradas)))
+                self.qt_descartes += 1
+
+    def _remover(self, chave: Hashable):
+        self.qt_bytes -= self.entradas.pop(chave)[2]
+
+    def metricas(self) -> dict:
+        with self.lock:
+            total = self.qt_acertos + self.qt_falhas
+            return {
+                "pid": os.getpid(),
+                "qt_acertos": self.qt_acertos,
+                "qt_falhas": self.qt_falhas,
+                "pc_acertos": round(self.qt_acertos * 100 / total, 2) if total else 0,
+                "qt_entradas": len(self.entradas),
+                "qt_bytes": self.qt_bytes,
+                "qt_bytes_limite": self.max_bytes,
+                "qt_descartes": self.qt_descartes,
+            }
+
+
+cache_relatorios = CacheRelatorios()
+
+
+def relatorio_em_cache(
+    db: Session,
+    id_organizacao: int,
+    relatorio: str,
+    parametros: tuple,
+    calcular: Callable[[], Any]
+) -> Any:
+    """
+    Retorna o relatório do cache ou o calcula (e guarda).
+    A versão é lida ANTES do cálculo: um pedido gravado durante o cálculo
+    incrementa a versão e a entrada recém-gravada já nasce inválida.
+    """
+    versao = versao_dados(db, id_organizacao)
+    chave = (id_organizacao, relatorio, parametros)
+
+    encontrado, resultado = cache_relatorios.obter(chave, versao)
+    if encontrado:
+        return resultado
+
+    resultado = calcular()
+    cache_relatorios.gravar(chave, versao, resultado)
+    return resultado
@@ -0,0 +1,124 @@
+# /backend/src/services/catalogo_compacto.py
+"""
+Formato compacto do catálogo do vendedor (?format=compacto ou msgpack).
+
+No formato completo (ItemCatalogoVendaSchema) cada item repete todas as
+chaves do produto, da categoria e de cada variação, além das listas de
+preço de outros catálogos. Num catálogo com grades isso vira megabytes de
+chaves repetidas para o aplicativo baixar e decodificar.
+
+O formato compacto traz as mesmas informações de venda em colunas:
+- 'itens': um array por campo (item, preço e produto), na ordem do catálogo;
+  'qt_variacoes' diz quantas linhas de 'variacoes' pertencem a cada item.
+- 'variacoes': um array por campo, com as variações de todos os itens em
+  sequência; tamanho e cor são índices nos dicionários 'tamanhos' e
+  'cores' (null quando a variação não tem). Com isso a grade tamanho x cor
+  de cada produto é montada sem repetir os textos.
+- 'categorias': as categorias usadas, em colunas; 'itens.id_categoria'
+  aponta para 'categorias.id_categoria'.
+Valores monetários vão como texto (igual ao JSON completo) e datas em ISO.
+
+Exemplo de leitura do item i:
+    inicio = soma(qt_variacoes[:i]); fim = inicio + qt_variacoes[i]
+    tamanhos[variacoes.nr_tamanho[j]] para j em range(inicio, fim)
+"""
+import json
+from typing import Dict, List, Optional, Sequence
+
+import msgpack
+
+from src.models import models
+
+VERSAO_FORMATO = 1
+
+FORMATO_COMPLETO = "completo"
+FORMATO_COMPACTO = "compacto"
+FORMATO_MSGPACK = "msgpack"
+
+TIPO_MSGPACK = "application/x-msgpack"
+TIPO_COMPACTO = "application/vnd.repcom.catalogo-compacto+json"
+
+
+def formato_solicitado(formato: Optional[str], accept: Optional[str]) -> str:
+    """ O parâmetro 'format' tem prioridade; senão decide pelo header Accept """
+    if formato:
+        return formato
+    accept = (accept or "").lower()
+    if TIPO_MSGPACK in accept or "application/msgpack" in accept:
+        return FORMATO_MSGPACK
+    if TIPO_COMPACTO in accept:
+        return FORMATO_COMPACTO
+    return FORMATO_COMPLETO
+
+
+def _texto(valor) -> Optional[str]:
+    return None if valor is None else str(valor)
+
+
+def _indice(dicionario: Dict[str, int], valor: Optional[str]) -> Optional[int]:
+    if valor is None:
+        return None
+    return dicionario.setdefault(valor, len(dicionario))
+
+
+def montar_catalogo_compacto(id_catalogo: int, itens_catalogo: Sequence[models.ItemCatalogo]) -> dict:
+    """ Converte os itens do catálogo (com produto, variações e categoria carregados) em colunas """
+    itens: Dict[str, List] = {campo: [] for campo in (
+        "id_item_catalogo", "vl_preco_catalogo", "id_produto", "cd_produto", "ds_produto",
+        "sg_unidade_medida", "id_categoria", "dt_criacao", "qt_variacoes",
+    )}
+    variacoes: Dict[str, List] = {campo: [] for campo in (
+        "id_variacao", "nr_tamanho", "nr_cor", "cd_sku", "vl_ajuste_preco", "qt_estoque", "fl_ativa",
+    )}
+    tamanhos: Dict[str, int] = {}
+    cores: Dict[str, int] = {}
+    categorias: Dict[int, models.CategoriaProduto] = {}
+
+    for item in itens_catalogo:
+        produto = item.produto
+        itens["id_item_catalogo"].append(item.id_item_catalogo)
+        itens["vl_preco_catalogo"].append(_texto(item.vl_preco_catalogo))
+        itens["id_produto"].append(produto.id_produto)
+        itens["cd_produto"].append(produto.cd_produto)
+        itens["ds_produto"].append(produto.ds_produto)
+        itens["sg_unidade_medida"].append(produto.sg_unidade_medida)
+        itens["id_categoria"].append(produto.id_categoria)
+        itens["dt_criacao"].append(produto.dt_criacao.isoformat() if produto.dt_criacao else None)
+        itens["qt_variacoes"].append(len(produto.variacoes))
+        if produto.categoria is not None:
+            categorias[produto.categoria.id_categoria] = produto.categoria
+
+        for variacao in produto.variacoes:
+            variacoes["id_variacao"].append(variacao.id_variacao)
+            variacoes["nr_tamanho"].append(_indice(tamanhos, variacao.ds_tamanho))
+            variacoes["nr_cor"].append(_indice(cores, variacao.ds_cor))
+            variacoes["cd_sku"].append(variacao.cd_sku)
+            variacoes["vl_ajuste_preco"].append(_texto(variacao.vl_ajuste_preco))
+            variacoes["qt_estoque"].append(variacao.qt_estoque)
+            variacoes["fl_ativa"].append(variacao.fl_ativa)
+
+    lista_categorias = [categorias[id_categoria] for id_categoria in sorted(categorias)]
+    return {
+        "versao_formato": VERSAO_FORMATO,
+        "id_catalogo": id_catalogo,
+        "qt_itens": len(itens["id_item_catalogo"]),
+        "itens": itens,
+        "variacoes": variacoes,
+        "tamanhos": list(tamanhos),
+        "cores": list(cores),
+        "categorias": {
+            "id_categoria": [c.id_categoria for c in lista_categorias],
+            "id_organizacao": [c.id_organizacao for c in lista_categorias],
+            "no_categoria": [c.no_categoria for c in lista_categorias],
+            "ds_categoria": [c.ds_categoria for c in lista_categorias],
+            "fl_ativa": [c.fl_ativa for c in lista_categorias],
+            "id_categoria_pai": [c.id_categoria_pai for c in lista_categorias],
+        },
+    }
+
+
+def serializar_compacto(catalogo: dict, formato: str) -> bytes:
+    """ JSON sem espaços ou MessagePack """
+    if formato == FORMATO_MSGPACK:
+        return msgpack.packb(catalogo, use_bin_type=True)
+    return json.dumps(catalogo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,238 @@
+# /backend/src/services/comissoes.py
+"""
+Livro de comissões (TB_COMISSOES_PEDIDO).
+
+A comissão de cada pedido é resolvida uma única vez, quando o pedido é
+gravado ou muda de status, a partir das Regras de Comissão da organização
+(prioridade, empresa, vendedor e vigência). Sem regra aplicável, vale o
+percentual padrão da empresa. Os relatórios apenas leem o livro.
+
+Na inicialização, um livro vazio com pedidos já gravados é preenchido
+automaticamente. Para reprocessar pedidos antigos (backfill):
+    python -m src.services.comissoes [id_organizacao]
+"""
+import sys
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.services.cache_relatorios import marcar_dados_alterados
+
+# Tempo máximo (segundos) que um índice fica em memória sem ser recarregado.
+# Alterações de regras feitas em outro worker do Gunicorn aparecem após esse prazo;
+# no próprio worker a invalidação é imediata (invalidar_indice_regras).
+TTL_INDICE_SEGUNDOS = 60
+
+# Status que não geram comissão (o rascunho só entra no livro ao ser enviado)
+STATUS_SEM_COMISSAO = ('rascunho', 'cancelado')
+
+# (id_empresa, id_usuario): regras específicas vencem as genéricas em caso de empate
+ESPECIFICIDADE = {
+    (True, True): 3,
+    (False, True): 2,
+    (True, False): 1,
+    (False, False): 0,
+}
+
+
+class IndiceRegrasComissao:
+    """
+    Regras ativas de uma organização, agrupadas por (id_empresa, id_usuario).
+    Cada grupo fica ordenado por prioridade; a resolução consulta no máximo
+    os quatro grupos que podem casar com o pedido.
+    """
+
+    def __init__(self, regras: Iterable[models.RegraComissao]):
+        self.grupos: Dict[Tuple[Optional[int], Optional[int]], List[tuple]] = {}
+        for regra in regras:
+            chave = (regra.id_empresa, regra.id_usuario)
+            self.grupos.setdefault(chave, []).append((
+                regra.nr_prioridade or 0,
+                regra.id_regra_comissao,
+                regra.dt_inicio_vigencia,
+                regra.dt_fim_vigencia,
+                regra.pc_comissao,
+            ))
+        for lista in self.grupos.values():
+            lista.sort(key=lambda r: (r[0], r[1]), reverse=True)
+
+    def resolver(
+        self, id_empresa: int, id_usuario: int, data: date
+    ) -> Optional[Tuple[Decimal, int]]:
+        """ Retorna (pc_comissao, id_regra) da regra vencedora, ou None """
+        melhor = None
+        melhor_ordem = None
+
+        for chave in ((id_empresa, id_usuario), (None, id_usuario), (id_empresa, None), (None, None)):
+            for prioridade, id_regra, dt_inicio, dt_fim, pc_comissao in self.grupos.get(chave, ()):
+                if dt_inicio and data < dt_inicio:
+                    continue
+                if dt_fim and data > dt_fim:
+                    continue
+                ordem = (prioridade, ESPECIFICIDADE[(chave[0] is not None, chave[1] is not None)], id_regra)
+                if melhor_ordem is None or ordem > melhor_ordem:
+                    melhor, melhor_ordem = (pc_comissao, id_regra), ordem
+                break  # Grupo já ordenado: a primeira regra vigente é a melhor dele
+
+        return melhor
+
+
+_indices: Dict[int, Tuple[float, IndiceRegrasComissao]] = {}
+_indices_lock = threading.Lock()
+
+
+def obter_indice_regras(db: Session, id_organizacao: int) -> IndiceRegrasComissao:
+    """ Retorna o índice de regras da organização (em cache por TTL_INDICE_SEGUNDOS) """
+    agora = time.monotonic()
+    with _indices_lock:
+        cache = _indices.get(id_organizacao)
+        if cache and agora - cache[0] < TTL_INDICE_SEGUNDOS:
+            return cache[1]
+
+    regras = db.query(models.RegraComissao).filter(
+        models.RegraComissao.id_organizacao == id_organizacao,
+        models.RegraComissao.fl_ativa == True
+    ).all()
+    indice = IndiceRegrasComissao(regras)
+
+    with _indices_lock:
+        _indices[id_organizacao] = (agora, indice)
+    return indice
+
+
+def invalidar_indice_regras(id_organizacao: int):
+    """ Descarta o índice em cache (chamado nas rotas de CRUD de regras) """
+    with _indices_lock:
+        _indices.pop(id_organizacao, None)
+
+
+def registrar_comissoes(db: Session, pedidos: Iterable[models.Pedido]):
+    """
+    Grava/atualiza no livro a comissão dos pedidos (na transação corrente).
+    Pedidos cancelados têm sua comissão removida; rascunhos não entram no livro.
+    Os pedidos precisam estar com ID (após flush) e com dt_pedido preenchida.
+    """
+    pedidos = list(pedidos)
+    if not pedidos:
+        return
+
+    empresas = {
+        id_empresa: (id_organizacao, pc_padrao)
+        for id_empresa, id_organizacao, pc_padrao in db.query(
+            models.Empresa.id_empresa,
+            models.Empresa.id_organizacao,
+            models.Empresa.pc_comissao_padrao
+        ).filter(
+            models.Empresa.id_empresa.in_({p.id_empresa for p in pedidos})
+        )
+    }
+    existentes = {
+        c.id_pedido: c for c in db.query(models.ComissaoPedido).filter(
+            models.ComissaoPedido.id_pedido.in_([p.id_pedido for p in pedidos])
+        )
+    }
+
+    for pedido in pedidos:
+        atual = existentes.get(pedido.id_pedido)
+
+        if pedido.st_pedido in STATUS_SEM_COMISSAO:
+            if atual:
+                db.delete(atual)
+            continue
+
+        id_organizacao, pc_padrao = empresas[pedido.id_empresa]
+        data_pedido = (pedido.dt_pedido or datetime.utcnow()).date()
+        resolvida = obter_indice_regras(db, id_organizacao).resolver(
+            pedido.id_empresa, pedido.id_usuario, data_pedido
+        )
+
+        if resolvida:
+            pc_comissao, id_regra = resolvida
+            observacao = f"Regra de comissão #{id_regra}"
+        else:
+            pc_comissao = pc_padrao or Decimal(0)
+            observacao = "Comissão padrão da empresa"
+
+        pc_comissao = Decimal(pc_comissao)
+        vl_comissao = (Decimal(pedido.vl_total) * pc_comissao / 100).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+
+        if atual:
+            atual.id_usuario = pedido.id_usuario
+            atual.pc_comissao = pc_comissao
+            atual.vl_comissao = vl_comissao
+            atual.ds_observacao = observacao
+        else:
+            db.add(models.ComissaoPedido(
+                id_pedido=pedido.id_pedido,
+                id_usuario=pedido.id_usuario,
+                pc_comissao=pc_comissao,
+                vl_comissao=vl_comissao,
+                ds_observacao=observacao,
+            ))
+
+
+def recalcular_comissoes(db: Session, id_organizacao: Optional[int] = None, tamanho_lote: int = 1000) -> int:
+    """
+    Reprocessa o livro dos pedidos enviados (de todas as organizações ou de uma).
+    Remove comissões de rascunhos/cancelados que tenham ficado no livro. Retorna a quantidade.
+    """
+    query = db.query(models.Pedido).order_by(models.Pedido.id_pedido)
+    if id_organizacao:
+        query = query.join(
+            models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+        ).filter(models.Empresa.id_organizacao == id_organizacao)
+
+    sem_comissao = query.filter(
+        models.Pedido.st_pedido.in_(STATUS_SEM_COMISSAO)
+    ).with_entities(models.Pedido.id_pedido).order_by(None)
+    db.query(models.ComissaoPedido).filter(
+        models.ComissaoPedido.id_pedido.in_(sem_comissao.subquery().select())
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    query = query.filter(models.Pedido.st_pedido.notin_(STATUS_SEM_COMISSAO))
+
+    total = 0
+    ultimo_id = 0
+    while True:
+        lote = query.filter(models.Pedido.id_pedido > ultimo_id).limit(tamanho_lote).all()
+        if not lote:
+            break
+        registrar_comissoes(db, lote)
+        db.commit()
+        total += len(lote)
+        ultimo_id = lote[-1].id_pedido
+
+    marcar_dados_alterados(db, id_organizacao)
+    db.commit()
+    return total
+
+
+def livro_vazio(db: Session) -> bool:
+    """ Banco com pedidos mas sem comissões (ex: primeira execução após a troca da View pelo livro) """
+    return (
+        db.query(models.ComissaoPedido.id_pedido).first() is None
+        and db.query(models.Pedido.id_pedido).filter(
+            models.Pedido.st_pedido.notin_(STATUS_SEM_COMISSAO)
+        ).first() is not None
+    )
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    from src.database import SessionLocal
+
+    db: Session = SessionLocal()
+    try:
+        org = int(sys.argv[1]) if len(sys.argv) > 1 else None
+        print(f"✅ Comissões recalculadas: {recalcular_comissoes(db, org)} pedidos.")
+    finally:
+        db.close()
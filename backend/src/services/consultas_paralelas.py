@@ -0,0 +1,43 @@
+# /backend/src/services/consultas_paralelas.py
+"""
+Execução concorrente de consultas independentes (ex: GET /api/gestor/dashboard/bundle).
+
+Cada consulta roda em uma thread do pool e em uma sessão própria (uma
+conexão do pool do SQLAlchemy): o tempo total fica próximo ao da consulta
+mais lenta, em vez da soma de todas.
+
+O pool de threads é único por worker e limitado por DASHBOARD_WORKERS
+(padrão 5). Isso também limita as conexões extras abertas por essas
+consultas, que devem caber no pool do engine (pool_size 5 + max_overflow
+10 por padrão) junto com as sessões das próprias requisições.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.database import SessionLocal
+
+MAX_THREADS = settings.DASHBOARD_WORKERS
+
+# As threads só são criadas no primeiro uso (depois do fork do gunicorn)
+executor = ThreadPoolExecutor(max_workers=MAX_THREADS, thread_name_prefix="consulta")
+
+
+def _executar_com_sessao(consulta: Callable[[Session], Any]) -> Any:
+    db = SessionLocal()
+    try:
+        return consulta(db)
+    finally:
+        db.close()
+
+
+def executar_em_paralelo(consultas: Dict[str, Callable[[Session], Any]]) -> Dict[str, Any]:
+    """
+    Executa as consultas ({nome: função(db)}) ao mesmo tempo, cada uma com
+    a sua sessão, e devolve {nome: resultado}. Um erro em qualquer consulta
+    é repassado a quem chamou.
+    """
+    futuros = {nome: executor.submit(_executar_com_sessao, consulta) for nome, consulta in consultas.items()}
+    return {nome: futuro.result() for nome, futuro in futuros.items()}
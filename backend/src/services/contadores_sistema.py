@@ -0,0 +1,177 @@
+# /backend/src/services/contadores_sistema.py
+"""
+Contadores globais do dashboard do Super Admin (TB_CONTADORES_SISTEMA).
+
+Em vez de contar organizações/usuários e somar todos os pedidos do sistema
+a cada acesso, os totais são ajustados na mesma transação de cada gravação:
+- organização criada ou com status alterado;
+- usuário (gestor/vendedor) criado ou ativado/desativado;
+- pedido gravado ou cancelado ('registrar_contadores_pedidos').
+Os ajustes são UPSERTs aditivos em uma das NR_PARTICOES linhas do contador
+(escolhida pela organização), e a leitura soma as partições em uma consulta.
+
+A reconciliação recalcula os totais a partir das tabelas e corrige a
+diferença (gravações fora das rotas, ex: seed ou SQL manual). Ela roda na
+inicialização e pode ser agendada:
+    python -m src.services.contadores_sistema reconciliar
+"""
+import sys
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.models import models
+
+NR_PARTICOES = 16
+
+CONTADORES = (
+    "organizacoes_ativas",
+    "organizacoes_suspensas",
+    "gestores_ativos",
+    "vendedores_ativos",
+    "pedidos",
+    "vl_pedidos",
+)
+
+# Status que não contam como pedido (mesmo critério dos resumos de vendas)
+STATUS_FORA_CONTAGEM = ('cancelado', 'rascunho')
+
+
+def contadores_organizacao(st_assinatura: Optional[str]) -> Dict[str, int]:
+    """ Contadores em que uma organização com esse status entra """
+    if st_assinatura == 'ativo':
+        return {"organizacoes_ativas": 1}
+    if st_assinatura == 'suspenso':
+        return {"organizacoes_suspensas": 1}
+    return {}
+
+
+def contadores_usuario(tp_usuario: Optional[str], fl_ativo: Optional[bool]) -> Dict[str, int]:
+    """ Contadores em que um usuário desse tipo/situação entra """
+    if not fl_ativo:
+        return {}
+    if tp_usuario == 'gestor':
+        return {"gestores_ativos": 1}
+    if tp_usuario == 'vendedor':
+        return {"vendedores_ativos": 1}
+    return {}
+
+
+def diferenca(antes: Dict[str, int], depois: Dict[str, int]) -> Dict[str, int]:
+    """ Ajuste de contadores de uma alteração (ex: organização 'ativo' -> 'suspenso') """
+    return {chave: depois.get(chave, 0) - antes.get(chave, 0) for chave in set(antes) | set(depois)}
+
+
+def somar_contadores(db: Session, ajustes: Dict[str, object], id_organizacao: Optional[int] = None):
+    """ Soma os ajustes aos contadores, na transação corrente """
+    linhas = [
+        {"CD_CONTADOR": cd_contador, "NR_PARTICAO": (id_organizacao or 0) % NR_PARTICOES, "VL_CONTADOR": valor}
+        for cd_contador, valor in ajustes.items() if valor
+    ]
+    if not linhas:
+        return
+
+    tabela = models.ContadorSistema.__table__
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(tabela).values(linhas)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[tabela.c.CD_CONTADOR, tabela.c.NR_PARTICAO],
+        set_={tabela.c.VL_CONTADOR: tabela.c.VL_CONTADOR + stmt.excluded.VL_CONTADOR},
+    ))
+
+
+def registrar_contadores_pedidos(db: Session, pedidos: Iterable[models.Pedido], sinal: int = 1):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) os pedidos dos contadores 'pedidos'
+    e 'vl_pedidos', na transação corrente (uma partição por organização).
+    """
+    pedidos = list(pedidos)
+    if not pedidos:
+        return
+
+    empresas = dict(db.query(models.Empresa.id_empresa, models.Empresa.id_organizacao).filter(
+        models.Empresa.id_empresa.in_({p.id_empresa for p in pedidos})
+    ).all())
+    por_organizacao: Dict[int, list] = {}
+    for pedido in pedidos:
+        total = por_organizacao.setdefault(empresas[pedido.id_empresa], [0, Decimal(0)])
+        total[0] += sinal
+        total[1] += sinal * Decimal(pedido.vl_total or 0)
+
+    for id_organizacao, (qt, vl) in por_organizacao.items():
+        somar_contadores(db, {"pedidos": qt, "vl_pedidos": vl}, id_organizacao)
+
+
+def ler_contadores(db: Session) -> Dict[str, Decimal]:
+    """ Todos os contadores (soma das partições), em uma consulta """
+    valores = dict(db.query(
+        models.ContadorSistema.cd_contador, func.sum(models.ContadorSistema.vl_contador)
+    ).group_by(models.ContadorSistema.cd_contador).all())
+    return {cd_contador: Decimal(valores.get(cd_contador) or 0) for cd_contador in CONTADORES}
+
+
+def calcular_contadores(db: Session) -> Dict[str, Decimal]:
+    """ Valores reais, calculados a partir das tabelas (usado na reconciliação) """
+    organizacoes = dict(db.query(
+        models.Organizacao.st_assinatura, func.count(models.Organizacao.id_organizacao)
+    ).filter(
+        models.Organizacao.st_assinatura.in_(('ativo', 'suspenso'))
+    ).group_by(models.Organizacao.st_assinatura).all())
+
+    usuarios = dict(db.query(
+        models.Usuario.tp_usuario, func.count(models.Usuario.id_usuario)
+    ).filter(
+        models.Usuario.tp_usuario.in_(('gestor', 'vendedor')),
+        models.Usuario.fl_ativo.is_(True)
+    ).group_by(models.Usuario.tp_usuario).all())
+
+    pedidos = db.query(
+        func.count(models.Pedido.id_pedido), func.sum(models.Pedido.vl_total)
+    ).filter(
+        models.Pedido.st_pedido.notin_(STATUS_FORA_CONTAGEM)
+    ).first()
+
+    return {
+        "organizacoes_ativas": Decimal(organizacoes.get('ativo', 0)),
+        "organizacoes_suspensas": Decimal(organizacoes.get('suspenso', 0)),
+        "gestores_ativos": Decimal(usuarios.get('gestor', 0)),
+        "vendedores_ativos": Decimal(usuarios.get('vendedor', 0)),
+        "pedidos": Decimal(pedidos[0] or 0),
+        "vl_pedidos": Decimal(pedidos[1] or 0),
+    }
+
+
+def reconciliar_contadores(db: Session) -> Dict[str, Decimal]:
+    """
+    Corrige os contadores para os valores reais e faz commit.
+    Retorna as correções aplicadas (vazio se não havia divergência).
+    """
+    atuais = ler_contadores(db)
+    correcoes = {
+        cd_contador: valor - atuais[cd_contador]
+        for cd_contador, valor in calcular_contadores(db).items()
+        if valor != atuais[cd_contador]
+    }
+    somar_contadores(db, correcoes)
+    db.commit()
+    return correcoes
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    from src.database import SessionLocal
+
+    if len(sys.argv) < 2 or sys.argv[1] != "reconciliar":
+        print("Uso: python -m src.services.contadores_sistema reconciliar")
+        sys.exit(1)
+
+    db: Session = SessionLocal()
+    try:
+        correcoes = reconciliar_contadores(db)
+        print(f"✅ Contadores reconciliados. Correções: {correcoes or 'nenhuma'}")
+    finally:
+        db.close()
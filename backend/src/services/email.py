@@ -1,10 +1,9 @@
 # /backend/src/services/email.py
-import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType, NameEmail
+from fastapi_mail import ConnectionConfig
 from pydantic import EmailStr
-from starlette.background import BackgroundTasks
+from sqlalchemy.orm import Session
 
 from src.models import models
 from src.core.config import settings
@@ -21,20 +20,46 @@ def get_email_config() -> ConnectionConfig:
     global _conf
     if _conf is None:
         _conf = ConnectionConfig(
-            MAIL_USERNAME=os.getenv("MAIL_USERNAME"),
-            MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
-            MAIL_FROM=os.getenv("MAIL_FROM"),
-            MAIL_PORT=int(os.getenv("MAIL_PORT", 587)),
-            MAIL_SERVER=os.getenv("MAIL_SERVER"),
-            MAIL_STARTTLS=True,
-            MAIL_SSL_TLS=False,
-            USE_CREDENTIALS=True,
-            VALIDATE_CERTS=True,
+            MAIL_USERNAME=settings.MAIL_USERNAME,
+            MAIL_PASSWORD=settings.MAIL_PASSWORD,
+            MAIL_FROM=settings.MAIL_FROM,
+            MAIL_PORT=settings.MAIL_PORT,
+            MAIL_SERVER=settings.MAIL_SERVER,
+            MAIL_STARTTLS=settings.MAIL_STARTTLS,
+            MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
+            USE_CREDENTIALS=settings.MAIL_USE_CREDENTIALS,
+            VALIDATE_CERTS=settings.MAIL_VALIDATE_CERTS,
             TEMPLATE_FOLDER=Path(__file__).parent.parent / "templates",
         )
     return _conf
 
 
+def enfileirar_email(
+    db: Session,
+    tp_email: str,
+    emails_to: List[EmailStr],
+    assunto: str,
+    template_name: str,
+    template_body: Dict[str, Any],
+) -> models.FilaEmail:
+    """
+    Grava o e-mail na fila (TB_FILA_EMAILS) na transação corrente.
+    O commit fica a cargo de quem chama, junto com o restante da operação;
+    o envio é feito pelo processo 'src.services.email_worker'.
+    """
+    db_email = models.FilaEmail(
+        tp_email=tp_email,
+        ds_destinatarios=[str(email) for email in emails_to],
+        ds_assunto=assunto,
+        no_template=template_name,
+        ds_dados_template=template_body,
+        st_envio="pendente",
+        qt_tentativas=0,
+    )
+    db.add(db_email)
+    return db_email
+
+
 class EmailService:
     @staticmethod
     def formatar_moeda(valor):
@@ -42,12 +67,12 @@ class EmailService:
 
     @staticmethod
     def send_order_confirmation(
-        background_tasks: BackgroundTasks,
+        db: Session,
         pedido: models.Pedido,
         emails_to: List[EmailStr],
     ):
         """
-        Prepara os dados e coloca o envio na fila de background tasks.
+        Prepara os dados e coloca o envio na fila de e-mails.
         """
 
         # Prepara os dados para o Template HTML
@@ -70,37 +95,27 @@ class EmailService:
             "status": pedido.st_pedido.upper().replace("_", " "),
         }
 
-        message = MessageSchema(
-            subject=f"Pedido {body_data['nr_pedido']} - Confirmação",
-            recipients=emails_to,
+        return enfileirar_email(
+            db,
+            tp_email="pedido_confirmacao",
+            emails_to=emails_to,
+            assunto=f"Pedido {body_data['nr_pedido']} - Confirmação",
+            template_name="pedido_confirmacao.html",
             template_body=body_data,
-            subtype=MessageType.html,
-        )
-
-        fm = FastMail(get_email_config())
-
-        # Envia em background para não travar a API
-        background_tasks.add_task(
-            fm.send_message, message, template_name="pedido_confirmacao.html"
         )
 
     @staticmethod
-    def send_password_reset_email(
-        background_tasks: BackgroundTasks, email_to: EmailStr, reset_link: str
-    ):
+    def send_password_reset_email(db: Session, email_to: EmailStr, reset_link: str):
         """
-        Envia email com link de recuperação de senha.
+        Coloca na fila o email com link de recuperação de senha.
         """
         body_data = {"reset_link": reset_link}
 
-        message = MessageSchema(
-            subject="Recuperação de Senha - RepCom",
-            recipients=[email_to],
+        return enfileirar_email(
+            db,
+            tp_email="recuperacao_senha",
+            emails_to=[email_to],
+            assunto="Recuperação de Senha - RepCom",
+            template_name="recuperacao_senha.html",
             template_body=body_data,
-            subtype=MessageType.html,
-        )
-
-        fm = FastMail(get_email_config())
-        background_tasks.add_task(
-            fm.send_message, message, template_name="recuperacao_senha.html"
         )
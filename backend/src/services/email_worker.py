@@ -0,0 +1,234 @@
+# /backend/src/services/email_worker.py
+"""
+Processo dedicado ao envio dos e-mails gravados em TB_FILA_EMAILS.
+
+Roda fora dos workers do Gunicorn:
+    python -m src.services.email_worker
+
+Busca os e-mails pendentes em lotes, envia todos por uma mesma conexão
+SMTP (reaproveitada entre os lotes) e reagenda falhas com backoff
+exponencial. Para testar localmente, aponte MAIL_SERVER/MAIL_PORT para um
+SMTP de teste (ex: 'python -m aiosmtpd -n -l localhost:1025') com
+MAIL_STARTTLS=false e MAIL_USE_CREDENTIALS=false.
+
+E-mails enviados ou descartados (erro) ficam na tabela apenas por
+EMAIL_OUTBOX_RETENTION_DAYS dias (padrão 30): o próprio processo apaga os
+mais antigos a cada EMAIL_WORKER_PURGE_INTERVAL segundos. A métrica da
+fila é registrada no log a cada EMAIL_WORKER_METRICS_INTERVAL segundos.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import List, Optional
+
+import aiosmtplib
+from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+from src.core.config import settings
+from src.database import SessionLocal
+from src.models import models
+from src.services.email import get_email_config
+
+logger = logging.getLogger("email_worker")
+
+TAMANHO_LOTE = settings.EMAIL_WORKER_BATCH
+INTERVALO_SEGUNDOS = settings.EMAIL_WORKER_INTERVAL
+MAX_TENTATIVAS = settings.EMAIL_WORKER_MAX_RETRIES
+BACKOFF_BASE_SEGUNDOS = 30
+BACKOFF_MAX_SEGUNDOS = 60 * 60
+DIAS_RETENCAO = settings.EMAIL_OUTBOX_RETENTION_DAYS
+INTERVALO_METRICAS_SEGUNDOS = settings.EMAIL_WORKER_METRICS_INTERVAL
+INTERVALO_LIMPEZA_SEGUNDOS = settings.EMAIL_WORKER_PURGE_INTERVAL
+
+
+def calcular_backoff(qt_tentativas: int) -> timedelta:
+    """ Espera exponencial: 30s, 1min, 2min, ... limitada a 1 hora """
+    segundos = BACKOFF_BASE_SEGUNDOS * (2 ** max(qt_tentativas - 1, 0))
+    return timedelta(seconds=min(segundos, BACKOFF_MAX_SEGUNDOS))
+
+
+def profundidade_fila(db: Session) -> dict:
+    """
+    Métrica da fila: quantidade de e-mails por status e o pendente mais antigo.
+    Cada contagem filtra um status: é uma faixa do IX_FILA_EMAILS_PENDENTES
+    (ST_ENVIO, ...), sem varrer o histórico dos outros status.
+    """
+    pendentes, mais_antigo = db.query(
+        func.count(models.FilaEmail.id_email), func.min(models.FilaEmail.dt_criacao)
+    ).filter(models.FilaEmail.st_envio == "pendente").one()
+
+    def contar(st_envio: str) -> int:
+        return db.query(func.count(models.FilaEmail.id_email)).filter(
+            models.FilaEmail.st_envio == st_envio
+        ).scalar()
+
+    return {
+        "qt_pendentes": pendentes,
+        "qt_enviados": contar("enviado"),
+        "qt_erros": contar("erro"),
+        "dt_pendente_mais_antigo": mais_antigo,
+    }
+
+
+def limpar_fila_antiga(db: Session) -> int:
+    """ Apaga os e-mails enviados/descartados mais antigos que a retenção e faz commit """
+    apagados = db.query(models.FilaEmail).filter(
+        models.FilaEmail.st_envio.in_(("enviado", "erro")),
+        models.FilaEmail.dt_criacao < datetime.utcnow() - timedelta(days=DIAS_RETENCAO)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return apagados
+
+
+def buscar_lote(db: Session, tamanho: int = TAMANHO_LOTE) -> List[models.FilaEmail]:
+    """
+    Seleciona os próximos e-mails prontos para envio.
+    No PostgreSQL usa 'FOR UPDATE SKIP LOCKED', permitindo mais de um
+    processo de envio sem que dois peguem o mesmo e-mail.
+    """
+    return (
+        db.query(models.FilaEmail)
+        .filter(
+            models.FilaEmail.st_envio == "pendente",
+            models.FilaEmail.dt_proxima_tentativa <= datetime.utcnow(),
+        )
+        .order_by(models.FilaEmail.dt_proxima_tentativa, models.FilaEmail.id_email)
+        .limit(tamanho)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+class RemetenteSMTP:
+    """ Mantém uma única conexão SMTP aberta e a reaproveita entre os lotes """
+
+    def __init__(self):
+        self.conf = get_email_config()
+        self.templates = Environment(
+            loader=FileSystemLoader(str(self.conf.TEMPLATE_FOLDER)),
+            autoescape=select_autoescape(["html", "xml"]),
+        )
+        self.smtp: Optional[aiosmtplib.SMTP] = None
+
+    async def conectar(self):
+        if self.smtp is not None and self.smtp.is_connected:
+            return
+        self.smtp = aiosmtplib.SMTP(
+            hostname=self.conf.MAIL_SERVER,
+            port=self.conf.MAIL_PORT,
+            use_tls=self.conf.MAIL_SSL_TLS,
+            start_tls=self.conf.MAIL_STARTTLS,
+            validate_certs=self.conf.VALIDATE_CERTS,
+        )
+        await self.smtp.connect()
+        if self.conf.USE_CREDENTIALS:
+            await self.smtp.login(
+                self.conf.MAIL_USERNAME, self.conf.MAIL_PASSWORD.get_secret_value()
+            )
+
+    async def fechar(self):
+        if self.smtp is not None and self.smtp.is_connected:
+            try:
+                await self.smtp.quit()
+            except aiosmtplib.SMTPException:
+                pass
+        self.smtp = None
+
+    def montar_mensagem(self, db_email: models.FilaEmail) -> EmailMessage:
+        html = self.templates.get_template(db_email.no_template).render(
+            **(db_email.ds_dados_template or {})
+        )
+        message = EmailMessage()
+        remetente = self.conf.MAIL_FROM
+        if self.conf.MAIL_FROM_NAME:
+            remetente = f"{self.conf.MAIL_FROM_NAME} <{self.conf.MAIL_FROM}>"
+        message["From"] = remetente
+        message["To"] = ", ".join(db_email.ds_destinatarios)
+        message["Subject"] = db_email.ds_assunto
+        message.set_content(html, subtype="html")
+        return message
+
+    async def enviar(self, db_email: models.FilaEmail):
+        await self.conectar()
+        try:
+            await self.smtp.send_message(self.montar_mensagem(db_email))
+        except aiosmtplib.SMTPServerDisconnected:
+            # O servidor pode encerrar conexões ociosas: reconecta uma vez
+            self.smtp = None
+            await self.conectar()
+            await self.smtp.send_message(self.montar_mensagem(db_email))
+
+
+async def processar_lote(db: Session, remetente: RemetenteSMTP) -> int:
+    """ Envia um lote de e-mails pendentes. Retorna quantos foram processados """
+    lote = buscar_lote(db)
+    if not lote:
+        db.rollback()  # Libera o snapshot/locks da consulta
+        return 0
+
+    for db_email in lote:
+        db_email.qt_tentativas = (db_email.qt_tentativas or 0) + 1
+        try:
+            await remetente.enviar(db_email)
+            db_email.st_envio = "enviado"
+            db_email.dt_envio = datetime.utcnow()
+            db_email.ds_ultimo_erro = None
+        except Exception as e:
+            db_email.ds_ultimo_erro = str(e)[:2000]
+            if db_email.qt_tentativas >= MAX_TENTATIVAS:
+                db_email.st_envio = "erro"
+                logger.error("E-mail %s descartado após %s tentativas: %s",
+                             db_email.id_email, db_email.qt_tentativas, e)
+            else:
+                db_email.dt_proxima_tentativa = datetime.utcnow() + calcular_backoff(db_email.qt_tentativas)
+                logger.warning("Falha ao enviar e-mail %s (tentativa %s): %s",
+                               db_email.id_email, db_email.qt_tentativas, e)
+            # Conexão em estado desconhecido: a próxima tentativa reconecta
+            await remetente.fechar()
+
+    db.commit()
+    return len(lote)
+
+
+async def executar(continuo: bool = True):
+    """ Laço principal do processo de envio """
+    remetente = RemetenteSMTP()
+    db: Session = SessionLocal()
+    proxima_metrica = proxima_limpeza = 0.0
+    try:
+        while True:
+            processados = await processar_lote(db, remetente)
+
+            agora = time.monotonic()
+            if agora >= proxima_limpeza:
+                apagados = limpar_fila_antiga(db)
+                if apagados:
+                    logger.info("Fila de e-mails: %s registros com mais de %s dias removidos", apagados, DIAS_RETENCAO)
+                proxima_limpeza = agora + INTERVALO_LIMPEZA_SEGUNDOS
+            if agora >= proxima_metrica:
+                logger.info("Fila de e-mails: %s", profundidade_fila(db))
+                db.rollback()
+                proxima_metrica = agora + INTERVALO_METRICAS_SEGUNDOS
+
+            if processados:
+                continue  # Ainda pode haver mais e-mails prontos
+            if not continuo:
+                break
+            # Sem trabalho: libera a conexão SMTP enquanto espera
+            await remetente.fechar()
+            await asyncio.sleep(INTERVALO_SEGUNDOS)
+    finally:
+        await remetente.fechar()
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    asyncio.run(executar(continuo=settings.EMAIL_WORKER_ONCE is None))
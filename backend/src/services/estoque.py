@@ -0,0 +1,177 @@
+# /backend/src/services/estoque.py
+"""
+Reserva e devolução de estoque (TB_VARIACOES_PRODUTOS.QT_ESTOQUE).
+
+Todas as variações de um pedido são baixadas em um único UPDATE
+condicional ("QT_ESTOQUE >= quantidade"), sem ler o saldo antes. As
+linhas são travadas em ordem de ID (FOR UPDATE no PostgreSQL), então
+pedidos simultâneos da mesma variação esperam um pelo outro em vez de
+vender o mesmo saldo ou entrar em deadlock.
+
+Variações com QT_ESTOQUE nulo não têm controle de estoque.
+
+Os pedidos que tiveram estoque baixado ficam registrados em
+TB_RESERVAS_ESTOQUE_PEDIDO ('registrar_reservas'); o cancelamento só
+devolve o estoque desses ('devolver_estoque_pedido'), uma única vez.
+Pedidos criados antes da reserva de estoque não devolvem nada.
+
+O estoque aparece no catálogo do vendedor, então a baixa/devolução das
+variações com estoque controlado também invalida o catálogo das empresas.
+Essa marcação ('marcar_catalogo_alterado_variacoes') roda só depois do
+commit do pedido, numa transação própria: assim os pedidos não esperam uns
+pelos outros na linha de TB_VERSOES_CATALOGO da empresa. Um pedido
+desfeito (rollback) não marca nada.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Iterable
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.services.alteracoes_catalogo import marcar_catalogo_alterado_variacoes
+
+logger = logging.getLogger("estoque")
+
+# Chave em Session.info com as variações a marcar no catálogo após o commit
+VARIACOES_ALTERADAS = "estoque_variacoes_alteradas"
+
+
+def quantidades_por_variacao(itens: Iterable) -> Dict[int, int]:
+    """ Soma as quantidades dos itens por variação (itens sem variação não controlam estoque) """
+    quantidades: Dict[int, int] = {}
+    for item in itens:
+        if item.id_variacao:
+            quantidades[item.id_variacao] = quantidades.get(item.id_variacao, 0) + item.qt_quantidade
+    return quantidades
+
+
+def _travar_variacoes(ids_variacao):
+    """ Subconsulta que trava as variações em ordem de ID (evita deadlock entre pedidos) """
+    return (
+        select(models.VariacaoProduto.id_variacao)
+        .where(models.VariacaoProduto.id_variacao.in_(ids_variacao))
+        .order_by(models.VariacaoProduto.id_variacao)
+        .with_for_update()
+    )
+
+
+def _marcar_apos_commit(db: Session, linhas):
+    """ Agenda a marcação do catálogo das variações cujo estoque mudou (QT_ESTOQUE não nulo) """
+    ids_variacao = {id_variacao for id_variacao, qt_estoque in linhas if qt_estoque is not None}
+    if ids_variacao:
+        db.info.setdefault(VARIACOES_ALTERADAS, set()).update(ids_variacao)
+
+
+@event.listens_for(Session, "after_commit")
+def _marcar_catalogo_alterado(db: Session):
+    ids_variacao = db.info.pop(VARIACOES_ALTERADAS, None)
+    if not ids_variacao:
+        return
+    # A sessão do pedido não executa SQL dentro deste evento: usa uma própria
+    sessao = Session(bind=db.get_bind())
+    try:
+        marcar_catalogo_alterado_variacoes(sessao, sorted(ids_variacao))
+        sessao.commit()
+    except Exception:
+        # O estoque já foi gravado; o catálogo em cache fica desatualizado
+        # até a próxima alteração desses produtos
+        sessao.rollback()
+        logger.exception("Falha ao marcar o catálogo das variações %s", sorted(ids_variacao))
+    finally:
+        sessao.close()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_marcacao(db: Session):
+    db.info.pop(VARIACOES_ALTERADAS, None)
+
+
+def devolver_estoque(db: Session, quantidades: Dict[int, int]):
+    """ Devolve ao estoque as quantidades (ex: pedido cancelado), em um único UPDATE """
+    if not quantidades:
+        return
+
+    quantidade = case(quantidades, value=models.VariacaoProduto.id_variacao)
+    devolvidas = db.execute(
+        update(models.VariacaoProduto)
+        .where(models.VariacaoProduto.id_variacao.in_(_travar_variacoes(list(quantidades))))
+        .values(qt_estoque=models.VariacaoProduto.qt_estoque + quantidade)
+        .returning(models.VariacaoProduto.id_variacao, models.VariacaoProduto.qt_estoque)
+        .execution_options(synchronize_session=False)
+    ).all()
+    _marcar_apos_commit(db, devolvidas)
+
+
+def reservar_estoque(db: Session, quantidades: Dict[int, int]):
+    """
+    Baixa o estoque de todas as variações do pedido (na transação corrente).
+    Se alguma variação não tiver saldo, nada fica reservado e levanta 409.
+    """
+    if not quantidades:
+        return
+
+    quantidade = case(quantidades, value=models.VariacaoProduto.id_variacao)
+    reservadas = db.execute(
+        update(models.VariacaoProduto)
+        .where(
+            models.VariacaoProduto.id_variacao.in_(_travar_variacoes(list(quantidades))),
+            or_(
+                models.VariacaoProduto.qt_estoque.is_(None),
+                models.VariacaoProduto.qt_estoque >= quantidade
+            )
+        )
+        .values(qt_estoque=models.VariacaoProduto.qt_estoque - quantidade)
+        .returning(models.VariacaoProduto.id_variacao, models.VariacaoProduto.qt_estoque)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    if len(reservadas) == len(quantidades):
+        _marcar_apos_commit(db, reservadas)
+        return
+
+    # Desfaz a baixa das variações que tinham saldo (as linhas já estão travadas)
+    reservadas = [id_variacao for id_variacao, _ in reservadas]
+    devolver_estoque(db, {id_variacao: quantidades[id_variacao] for id_variacao in reservadas})
+
+    faltantes = db.query(
+        models.VariacaoProduto.cd_sku,
+        models.VariacaoProduto.id_variacao,
+        models.VariacaoProduto.qt_estoque
+    ).filter(
+        models.VariacaoProduto.id_variacao.in_(set(quantidades) - set(reservadas))
+    ).order_by(models.VariacaoProduto.id_variacao).all()
+
+    descricao = ", ".join(
+        f"{cd_sku or f'variação {id_variacao}'} (disponível: {qt_estoque})"
+        for cd_sku, id_variacao, qt_estoque in faltantes
+    )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Estoque insuficiente: {descricao}."
+    )
+
+
+def registrar_reservas(db: Session, pedidos: Iterable[models.Pedido]):
+    """ Marca os pedidos (já com ID, após flush) como tendo estoque reservado """
+    agora = datetime.utcnow()
+    linhas = [{"ID_PEDIDO": pedido.id_pedido, "DT_RESERVA": agora} for pedido in pedidos]
+    if linhas:
+        db.execute(insert(models.ReservaEstoquePedido.__table__), linhas)
+
+
+def devolver_estoque_pedido(db: Session, pedido: models.Pedido):
+    """
+    Devolve o estoque de um pedido cancelado, se ele tiver sido reservado.
+    Apagar o registro da reserva garante uma única devolução: um
+    cancelamento simultâneo espera este e não encontra mais o registro.
+    """
+    removidas = db.execute(
+        delete(models.ReservaEstoquePedido)
+        .where(models.ReservaEstoquePedido.id_pedido == pedido.id_pedido)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if removidas:
+        devolver_estoque(db, quantidades_por_variacao(pedido.itens))
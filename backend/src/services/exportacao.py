@@ -0,0 +1,120 @@
+# /backend/src/services/exportacao.py
+"""
+Exportação de relatórios e listagens em CSV/XLSX, em fluxo (streaming).
+
+As linhas são lidas em lotes (yield_per: cursor do lado do servidor no
+PostgreSQL) e escritas conforme chegam, então a memória usada não depende
+da quantidade de linhas exportadas:
+- CSV: gerado linha a linha e enviado a cada lote.
+- XLSX: openpyxl em modo write-only (as linhas vão para um arquivo
+  temporário); o arquivo pronto é enviado em blocos.
+
+A consulta roda em uma sessão própria, aberta e fechada pelo gerador:
+a resposta continua sendo enviada depois que a rota (e o get_db) terminou.
+"""
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, List
+
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy.orm import Query, Session
+
+from src.database import SessionLocal
+
+TAMANHO_LOTE = 1000
+TAMANHO_BLOCO_ARQUIVO = 64 * 1024
+
+# Aceito em Query(..., pattern=PADRAO_FORMATO)
+PADRAO_FORMATO = "^(csv|xlsx)$"
+TIPOS_CONTEUDO = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def linhas_consulta(montar_consulta: Callable[[Session], Query]) -> Iterator[tuple]:
+    """ Percorre a consulta em lotes, em uma sessão própria """
+    db = SessionLocal()
+    try:
+        for linha in montar_consulta(db).yield_per(TAMANHO_LOTE):
+            yield tuple(linha)
+    finally:
+        db.close()
+
+
+def _valor_csv(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    return valor
+
+
+def gerar_csv(cabecalho: List[str], linhas: Iterable[tuple]) -> Iterator[bytes]:
+    """ CSV separado por ';' com BOM (abre com acentos no Excel em português) """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=";")
+    buffer.write("\ufeff")
+    escritor.writerow(cabecalho)
+
+    for indice, linha in enumerate(linhas, start=1):
+        escritor.writerow([_valor_csv(valor) for valor in linha])
+        if indice % TAMANHO_LOTE == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _valor_xlsx(valor):
+    # Decimal vira número na planilha; datas sem fuso (o Excel não aceita tzinfo)
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, datetime) and valor.tzinfo:
+        return valor.replace(tzinfo=None)
+    return valor
+
+
+def gerar_xlsx(cabecalho: List[str], linhas: Iterable[tuple], titulo: str = "Dados") -> Iterator[bytes]:
+    """ Planilha em modo write-only; o arquivo é montado em disco e enviado em blocos """
+    planilha = Workbook(write_only=True)
+    aba = planilha.create_sheet(title=titulo[:31])  # Limite de 31 caracteres do Excel
+    aba.append(cabecalho)
+    for linha in linhas:
+        aba.append([_valor_xlsx(valor) for valor in linha])
+
+    with tempfile.TemporaryFile() as arquivo:
+        planilha.save(arquivo)
+        arquivo.seek(0)
+        while bloco := arquivo.read(TAMANHO_BLOCO_ARQUIVO):
+            yield bloco
+
+
+def resposta_exportacao(
+    formato: str,
+    nome_arquivo: str,
+    cabecalho: List[str],
+    montar_consulta: Callable[[Session], Query]
+) -> StreamingResponse:
+    """
+    Monta a StreamingResponse do arquivo.
+    'montar_consulta' recebe a sessão da exportação e devolve a consulta
+    (já filtrada pela organização) com as colunas na ordem do cabeçalho.
+    """
+    linhas = linhas_consulta(montar_consulta)
+    if formato == "xlsx":
+        conteudo = gerar_xlsx(cabecalho, linhas, titulo=nome_arquivo)
+    else:
+        conteudo = gerar_csv(cabecalho, linhas)
+
+    nome = f"{nome_arquivo}_{date.today().isoformat()}.{formato}"
+    return StreamingResponse(
+        conteudo,
+        media_type=TIPOS_CONTEUDO[formato],
+        headers={"Content-Disposition": f"attachment; filename={nome}"}
+    )
@@ -0,0 +1,80 @@
+# /backend/src/services/idempotencia.py
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.core.config import settings
+
+
+def hash_requisicao(payload: BaseModel) -> str:
+    """ Impressão digital do corpo da requisição (detecta reuso da chave com outro conteúdo) """
+    return hashlib.sha256(payload.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def resposta_repetida(chave: Optional[models.ChaveIdempotencia], ds_hash: str) -> JSONResponse:
+    """ Monta a resposta de replay a partir do registro gravado """
+    if not chave or chave.ds_resposta is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Uma requisição com esta Idempotency-Key ainda está em processamento."
+        )
+    if chave.ds_hash_requisicao != ds_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="Esta Idempotency-Key já foi usada com um conteúdo de pedido diferente."
+        )
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content=chave.ds_resposta,
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+
+def buscar_chave(db: Session, id_usuario: int, ds_chave: str) -> Optional[models.ChaveIdempotencia]:
+    """
+    Retorna a chave gravada (e ainda válida) do usuário.
+    Chaves expiradas são removidas e tratadas como inexistentes.
+    """
+    chave = db.query(models.ChaveIdempotencia).filter(
+        models.ChaveIdempotencia.id_usuario == id_usuario,
+        models.ChaveIdempotencia.ds_chave == ds_chave
+    ).first()
+
+    if chave and chave.dt_expiracao < datetime.utcnow():
+        db.delete(chave)
+        db.commit()
+        return None
+    return chave
+
+
+def reservar_chave(
+    db: Session, id_usuario: int, ds_chave: str, ds_hash: str
+) -> Optional[models.ChaveIdempotencia]:
+    """
+    Insere a chave na transação corrente, antes de qualquer trabalho.
+    Se outra requisição com a mesma chave já a inseriu, a constraint
+    UK_CHAVES_IDEMPOTENCIA falha (no Postgres, a inserção espera a outra
+    transação terminar) e retornamos None: o chamador deve então
+    devolver a resposta gravada pela requisição vencedora.
+    """
+    agora = datetime.utcnow()
+    chave = models.ChaveIdempotencia(
+        id_usuario=id_usuario,
+        ds_chave=ds_chave,
+        ds_hash_requisicao=ds_hash,
+        dt_expiracao=agora + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+        dt_criacao=agora
+    )
+    try:
+        db.add(chave)
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return chave
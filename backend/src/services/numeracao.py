@@ -0,0 +1,117 @@
+# /backend/src/services/numeracao.py
+"""
+Numeração sequencial de pedidos (NR_PEDIDO) por empresa.
+
+Cada worker do Gunicorn reserva em TB_SEQUENCIAS_PEDIDO um bloco de
+números (TAMANHO_BLOCO) e passa a distribuí-los em memória. A linha do
+contador só é tocada uma vez por bloco, em uma transação curta e separada
+da transação do pedido, então pedidos simultâneos em vários workers não
+ficam enfileirados esperando o mesmo contador.
+
+Consequências (esperadas):
+- Os números são únicos por empresa, mas NÃO são contínuos: ao reiniciar
+  (deploy, restart do worker) o restante do bloco de cada worker é
+  descartado, e pedidos que falham depois de receber número também deixam
+  lacunas.
+- Entre workers a ordem dos números não segue exatamente a ordem de
+  criação (o worker A pode estar no bloco 1-20 enquanto o B usa 21-40).
+"""
+import os
+import threading
+from typing import Dict, List
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from src.core.config import settings
+from src.database import SessionLocal
+from src.models import models
+
+TAMANHO_BLOCO = settings.ORDER_NUMBER_BLOCK_SIZE
+
+
+def formatar_numero(numero: int) -> str:
+    """ Número exibido ao cliente (ex: 000123) """
+    return f"{numero:06d}"
+
+
+class AlocadorNumeroPedido:
+    """ Distribui os números dos blocos reservados por este processo """
+
+    def __init__(self, tamanho_bloco: int = TAMANHO_BLOCO):
+        self.tamanho_bloco = tamanho_bloco
+        self.blocos: Dict[int, List[int]] = {}  # id_empresa -> [proximo, ultimo]
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+
+    def reservar_bloco(self, id_empresa: int) -> List[int]:
+        """
+        Avança o contador da empresa em 'tamanho_bloco' (UPDATE atômico) em
+        uma sessão própria, commitada imediatamente.
+        """
+        db = SessionLocal()
+        try:
+            for _ in range(2):
+                ultimo = db.execute(
+                    update(models.SequenciaPedido)
+                    .where(models.SequenciaPedido.id_empresa == id_empresa)
+                    .values(
+                        nr_ultimo_reservado=models.SequenciaPedido.nr_ultimo_reservado + self.tamanho_bloco
+                    )
+                    .returning(models.SequenciaPedido.nr_ultimo_reservado)
+                ).scalar()
+
+                if ultimo is None:
+                    # Primeiro pedido numerado da empresa: cria o contador
+                    try:
+                        db.add(models.SequenciaPedido(
+                            id_empresa=id_empresa, nr_ultimo_reservado=self.tamanho_bloco
+                        ))
+                        db.flush()
+                        ultimo = self.tamanho_bloco
+                    except IntegrityError:
+                        db.rollback()  # Outro worker criou ao mesmo tempo: tenta o UPDATE de novo
+                        continue
+
+                db.commit()
+                return [ultimo - self.tamanho_bloco + 1, ultimo]
+
+            raise RuntimeError(f"Não foi possível reservar números de pedido para a empresa {id_empresa}.")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _bloco_disponivel(self, id_empresa: int) -> List[int]:
+        """ Bloco da empresa com ao menos um número livre (chamar com 'lock') """
+        if self.pid != os.getpid():
+            # Processo filho (fork): os blocos pertencem ao processo pai
+            self.blocos.clear()
+            self.pid = os.getpid()
+
+        bloco = self.blocos.get(id_empresa)
+        if bloco is None or bloco[0] > bloco[1]:
+            bloco = self.reservar_bloco(id_empresa)
+            self.blocos[id_empresa] = bloco
+        return bloco
+
+    def garantir_bloco(self, id_empresa: int):
+        """
+        Reserva um bloco novo se o atual acabou, sem consumir número. Usado
+        antes da primeira escrita da requisição: a reserva usa uma transação
+        própria, que no SQLite esperaria o lock da transação do pedido.
+        """
+        with self.lock:
+            self._bloco_disponivel(id_empresa)
+
+    def proximo(self, id_empresa: int) -> str:
+        """ Retorna o próximo NR_PEDIDO da empresa """
+        with self.lock:
+            bloco = self._bloco_disponivel(id_empresa)
+            numero = bloco[0]
+            bloco[0] += 1
+            return formatar_numero(numero)
+
+
+alocador_numero_pedido = AlocadorNumeroPedido()
@@ -0,0 +1,113 @@
+# /backend/src/services/paginacao.py
+"""
+Paginação por cursor (keyset) das listagens de pedidos e de produtos.
+
+Em vez de OFFSET (que percorre e descarta todas as linhas anteriores), a
+próxima página começa logo depois da última linha vista, comparando
+(dt_pedido, id_pedido) — o que usa diretamente os índices compostos
+IX_PEDIDOS_*_DATA. O cursor é opaco para o cliente: basta repassar o
+valor recebido no header 'X-Next-Cursor'.
+
+DT_PEDIDO aceita NULL (pedidos legados). Esses pedidos vêm primeiro
+(NULLS FIRST, a ordem natural do índice percorrido de trás para frente no
+PostgreSQL) e o cursor deles leva a data vazia.
+
+Produtos são paginados por (ds_produto, id_produto) crescentes, na mesma
+ordem alfabética da listagem (índice IX_PRODUTOS_EMPRESA_DESCRICAO).
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import or_, tuple_
+from sqlalchemy.orm import Query
+
+from src.models import models
+
+HEADER_PROXIMO_CURSOR = "X-Next-Cursor"
+
+
+def _codificar(chave: str, id_registro: int) -> str:
+    valor = f"{chave}|{id_registro}"
+    return base64.urlsafe_b64encode(valor.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decodificar(cursor: str) -> Tuple[str, int]:
+    """ A chave pode conter '|' (ex: descrição do produto); o id é sempre o último campo """
+    try:
+        valor = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        chave, id_registro = valor.rsplit("|", 1)
+        return chave, int(id_registro)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
+
+
+def codificar_cursor(dt_pedido: Optional[datetime], id_pedido: int) -> str:
+    return _codificar(dt_pedido.isoformat() if dt_pedido else "", id_pedido)
+
+
+def decodificar_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    dt_pedido, id_pedido = _decodificar(cursor)
+    if not dt_pedido:
+        return None, id_pedido
+    try:
+        return datetime.fromisoformat(dt_pedido), id_pedido
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
+
+
+def paginar_pedidos(
+    query: Query,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None
+) -> Query:
+    """
+    Ordena por (dt_pedido, id_pedido) decrescentes, pedidos sem data
+    primeiro, e aplica a página.
+    Com 'cursor' usa keyset; sem ele, mantém o OFFSET (compatibilidade).
+    """
+    if cursor:
+        dt_pedido, id_pedido = decodificar_cursor(cursor)
+        if dt_pedido is None:
+            # Ainda entre os pedidos sem data: os restantes deles e todos os datados
+            query = query.filter(or_(
+                models.Pedido.dt_pedido.is_not(None),
+                models.Pedido.id_pedido < id_pedido
+            ))
+        else:
+            # A comparação de tupla descarta os NULL, que já foram entregues
+            query = query.filter(
+                tuple_(models.Pedido.dt_pedido, models.Pedido.id_pedido) < tuple_(dt_pedido, id_pedido)
+            )
+
+    query = query.order_by(models.Pedido.dt_pedido.desc().nulls_first(), models.Pedido.id_pedido.desc())
+    if skip and not cursor:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def definir_proximo_cursor(response: Response, pedidos: Sequence, limit: int):
+    """ Página cheia: informa no header o cursor da próxima página """
+    if pedidos and len(pedidos) == limit:
+        ultimo = pedidos[-1]
+        response.headers[HEADER_PROXIMO_CURSOR] = codificar_cursor(ultimo.dt_pedido, ultimo.id_pedido)
+
+
+def paginar_produtos(query: Query, limit: int, cursor: Optional[str] = None) -> Query:
+    """ Ordena por (ds_produto, id_produto) e aplica a página (keyset) """
+    if cursor:
+        ds_produto, id_produto = _decodificar(cursor)
+        query = query.filter(
+            tuple_(models.Produto.ds_produto, models.Produto.id_produto) > tuple_(ds_produto, id_produto)
+        )
+
+    return query.order_by(models.Produto.ds_produto, models.Produto.id_produto).limit(limit)
+
+
+def definir_proximo_cursor_produtos(response: Response, produtos: Sequence, limit: int):
+    """ Página cheia: informa no header o cursor da próxima página """
+    if produtos and len(produtos) == limit:
+        ultimo = produtos[-1]
+        response.headers[HEADER_PROXIMO_CURSOR] = _codificar(ultimo.ds_produto, ultimo.id_produto)
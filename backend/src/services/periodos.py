@@ -0,0 +1,43 @@
+# /backend/src/services/periodos.py
+"""
+Filtros de período dos dashboards, relatórios e logs.
+
+Todo período vira um intervalo semiaberto de timestamps [inicio, fim):
+"coluna >= inicio AND coluna < fim". Ao contrário de extract(year/month)
+ou de comparar com strings, essa forma usa os índices das colunas de data
+tanto no SQLite quanto no PostgreSQL, e não depende de 23:59:59.999999
+para incluir o último dia.
+"""
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import and_
+
+Intervalo = Tuple[datetime, datetime]
+
+
+def intervalo_mes(referencia: Optional[datetime] = None) -> Intervalo:
+    """ Mês da data de referência (padrão: mês atual, em UTC) """
+    inicio = (referencia or datetime.utcnow()).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    fim = (inicio + timedelta(days=32)).replace(day=1)
+    return inicio, fim
+
+
+def intervalo_datas(start_date: date, end_date: date) -> Intervalo:
+    """ Do início de start_date até o fim de end_date (inclusive) """
+    inicio = datetime.combine(start_date, datetime.min.time())
+    fim = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    return inicio, fim
+
+
+def intervalo_periodo(start_date: Optional[date], end_date: Optional[date]) -> Intervalo:
+    """ Intervalo informado pelo usuário ou, sem as duas datas, o mês atual """
+    if not start_date or not end_date:
+        return intervalo_mes()
+    return intervalo_datas(start_date, end_date)
+
+
+def filtro_periodo(coluna, intervalo: Intervalo):
+    """ Condição 'coluna >= inicio AND coluna < fim' """
+    inicio, fim = intervalo
+    return and_(coluna >= inicio, coluna < fim)
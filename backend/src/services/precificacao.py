@@ -0,0 +1,148 @@
+# /backend/src/services/precificacao.py
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Set, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.schemas import ItemPedidoCreate
+
+CENTAVOS = Decimal("0.01")
+
+
+def arredondar(valor) -> Decimal:
+    """ Centavos, meio para cima: a mesma regra para pedidos e rascunhos """
+    return Decimal(valor).quantize(CENTAVOS, rounding=ROUND_HALF_UP)
+
+
+def total_item(vl_unitario, qt_quantidade: int, pc_desconto_item) -> Decimal:
+    """ Total da linha a partir do preço já resolvido (sem consultar o banco) """
+    pc_desconto_item = Decimal(str(pc_desconto_item or 0))  # O default do schema é float
+    return arredondar(Decimal(vl_unitario) * qt_quantidade * (1 - (pc_desconto_item / 100)))
+
+
+def total_pedido(vl_subtotal, pc_desconto) -> Decimal:
+    """ Aplica o desconto do cabeçalho sobre a soma das linhas """
+    return arredondar(Decimal(vl_subtotal) * (1 - (Decimal(str(pc_desconto or 0)) / 100)))
+
+
+class TabelaPrecos:
+    """
+    Preços de catálogo e variações resolvidos em lote para um conjunto de itens.
+
+    Em vez de consultar o banco linha a linha (contagem de variações, item do
+    catálogo e variação para cada item), carrega tudo em duas consultas
+    indexadas pelos IDs de produto/variação do pedido.
+    """
+
+    def __init__(self):
+        # (id_catalogo, id_produto) -> vl_preco_catalogo (apenas itens ativos)
+        self.precos: Dict[Tuple[int, int], Decimal] = {}
+        # Produtos que possuem ao menos uma variação ativa (grade)
+        self.produtos_com_grade: Set[int] = set()
+        # id_variacao -> (id_produto, vl_ajuste_preco)
+        self.variacoes: Dict[int, Tuple[int, Decimal]] = {}
+
+    @classmethod
+    def carregar(
+        cls,
+        db: Session,
+        ids_catalogo: Iterable[int],
+        itens: Iterable[ItemPedidoCreate],
+    ) -> "TabelaPrecos":
+        """ Carrega preços e variações de todos os itens em duas consultas """
+        tabela = cls()
+        itens = list(itens)
+        ids_catalogo = set(ids_catalogo)
+        ids_produto = {item.id_produto for item in itens}
+        ids_variacao = {item.id_variacao for item in itens if item.id_variacao}
+
+        if not ids_catalogo or not ids_produto:
+            return tabela
+
+        # 1. Preços de catálogo
+        linhas_preco = db.query(
+            models.ItemCatalogo.id_catalogo,
+            models.ItemCatalogo.id_produto,
+            models.ItemCatalogo.vl_preco_catalogo
+        ).filter(
+            models.ItemCatalogo.id_catalogo.in_(ids_catalogo),
+            models.ItemCatalogo.id_produto.in_(ids_produto),
+            models.ItemCatalogo.fl_ativo_no_catalogo == True
+        ).all()
+
+        for id_catalogo, id_produto, vl_preco in linhas_preco:
+            tabela.precos[(id_catalogo, id_produto)] = vl_preco
+
+        # 2. Variações (as ativas dos produtos + as informadas nos itens)
+        linhas_variacao = db.query(
+            models.VariacaoProduto.id_variacao,
+            models.VariacaoProduto.id_produto,
+            models.VariacaoProduto.vl_ajuste_preco,
+            models.VariacaoProduto.fl_ativa
+        ).filter(
+            models.VariacaoProduto.id_produto.in_(ids_produto)
+        ).all()
+
+        for id_variacao, id_produto, vl_ajuste, fl_ativa in linhas_variacao:
+            if fl_ativa:
+                tabela.produtos_com_grade.add(id_produto)
+            if id_variacao in ids_variacao:
+                tabela.variacoes[id_variacao] = (id_produto, vl_ajuste or Decimal(0))
+
+        return tabela
+
+    def precificar_item(self, id_catalogo: int, item_in: ItemPedidoCreate) -> models.ItemPedido:
+        """
+        Aplica as regras de grade e preço a um item e devolve o ItemPedido.
+        Levanta HTTPException com a mesma semântica da criação de pedido.
+        """
+        tem_grade = item_in.id_produto in self.produtos_com_grade
+
+        # Regra: Se tem variação, id_variacao é obrigatório
+        if tem_grade and not item_in.id_variacao:
+            raise HTTPException(
+                status_code=422,
+                detail=f"O produto {item_in.id_produto} possui grade (tamanho/cor). É necessário especificar a variação."
+            )
+
+        # Regra: Se NÃO tem variação, id_variacao deve ser nulo (ou ignorado)
+        if not tem_grade and item_in.id_variacao:
+            item_in.id_variacao = None
+
+        preco_base = self.precos.get((id_catalogo, item_in.id_produto))
+        if preco_base is None:
+            raise HTTPException(status_code=404, detail=f"Produto ID {item_in.id_produto} não encontrado ou inativo no catálogo.")
+
+        if item_in.id_variacao:
+            variacao = self.variacoes.get(item_in.id_variacao)
+            if not variacao or variacao[0] != item_in.id_produto:
+                raise HTTPException(status_code=404, detail="Variação inválida.")
+            preco_base += variacao[1]
+
+        vl_unitario_seguro = preco_base
+        pc_desconto_item = Decimal(str(item_in.pc_desconto_item or 0))  # O default do schema é float
+        vl_total_item = total_item(vl_unitario_seguro, item_in.qt_quantidade, pc_desconto_item)
+
+        return models.ItemPedido(
+            id_produto=item_in.id_produto,
+            id_variacao=item_in.id_variacao,
+            qt_quantidade=item_in.qt_quantidade,
+            vl_unitario=vl_unitario_seguro,
+            pc_desconto_item=pc_desconto_item,
+            vl_total_item=vl_total_item
+        )
+
+    def precificar_itens(
+        self, id_catalogo: int, itens: Iterable[ItemPedidoCreate]
+    ) -> Tuple[List[models.ItemPedido], Decimal]:
+        """ Precifica todos os itens e retorna (itens, subtotal das linhas já arredondadas) """
+        vl_total_calculado = Decimal(0.00)
+        db_itens_pedido = []
+
+        for item_in in itens:
+            db_item = self.precificar_item(id_catalogo, item_in)
+            vl_total_calculado += db_item.vl_total_item
+            db_itens_pedido.append(db_item)
+
+        return db_itens_pedido, vl_total_calculado
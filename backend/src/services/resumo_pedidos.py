@@ -0,0 +1,40 @@
+# /backend/src/services/resumo_pedidos.py
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, Session
+
+from src.models import models
+
+
+def consultar_resumo_pedidos(db: Session) -> Query:
+    """
+    Consulta só de colunas para as listagens resumidas de pedidos: nomes vêm
+    de JOINs e a quantidade de itens de uma subconsulta (sem carregar os
+    objetos Pedido/ItemPedido nem disparar lazy loads por linha).
+    """
+    qt_itens = (
+        select(func.count(models.ItemPedido.id_item_pedido))
+        .where(models.ItemPedido.id_pedido == models.Pedido.id_pedido)
+        .correlate(models.Pedido)
+        .scalar_subquery()
+    )
+
+    return db.query(
+        models.Pedido.id_pedido,
+        models.Pedido.nr_pedido,
+        models.Pedido.st_pedido,
+        models.Pedido.vl_total,
+        models.Pedido.dt_pedido,
+        models.Pedido.id_cliente,
+        func.coalesce(models.Cliente.no_fantasia, models.Cliente.no_razao_social).label("no_cliente"),
+        models.Pedido.id_usuario,
+        models.Usuario.no_completo.label("no_vendedor"),
+        models.Pedido.id_empresa,
+        models.Empresa.no_empresa,
+        qt_itens.label("qt_itens"),
+    ).join(
+        models.Cliente, models.Pedido.id_cliente == models.Cliente.id_cliente
+    ).join(
+        models.Usuario, models.Pedido.id_usuario == models.Usuario.id_usuario
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    )
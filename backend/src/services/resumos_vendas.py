@@ -0,0 +1,522 @@
+# /backend/src/services/resumos_vendas.py
+"""
+Resumos mensais de vendas (rollups) usados pelos dashboards e relatórios.
+
+As antigas Views VW_VENDAS_* agregavam TB_PEDIDOS inteira a cada consulta.
+Agora os totais ficam gravados por (organização, vendedor/empresa/cidade,
+mês) ('registrar_vendas'), além dos itens por (empresa, produto, variação,
+mês) ('registrar_vendas_produtos') e dos sketches de clientes por
+(empresa, vendedor, mês) ('registrar_sketches'), e são ajustados na mesma
+transação do pedido:
+- pedido gravado (ou rascunho enviado): soma (+1)
+- pedido cancelado: subtrai (-1)
+
+Cada ajuste é um UPSERT aditivo ("QT_PEDIDOS = QT_PEDIDOS + x"), então
+pedidos simultâneos do mesmo mês não sobrescrevem o total um do outro.
+Os sketches de clientes (HyperLogLog) não são aditivos: a linha é travada
+(SELECT ... FOR UPDATE) e mesclada; no cancelamento ela é recalculada, já
+que não é possível remover um cliente de um sketch.
+
+Para reconstruir os resumos a partir dos pedidos (backfill/correção):
+    python -m src.services.resumos_vendas rebuild [id_organizacao]
+"""
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.services.cache_relatorios import marcar_dados_alterados
+from src.services.periodos import filtro_periodo, intervalo_mes
+from src.services.sketches_clientes import QT_REGISTROS, adicionar, de_bytes, novo_sketch
+
+# Status que não entram nos resumos (mesmo critério das antigas Views)
+STATUS_FORA_RESUMO = ('cancelado', 'rascunho')
+
+# Colunas somadas pelo UPSERT nos resumos
+TOTAIS = ("QT_PEDIDOS", "VL_TOTAL_VENDAS")
+
+
+def mes_referencia(data: Optional[datetime]) -> datetime:
+    """ Primeiro instante do mês do pedido (chave DT_MES_REFERENCIA) """
+    return (data or datetime.utcnow()).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _insert(db: Session, modelo):
+    """ INSERT com suporte a ON CONFLICT do dialeto em uso """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(modelo)
+    return sqlite.insert(modelo)
+
+
+def _somar(db: Session, modelo, chaves: Tuple[str, ...], somar: Tuple[str, ...],
+           linhas: Iterable[dict], returning=None):
+    """
+    UPSERT aditivo: cria a linha ou soma as colunas 'somar' às existentes.
+    'chaves' são as colunas da chave primária do resumo.
+    """
+    linhas = list(linhas)
+    if not linhas:
+        return []
+
+    tabela = modelo.__table__
+    stmt = _insert(db, modelo).values(linhas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[tabela.c[chave] for chave in chaves],
+        set_={tabela.c[coluna]: tabela.c[coluna] + stmt.excluded[coluna] for coluna in somar},
+    )
+    if returning is not None:
+        return db.execute(stmt.returning(*returning)).all()
+    db.execute(stmt)
+    return []
+
+
+def _remover_vazias(db: Session, modelo, chaves: Tuple[str, ...], valores: Iterable[tuple], coluna=None):
+    """
+    Apaga, entre as linhas recém-ajustadas ('valores' da chave primária
+    'chaves'), as que ficaram sem pedidos (ex: único pedido do mês cancelado)
+    """
+    valores = list(valores)
+    if not valores:
+        return
+
+    tabela = modelo.__table__
+    coluna = tabela.c.QT_PEDIDOS if coluna is None else tabela.c[coluna]
+    db.execute(tabela.delete().where(
+        tuple_(*(tabela.c[chave] for chave in chaves)).in_(valores),
+        coluna <= 0
+    ))
+
+
+def _organizacoes_empresas(db: Session, pedidos: Iterable[models.Pedido]) -> Dict[int, int]:
+    """ id_empresa -> id_organizacao das empresas dos pedidos """
+    return dict(db.query(models.Empresa.id_empresa, models.Empresa.id_organizacao).filter(
+        models.Empresa.id_empresa.in_({p.id_empresa for p in pedidos})
+    ).all())
+
+
+def registrar_vendas(db: Session, pedidos: Iterable[models.Pedido], sinal: int = 1):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) os pedidos dos resumos mensais por
+    vendedor, empresa, cliente e cidade, na transação corrente. Os pedidos
+    precisam estar com ID (após flush). Itens, sketches e contadores têm os
+    próprios 'registrar_*', chamados ao lado deste pelas rotas de pedido.
+    """
+    pedidos = list(pedidos)
+    if not pedidos:
+        return
+
+    usuarios = dict(db.query(models.Usuario.id_usuario, models.Usuario.id_organizacao).filter(
+        models.Usuario.id_usuario.in_({p.id_usuario for p in pedidos}),
+        models.Usuario.tp_usuario == 'vendedor'
+    ).all())
+    empresas = _organizacoes_empresas(db, pedidos)
+    enderecos = {
+        id_endereco: (no_cidade, sg_estado, id_organizacao)
+        for id_endereco, no_cidade, sg_estado, id_organizacao in db.query(
+            models.Endereco.id_endereco,
+            models.Endereco.no_cidade,
+            models.Endereco.sg_estado,
+            models.Cliente.id_organizacao
+        ).join(
+            models.Cliente, models.Endereco.id_cliente == models.Cliente.id_cliente
+        ).filter(
+            models.Endereco.id_endereco.in_({p.id_endereco_entrega for p in pedidos if p.id_endereco_entrega})
+        )
+    }
+
+    por_vendedor: Dict[tuple, list] = {}
+    por_empresa: Dict[tuple, list] = {}
+    por_cliente: Dict[tuple, int] = {}
+    por_cidade: Dict[tuple, list] = {}
+
+    def acumular(grupo, chave, vl_total):
+        total = grupo.setdefault(chave, [0, Decimal(0)])
+        total[0] += sinal
+        total[1] += sinal * Decimal(vl_total or 0)
+
+    for pedido in pedidos:
+        mes = mes_referencia(pedido.dt_pedido)
+
+        if pedido.id_usuario in usuarios:
+            acumular(por_vendedor, (pedido.id_usuario, mes, usuarios[pedido.id_usuario]), pedido.vl_total)
+
+        acumular(por_empresa, (pedido.id_empresa, mes, empresas[pedido.id_empresa]), pedido.vl_total)
+        chave_cliente = (pedido.id_empresa, mes, pedido.id_cliente)
+        por_cliente[chave_cliente] = por_cliente.get(chave_cliente, 0) + sinal
+
+        endereco = enderecos.get(pedido.id_endereco_entrega)
+        if endereco:
+            no_cidade, sg_estado, id_organizacao = endereco
+            acumular(por_cidade, (id_organizacao, no_cidade, sg_estado, mes), pedido.vl_total)
+
+    chaves_vendedor = ("ID_USUARIO", "DT_MES_REFERENCIA")
+    _somar(db, models.VwVendasVendedorMes, chaves_vendedor, TOTAIS, (
+        {"ID_USUARIO": id_usuario, "DT_MES_REFERENCIA": mes, "ID_ORGANIZACAO": id_org,
+         "QT_PEDIDOS": qt, "VL_TOTAL_VENDAS": vl}
+        for (id_usuario, mes, id_org), (qt, vl) in por_vendedor.items()
+    ))
+
+    # Clientes distintos: um cliente entra no mês quando sua contagem sai de 0
+    # e sai quando volta a 0 (a contagem de cada cliente é devolvida pelo UPSERT)
+    chaves_cliente = ("ID_EMPRESA", "DT_MES_REFERENCIA", "ID_CLIENTE")
+    clientes = _somar(db, models.ResumoVendasClienteMes, chaves_cliente, ("QT_PEDIDOS",), (
+        {"ID_EMPRESA": id_empresa, "DT_MES_REFERENCIA": mes, "ID_CLIENTE": id_cliente, "QT_PEDIDOS": qt}
+        for (id_empresa, mes, id_cliente), qt in por_cliente.items()
+    ), returning=(
+        models.ResumoVendasClienteMes.id_empresa,
+        models.ResumoVendasClienteMes.dt_mes_referencia,
+        models.ResumoVendasClienteMes.id_cliente,
+        models.ResumoVendasClienteMes.qt_pedidos,
+    ))
+    variacao_clientes: Dict[tuple, int] = {}
+    for id_empresa, mes, id_cliente, qt_atual in clientes:
+        mes = mes_referencia(mes)
+        qt_anterior = qt_atual - por_cliente[(id_empresa, mes, id_cliente)]
+        if qt_anterior <= 0 < qt_atual:
+            variacao_clientes[(id_empresa, mes)] = variacao_clientes.get((id_empresa, mes), 0) + 1
+        elif qt_atual <= 0 < qt_anterior:
+            variacao_clientes[(id_empresa, mes)] = variacao_clientes.get((id_empresa, mes), 0) - 1
+
+    totais_empresa = TOTAIS + ("QT_CLIENTES_ATENDIDOS",)
+    chaves_empresa = ("ID_EMPRESA", "DT_MES_REFERENCIA")
+    _somar(db, models.VwVendasEmpresaMes, chaves_empresa, totais_empresa, (
+        {"ID_EMPRESA": id_empresa, "DT_MES_REFERENCIA": mes, "ID_ORGANIZACAO": id_org,
+         "QT_PEDIDOS": qt, "VL_TOTAL_VENDAS": vl,
+         "QT_CLIENTES_ATENDIDOS": variacao_clientes.get((id_empresa, mes), 0)}
+        for (id_empresa, mes, id_org), (qt, vl) in por_empresa.items()
+    ))
+
+    chaves_cidade = ("ID_ORGANIZACAO", "NO_CIDADE", "SG_ESTADO", "DT_MES_REFERENCIA")
+    _somar(db, models.VwVendasPorCidade, chaves_cidade, TOTAIS, (
+        {"ID_ORGANIZACAO": id_org, "NO_CIDADE": no_cidade, "SG_ESTADO": sg_estado,
+         "DT_MES_REFERENCIA": mes, "QT_PEDIDOS": qt, "VL_TOTAL_VENDAS": vl}
+        for (id_org, no_cidade, sg_estado, mes), (qt, vl) in por_cidade.items()
+    ))
+
+    if sinal < 0:
+        # Só as linhas ajustadas acima podem ter zerado
+        _remover_vazias(db, models.VwVendasVendedorMes, chaves_vendedor, (chave[:2] for chave in por_vendedor))
+        _remover_vazias(db, models.VwVendasEmpresaMes, chaves_empresa, (chave[:2] for chave in por_empresa))
+        _remover_vazias(db, models.ResumoVendasClienteMes, chaves_cliente, por_cliente)
+        _remover_vazias(db, models.VwVendasPorCidade, chaves_cidade, por_cidade)
+
+
+def registrar_vendas_produtos(db: Session, pedidos: Iterable[models.Pedido], sinal: int = 1):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) os itens dos pedidos do resumo por
+    produto/variação e mês, na transação corrente. Os itens precisam estar
+    gravados (após flush).
+    """
+    pedidos_por_id = {pedido.id_pedido: pedido for pedido in pedidos}
+    if not pedidos_por_id:
+        return
+
+    empresas = _organizacoes_empresas(db, pedidos_por_id.values())
+    por_produto: Dict[tuple, list] = {}
+    for id_pedido, id_produto, id_variacao, qt_quantidade, vl_total_item in db.query(
+        models.ItemPedido.id_pedido,
+        models.ItemPedido.id_produto,
+        models.ItemPedido.id_variacao,
+        models.ItemPedido.qt_quantidade,
+        models.ItemPedido.vl_total_item
+    ).filter(models.ItemPedido.id_pedido.in_(pedidos_por_id)):
+        pedido = pedidos_por_id[id_pedido]
+        chave = (pedido.id_empresa, mes_referencia(pedido.dt_pedido), id_produto, id_variacao or 0,
+                 empresas[pedido.id_empresa])
+        total = por_produto.setdefault(chave, [0, Decimal(0)])
+        total[0] += sinal * qt_quantidade
+        total[1] += sinal * Decimal(vl_total_item or 0)
+
+    chaves_produto = ("ID_EMPRESA", "DT_MES_REFERENCIA", "ID_PRODUTO", "ID_VARIACAO")
+    _somar(db, models.ResumoVendasProdutoMes, chaves_produto, ("QT_VENDIDA", "VL_TOTAL_VENDAS"), (
+        {"ID_EMPRESA": id_empresa, "DT_MES_REFERENCIA": mes, "ID_PRODUTO": id_produto,
+         "ID_VARIACAO": id_variacao, "ID_ORGANIZACAO": id_org, "QT_VENDIDA": qt, "VL_TOTAL_VENDAS": vl}
+        for (id_empresa, mes, id_produto, id_variacao, id_org), (qt, vl) in por_produto.items()
+    ))
+
+    if sinal < 0:
+        _remover_vazias(db, models.ResumoVendasProdutoMes, chaves_produto,
+                        (chave[:4] for chave in por_produto), "QT_VENDIDA")
+
+
+def registrar_sketches(db: Session, pedidos: Iterable[models.Pedido], sinal: int = 1):
+    """
+    Inclui (sinal=1) os clientes dos pedidos nos sketches de empresa x
+    vendedor x mês, ou recalcula (sinal=-1) os sketches afetados por
+    cancelamentos, na transação corrente.
+    """
+    pedidos = list(pedidos)
+    if not pedidos:
+        return
+
+    empresas = _organizacoes_empresas(db, pedidos)
+    por_sketch: Dict[tuple, set] = {}
+    for pedido in pedidos:
+        chave = (pedido.id_empresa, pedido.id_usuario, mes_referencia(pedido.dt_pedido),
+                 empresas[pedido.id_empresa])
+        por_sketch.setdefault(chave, set()).add(pedido.id_cliente)
+
+    if sinal > 0:
+        _incluir_nos_sketches(db, por_sketch)
+    else:
+        _recalcular_sketches(db, por_sketch, [pedido.id_pedido for pedido in pedidos])
+
+
+def _travar_sketches(db: Session, chaves: Iterable[tuple]):
+    """ SELECT ... FOR UPDATE dos sketches (sempre na ordem da chave, evitando deadlock) """
+    tabela = models.SketchClientesMes.__table__
+    colunas = (tabela.c.ID_EMPRESA, tabela.c.ID_USUARIO, tabela.c.DT_MES_REFERENCIA)
+    return db.execute(
+        select(*colunas, tabela.c.BL_REGISTROS)
+        .where(tuple_(*colunas).in_(list(chaves)))
+        .order_by(*colunas)
+        .with_for_update()
+    ).all()
+
+
+def _gravar_sketch(db: Session, id_empresa: int, id_usuario: int, mes: datetime, id_organizacao: int,
+                   registros: bytes):
+    """ Cria ou substitui o sketch de (empresa, vendedor, mês) """
+    tabela = models.SketchClientesMes.__table__
+    stmt = _insert(db, models.SketchClientesMes).values(
+        ID_EMPRESA=id_empresa, ID_USUARIO=id_usuario, DT_MES_REFERENCIA=mes,
+        ID_ORGANIZACAO=id_organizacao, BL_REGISTROS=registros
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[tabela.c.ID_EMPRESA, tabela.c.ID_USUARIO, tabela.c.DT_MES_REFERENCIA],
+        set_={tabela.c.BL_REGISTROS: stmt.excluded.BL_REGISTROS},
+    ))
+
+
+def _incluir_nos_sketches(db: Session, por_sketch: Dict[tuple, set]):
+    """ Mescla os clientes dos pedidos nos sketches (criando os que faltam) """
+    if not por_sketch:
+        return
+
+    tabela = models.SketchClientesMes.__table__
+    stmt = _insert(db, models.SketchClientesMes).values([
+        {"ID_EMPRESA": id_empresa, "ID_USUARIO": id_usuario, "DT_MES_REFERENCIA": mes,
+         "ID_ORGANIZACAO": id_org, "BL_REGISTROS": bytes(QT_REGISTROS)}
+        for id_empresa, id_usuario, mes, id_org in por_sketch
+    ])
+    db.execute(stmt.on_conflict_do_nothing(
+        index_elements=[tabela.c.ID_EMPRESA, tabela.c.ID_USUARIO, tabela.c.DT_MES_REFERENCIA]
+    ))
+
+    clientes = {chave[:3]: ids for chave, ids in por_sketch.items()}
+    for id_empresa, id_usuario, dt_mes, dados in _travar_sketches(db, clientes):
+        registros = de_bytes(dados)
+        adicionar(registros, clientes[(id_empresa, id_usuario, mes_referencia(dt_mes))])
+        db.execute(tabela.update().where(
+            tabela.c.ID_EMPRESA == id_empresa,
+            tabela.c.ID_USUARIO == id_usuario,
+            tabela.c.DT_MES_REFERENCIA == dt_mes
+        ).values(BL_REGISTROS=registros.tobytes()))
+
+
+def _recalcular_sketches(db: Session, por_sketch: Dict[tuple, set], ids_removidos: list):
+    """
+    Recalcula os sketches afetados por cancelamentos a partir dos pedidos
+    válidos restantes ('ids_removidos' ficam de fora, pois o novo status
+    ainda pode não ter ido para o banco). Sketch sem clientes é apagado.
+    """
+    if not por_sketch:
+        return
+
+    tabela = models.SketchClientesMes.__table__
+    # Trava antes de ler os pedidos: inclusões simultâneas terminam antes (e entram na leitura)
+    _travar_sketches(db, [chave[:3] for chave in por_sketch])
+
+    for id_empresa, id_usuario, mes, id_org in por_sketch:
+        clientes = [id_cliente for id_cliente, in db.query(models.Pedido.id_cliente).filter(
+            models.Pedido.id_empresa == id_empresa,
+            models.Pedido.id_usuario == id_usuario,
+            filtro_periodo(models.Pedido.dt_pedido, intervalo_mes(mes)),
+            models.Pedido.st_pedido.notin_(STATUS_FORA_RESUMO),
+            models.Pedido.id_pedido.notin_(ids_removidos)
+        ).distinct()]
+
+        if clientes:
+            _gravar_sketch(db, id_empresa, id_usuario, mes, id_org, novo_sketch(clientes).tobytes())
+        else:
+            db.execute(tabela.delete().where(
+                tabela.c.ID_EMPRESA == id_empresa,
+                tabela.c.ID_USUARIO == id_usuario,
+                tabela.c.DT_MES_REFERENCIA == mes
+            ))
+
+
+def _coluna_mes(db: Session):
+    """ Expressão SQL do mês do pedido, no dialeto em uso """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc('month', models.Pedido.dt_pedido)
+    return func.datetime(models.Pedido.dt_pedido, 'start of month')
+
+
+def _como_datetime(valor) -> datetime:
+    """ O SQLite devolve datetime(..., 'start of month') como texto """
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor)
+    return valor
+
+
+def reconstruir_resumos(db: Session, id_organizacao: Optional[int] = None):
+    """
+    Apaga e recalcula os resumos (de todas as organizações ou de uma)
+    com GROUP BY sobre os pedidos. Retorna a quantidade de pedidos considerados.
+    """
+    mes = _coluna_mes(db).label("mes")
+    validos = models.Pedido.st_pedido.notin_(STATUS_FORA_RESUMO)
+
+    def filtrar_org(query, coluna):
+        return query.filter(coluna == id_organizacao) if id_organizacao else query
+
+    # Limpa os resumos atuais
+    for modelo in (models.VwVendasVendedorMes, models.VwVendasEmpresaMes, models.VwVendasPorCidade,
+                   models.ResumoVendasProdutoMes, models.SketchClientesMes):
+        filtrar_org(db.query(modelo), modelo.id_organizacao).delete(synchronize_session=False)
+    clientes = db.query(models.ResumoVendasClienteMes)
+    if id_organizacao:
+        clientes = clientes.filter(models.ResumoVendasClienteMes.id_empresa.in_(
+            select(models.Empresa.id_empresa).where(models.Empresa.id_organizacao == id_organizacao)
+        ))
+    clientes.delete(synchronize_session=False)
+
+    # 1. Vendedor x mês
+    linhas = filtrar_org(db.query(
+        models.Pedido.id_usuario, mes, models.Usuario.id_organizacao,
+        func.count(models.Pedido.id_pedido), func.sum(models.Pedido.vl_total)
+    ).join(
+        models.Usuario, models.Pedido.id_usuario == models.Usuario.id_usuario
+    ).filter(validos, models.Usuario.tp_usuario == 'vendedor'), models.Usuario.id_organizacao).group_by(
+        models.Pedido.id_usuario, mes, models.Usuario.id_organizacao
+    ).all()
+    db.bulk_insert_mappings(models.VwVendasVendedorMes, [
+        {"id_usuario": id_usuario, "dt_mes_referencia": _como_datetime(dt), "id_organizacao": id_org,
+         "qt_pedidos": qt, "vl_total_vendas": vl or 0}
+        for id_usuario, dt, id_org, qt, vl in linhas
+    ])
+
+    # 2. Empresa x cliente x mês (base da contagem de clientes distintos)
+    linhas = filtrar_org(db.query(
+        models.Pedido.id_empresa, mes, models.Pedido.id_cliente, func.count(models.Pedido.id_pedido)
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(validos), models.Empresa.id_organizacao).group_by(
+        models.Pedido.id_empresa, mes, models.Pedido.id_cliente
+    ).all()
+    db.bulk_insert_mappings(models.ResumoVendasClienteMes, [
+        {"id_empresa": id_empresa, "dt_mes_referencia": _como_datetime(dt), "id_cliente": id_cliente,
+         "qt_pedidos": qt}
+        for id_empresa, dt, id_cliente, qt in linhas
+    ])
+
+    # 3. Empresa x mês
+    linhas = filtrar_org(db.query(
+        models.Pedido.id_empresa, mes, models.Empresa.id_organizacao,
+        func.count(models.Pedido.id_pedido), func.sum(models.Pedido.vl_total),
+        func.count(models.Pedido.id_cliente.distinct())
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(validos), models.Empresa.id_organizacao).group_by(
+        models.Pedido.id_empresa, mes, models.Empresa.id_organizacao
+    ).all()
+    db.bulk_insert_mappings(models.VwVendasEmpresaMes, [
+        {"id_empresa": id_empresa, "dt_mes_referencia": _como_datetime(dt), "id_organizacao": id_org,
+         "qt_pedidos": qt, "vl_total_vendas": vl or 0, "qt_clientes_atendidos": qt_clientes}
+        for id_empresa, dt, id_org, qt, vl, qt_clientes in linhas
+    ])
+    total = sum(linha[3] for linha in linhas)
+
+    # 4. Cidade (endereço de entrega) x mês
+    linhas = filtrar_org(db.query(
+        models.Cliente.id_organizacao, models.Endereco.no_cidade, models.Endereco.sg_estado, mes,
+        func.count(models.Pedido.id_pedido), func.sum(models.Pedido.vl_total)
+    ).join(
+        models.Cliente, models.Pedido.id_cliente == models.Cliente.id_cliente
+    ).join(
+        models.Endereco, models.Pedido.id_endereco_entrega == models.Endereco.id_endereco
+    ).filter(validos), models.Cliente.id_organizacao).group_by(
+        models.Cliente.id_organizacao, models.Endereco.no_cidade, models.Endereco.sg_estado, mes
+    ).all()
+    db.bulk_insert_mappings(models.VwVendasPorCidade, [
+        {"id_organizacao": id_org, "no_cidade": no_cidade, "sg_estado": sg_estado,
+         "dt_mes_referencia": _como_datetime(dt), "qt_pedidos": qt, "vl_total_vendas": vl or 0}
+        for id_org, no_cidade, sg_estado, dt, qt, vl in linhas
+    ])
+
+    # 5. Empresa x produto x variação x mês (itens)
+    linhas = filtrar_org(db.query(
+        models.Pedido.id_empresa, mes, models.ItemPedido.id_produto,
+        func.coalesce(models.ItemPedido.id_variacao, 0), models.Empresa.id_organizacao,
+        func.sum(models.ItemPedido.qt_quantidade), func.sum(models.ItemPedido.vl_total_item)
+    ).join(
+        models.ItemPedido, models.ItemPedido.id_pedido == models.Pedido.id_pedido
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(validos), models.Empresa.id_organizacao).group_by(
+        models.Pedido.id_empresa, mes, models.ItemPedido.id_produto,
+        func.coalesce(models.ItemPedido.id_variacao, 0), models.Empresa.id_organizacao
+    ).all()
+    db.bulk_insert_mappings(models.ResumoVendasProdutoMes, [
+        {"id_empresa": id_empresa, "dt_mes_referencia": _como_datetime(dt), "id_produto": id_produto,
+         "id_variacao": id_variacao, "id_organizacao": id_org, "qt_vendida": qt or 0, "vl_total_vendas": vl or 0}
+        for id_empresa, dt, id_produto, id_variacao, id_org, qt, vl in linhas
+    ])
+
+    # 6. Sketches de clientes por empresa x vendedor x mês
+    linhas = filtrar_org(db.query(
+        models.Pedido.id_empresa, models.Pedido.id_usuario, mes, models.Empresa.id_organizacao,
+        models.Pedido.id_cliente
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(validos), models.Empresa.id_organizacao).distinct().all()
+    sketches: Dict[tuple, list] = {}
+    for id_empresa, id_usuario, dt, id_org, id_cliente in linhas:
+        sketches.setdefault((id_empresa, id_usuario, _como_datetime(dt), id_org), []).append(id_cliente)
+    db.bulk_insert_mappings(models.SketchClientesMes, [
+        {"id_empresa": id_empresa, "id_usuario": id_usuario, "dt_mes_referencia": dt,
+         "id_organizacao": id_org, "bl_registros": novo_sketch(clientes).tobytes()}
+        for (id_empresa, id_usuario, dt, id_org), clientes in sketches.items()
+    ])
+
+    marcar_dados_alterados(db, id_organizacao)
+    db.commit()
+    return total
+
+
+def resumos_vazios(db: Session) -> bool:
+    """
+    Banco com pedidos mas sem resumos (ex: primeira execução após a migração
+    das Views, ou após a criação de um novo resumo)
+    """
+    return (
+        any(db.query(modelo.id_empresa).first() is None for modelo in (
+            models.VwVendasEmpresaMes, models.ResumoVendasProdutoMes, models.SketchClientesMes
+        ))
+        and db.query(models.Pedido.id_pedido).filter(
+            models.Pedido.st_pedido.notin_(STATUS_FORA_RESUMO)
+        ).first() is not None
+    )
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    from src.database import SessionLocal
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Uso: python -m src.services.resumos_vendas rebuild [id_organizacao]")
+        sys.exit(1)
+
+    db: Session = SessionLocal()
+    try:
+        org = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(f"✅ Resumos de vendas reconstruídos: {reconstruir_resumos(db, org)} pedidos.")
+    finally:
+        db.close()
@@ -0,0 +1,184 @@
+# /backend/src/services/series_vendas.py
+"""
+Série temporal de vendas (GET /api/gestor/dashboard/serie-vendas).
+
+Os pedidos do período são agrupados por dia, semana (segunda a domingo) ou
+mês em UMA consulta. Com comparação, a mesma consulta cobre também o período
+anterior (ou o do ano anterior), e cada ponto de comparação é alinhado ao
+ponto correspondente da série atual.
+
+O período é ampliado para pontos completos: com granularidade 'semana', de
+uma quarta a uma sexta, a série vai da segunda da primeira semana até o
+domingo da última. Assim cada ponto (e o seu par de comparação) cobre
+sempre uma semana/mês inteiro.
+
+Pontos sem pedidos são preenchidos com zero aqui, e não no SQL: por isso o
+alinhamento (e o acumulado) é feito sobre as linhas agrupadas, e não com
+funções de janela como LAG(), que dependem de não haver lacunas.
+"""
+import calendar
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.services.periodos import Intervalo, filtro_periodo
+from src.services.resumos_vendas import STATUS_FORA_RESUMO
+
+# Aceitos em Query(..., pattern=...)
+PADRAO_GRANULARIDADE = "^(dia|semana|mes)$"
+PADRAO_COMPARACAO = "^(periodo_anterior|ano_anterior)$"
+
+MAX_PONTOS = 1000
+
+_TRUNC_POSTGRESQL = {"dia": "day", "semana": "week", "mes": "month"}
+_TRUNC_SQLITE = {
+    "dia": ("start of day",),
+    "semana": ("start of day", "weekday 0", "-6 days"),  # domingo seguinte (ou o próprio) - 6 = segunda
+    "mes": ("start of month",),
+}
+
+
+def truncar(data: datetime, granularidade: str) -> datetime:
+    """ Início do ponto (dia, semana ou mês) que contém a data """
+    data = data.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularidade == "semana":
+        return data - timedelta(days=data.weekday())
+    if granularidade == "mes":
+        return data.replace(day=1)
+    return data
+
+
+def _somar_meses(data: datetime, meses: int) -> datetime:
+    ano, mes = divmod(data.year * 12 + data.month - 1 + meses, 12)
+    ultimo_dia = calendar.monthrange(ano, mes + 1)[1]
+    return data.replace(year=ano, month=mes + 1, day=min(data.day, ultimo_dia))
+
+
+def avancar(data: datetime, unidade: str, passos: int) -> datetime:
+    """ Soma 'passos' dias, semanas ou meses (negativo para voltar) """
+    if unidade == "dia":
+        return data + timedelta(days=passos)
+    if unidade == "semana":
+        return data + timedelta(weeks=passos)
+    return _somar_meses(data, passos)
+
+
+def pontos_do_periodo(intervalo: Intervalo, granularidade: str) -> List[datetime]:
+    """ Inícios dos pontos que cobrem o intervalo [inicio, fim) """
+    inicio, fim = intervalo
+    pontos = []
+    atual = truncar(inicio, granularidade)
+    while atual < fim:
+        pontos.append(atual)
+        atual = avancar(atual, granularidade, 1)
+    return pontos
+
+
+def _deslocamento(granularidade: str, comparacao: str, qt_pontos: int) -> Tuple[str, int]:
+    """ (unidade, passos) entre um ponto da série e o seu par de comparação """
+    if comparacao == "periodo_anterior":
+        return granularidade, qt_pontos
+    # Ano anterior: 52 semanas mantém o dia da semana; dias e meses voltam 12 meses
+    if granularidade == "semana":
+        return "semana", 52
+    return "mes", 12
+
+
+def _coluna_ponto(db: Session, granularidade: str):
+    """ Expressão SQL do início do ponto do pedido, no dialeto em uso """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc(_TRUNC_POSTGRESQL[granularidade], models.Pedido.dt_pedido)
+    return func.datetime(models.Pedido.dt_pedido, *_TRUNC_SQLITE[granularidade])
+
+
+def _como_datetime(valor) -> datetime:
+    """ O SQLite devolve datetime(...) como texto """
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor)
+    return valor.replace(tzinfo=None)
+
+
+def calcular_serie_vendas(
+    db: Session,
+    id_organizacao: int,
+    pontos: List[datetime],
+    granularidade: str,
+    comparacao: Optional[str] = None,
+    id_empresa: Optional[int] = None,
+    id_usuario: Optional[int] = None,
+) -> List[dict]:
+    """
+    Um dicionário por ponto (ver PontoSerieVendasSchema), na ordem de 'pontos'
+    (saída de pontos_do_periodo).
+    """
+    fim = avancar(pontos[-1], granularidade, 1)
+    periodos = [(pontos[0], fim)]
+    if comparacao:
+        unidade, passos = _deslocamento(granularidade, comparacao, len(pontos))
+        periodos.append((avancar(pontos[0], unidade, -passos), avancar(fim, unidade, -passos)))
+
+    coluna_ponto = _coluna_ponto(db, granularidade).label("ponto")
+    query = db.query(
+        coluna_ponto,
+        func.count(models.Pedido.id_pedido).label("qt_pedidos"),
+        func.sum(models.Pedido.vl_total).label("vl_total_vendas"),
+    ).join(
+        models.Empresa, models.Pedido.id_empresa == models.Empresa.id_empresa
+    ).filter(
+        models.Empresa.id_organizacao == id_organizacao,
+        models.Pedido.st_pedido.notin_(STATUS_FORA_RESUMO),
+        or_(*(filtro_periodo(models.Pedido.dt_pedido, periodo) for periodo in periodos)),
+    )
+    if id_empresa:
+        query = query.filter(models.Pedido.id_empresa == id_empresa)
+    if id_usuario:
+        query = query.filter(models.Pedido.id_usuario == id_usuario)
+
+    # Com períodos sobrepostos (ex: 2 anos contra o ano anterior) um ponto
+    # serve às duas séries, então basta agrupar pelo ponto
+    totais: Dict[datetime, Tuple[int, Decimal]] = {
+        _como_datetime(linha.ponto): (linha.qt_pedidos, linha.vl_total_vendas or Decimal(0))
+        for linha in query.group_by(coluna_ponto).all()
+    }
+
+    resultado = []
+    vl_acumulado = Decimal(0)
+    vl_acumulado_comparacao = Decimal(0)
+    for ponto in pontos:
+        qt_pedidos, vl_total = totais.get(ponto, (0, Decimal(0)))
+        vl_acumulado += vl_total
+        item = {
+            "dt_inicio": ponto.date(),
+            "qt_pedidos": qt_pedidos,
+            "vl_total_vendas": vl_total,
+            "vl_acumulado": vl_acumulado,
+        }
+
+        if comparacao:
+            par = avancar(ponto, unidade, -passos)
+            pares = [par]
+            if granularidade == "dia" and comparacao == "ano_anterior":
+                # 29/02 não tem par no ano anterior; o 29/02 do ano anterior soma com o 28/02
+                if par.day != ponto.day:
+                    pares = []
+                elif ponto.month == 2 and ponto.day == 28 and calendar.isleap(par.year):
+                    pares.append(par + timedelta(days=1))
+            qt_comparacao = sum(totais.get(dia, (0, 0))[0] for dia in pares)
+            vl_comparacao = sum((totais.get(dia, (0, Decimal(0)))[1] for dia in pares), Decimal(0))
+            vl_acumulado_comparacao += vl_comparacao
+            item.update(
+                dt_inicio_comparacao=par.date(),
+                qt_pedidos_comparacao=qt_comparacao,
+                vl_total_vendas_comparacao=vl_comparacao,
+                vl_acumulado_comparacao=vl_acumulado_comparacao,
+                pc_variacao=(
+                    round((vl_total - vl_comparacao) * 100 / vl_comparacao, 2) if vl_comparacao else None
+                ),
+            )
+        resultado.append(item)
+
+    return resultado
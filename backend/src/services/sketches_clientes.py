@@ -0,0 +1,108 @@
+# /backend/src/services/sketches_clientes.py
+"""
+Contagem aproximada de clientes atendidos com HyperLogLog.
+
+Clientes distintos não podem ser somados entre meses, empresas ou
+vendedores (o mesmo cliente pode aparecer em vários). Por isso cada
+(empresa, vendedor, mês) guarda um sketch HyperLogLog dos clientes
+(TB_SKETCH_CLIENTES_MES, mantido em 'resumos_vendas'). Sketches se mesclam
+com o máximo registro a registro, então qualquer período/agrupamento é
+estimado lendo só os sketches envolvidos, sem recontar pedidos.
+
+Com PRECISAO = 12 cada sketch tem 4096 registros (4 KB) e o erro padrão
+é de ~1,6%; até algumas centenas de clientes a contagem é praticamente
+exata (correção de contagem linear).
+"""
+import hashlib
+import math
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.models import models
+from src.services.periodos import Intervalo, filtro_periodo
+
+PRECISAO = 12
+QT_REGISTROS = 1 << PRECISAO
+_BITS_RESTO = 64 - PRECISAO
+_ALFA = 0.7213 / (1 + 1.079 / QT_REGISTROS)
+
+
+def _hash(id_cliente: int) -> int:
+    return int.from_bytes(hashlib.blake2b(str(id_cliente).encode(), digest_size=8).digest(), "big")
+
+
+def novo_sketch(ids_clientes: Iterable[int] = ()) -> np.ndarray:
+    """ Registros (uint8) de um sketch com os clientes informados """
+    registros = np.zeros(QT_REGISTROS, dtype=np.uint8)
+    adicionar(registros, ids_clientes)
+    return registros
+
+
+def adicionar(registros: np.ndarray, ids_clientes: Iterable[int]):
+    """ Inclui os clientes no sketch (altera 'registros') """
+    for id_cliente in ids_clientes:
+        valor = _hash(id_cliente)
+        indice = valor >> _BITS_RESTO
+        resto = valor & ((1 << _BITS_RESTO) - 1)
+        posicao = _BITS_RESTO - resto.bit_length() + 1  # Zeros à esquerda + 1
+        if posicao > registros[indice]:
+            registros[indice] = posicao
+
+
+def de_bytes(dados: bytes) -> np.ndarray:
+    return np.frombuffer(dados, dtype=np.uint8).copy()
+
+
+def mesclar(sketches: Iterable[bytes]) -> np.ndarray:
+    """ União dos sketches: máximo de cada registro """
+    resultado = np.zeros(QT_REGISTROS, dtype=np.uint8)
+    for dados in sketches:
+        np.maximum(resultado, np.frombuffer(dados, dtype=np.uint8), out=resultado)
+    return resultado
+
+
+def estimar(registros: np.ndarray) -> int:
+    """ Quantidade estimada de clientes distintos no sketch """
+    estimativa = _ALFA * QT_REGISTROS ** 2 / np.sum(np.exp2(-registros.astype(np.float64)))
+    vazios = int(np.count_nonzero(registros == 0))
+    if estimativa <= 2.5 * QT_REGISTROS and vazios:
+        estimativa = QT_REGISTROS * math.log(QT_REGISTROS / vazios)
+    return int(round(estimativa))
+
+
+def contar_clientes(
+    db: Session,
+    id_organizacao: int,
+    intervalo: Intervalo,
+    id_empresa: Optional[int] = None,
+    id_usuario: Optional[int] = None,
+    agrupar_por: Optional[str] = None,
+) -> Dict[Optional[int], int]:
+    """
+    Clientes atendidos (estimativa) nos meses que começam no intervalo.
+    Sem 'agrupar_por' retorna {None: total}; com 'empresa' ou 'vendedor',
+    {id: total} de cada empresa/vendedor.
+    """
+    sketch = models.SketchClientesMes
+    coluna_grupo = {"empresa": sketch.id_empresa, "vendedor": sketch.id_usuario}.get(agrupar_por)
+
+    query = db.query(sketch.id_empresa if coluna_grupo is None else coluna_grupo, sketch.bl_registros).filter(
+        sketch.id_organizacao == id_organizacao,
+        filtro_periodo(sketch.dt_mes_referencia, intervalo)
+    )
+    if id_empresa:
+        query = query.filter(sketch.id_empresa == id_empresa)
+    if id_usuario:
+        query = query.filter(sketch.id_usuario == id_usuario)
+
+    grupos: Dict[Optional[int], np.ndarray] = {}
+    for chave, dados in query:
+        chave = chave if coluna_grupo is not None else None
+        registros = grupos.setdefault(chave, np.zeros(QT_REGISTROS, dtype=np.uint8))
+        np.maximum(registros, np.frombuffer(dados, dtype=np.uint8), out=registros)
+
+    if coluna_grupo is None:
+        return {None: estimar(grupos[None]) if grupos else 0}
+    return {chave: estimar(registros) for chave, registros in grupos.items()}
@@ -0,0 +1,64 @@
+# /backend/tests/conftest.py
+"""
+Os testes usam um arquivo SQLite temporário, criado e populado (seed de
+DEV) pela própria inicialização da aplicação. Por ser um arquivo, o banco
+é compartilhado com threads e processos filhos dos testes de concorrência.
+
+    cd backend && python -m pytest
+"""
+import contextlib
+import io
+import os
+import tempfile
+
+import pytest
+
+# O src.database lê DATABASE_URL na importação: precisa vir antes de qualquer 'src.*'
+ARQUIVO_BANCO = tempfile.mktemp(suffix=".db")
+os.environ["DATABASE_URL"] = f"sqlite:///{ARQUIVO_BANCO}"
+os.environ["AMBIENTE"] = "dev"
+
+
+@pytest.fixture(scope="session")
+def app():
+    with contextlib.redirect_stdout(io.StringIO()):  # Saída do seed
+        from src.main import app
+    yield app
+    if os.path.exists(ARQUIVO_BANCO):
+        os.remove(ARQUIVO_BANCO)
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    from fastapi.testclient import TestClient
+    return TestClient(app)
+
+
+@pytest.fixture
+def db(app):
+    from src.database import SessionLocal
+    sessao = SessionLocal()
+    yield sessao
+    sessao.close()
+
+
+def _login(client, email: str, senha: str, id_empresa: int = None) -> dict:
+    resposta = client.post("/api/auth/login", json={"email": email, "password": senha})
+    resposta.raise_for_status()
+    headers = {"Authorization": f"Bearer {resposta.json()['token']['access_token']}"}
+    if id_empresa:
+        resposta = client.post("/api/auth/select-company", json={"id_empresa": id_empresa}, headers=headers)
+        resposta.raise_for_status()
+        headers = {"Authorization": f"Bearer {resposta.json()['token']['access_token']}"}
+    return headers
+
+
+@pytest.fixture(scope="session")
+def vendedor(client):
+    """ Headers do vendedor do seed, com a empresa 1 selecionada """
+    return _login(client, "vendedor@repcom.com", "123456", id_empresa=1)
+
+
+@pytest.fixture(scope="session")
+def gestor(client):
+    return _login(client, "gestor@repcom.com", "123456")
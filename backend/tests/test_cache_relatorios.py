@@ -0,0 +1,22 @@
+# /backend/tests/test_cache_relatorios.py
+"""
+Versão dos dados de relatório: marcar todas as organizações também
+invalida as que ainda não tinham linha em TB_VERSOES_DADOS.
+"""
+from src.models import models
+from src.services.cache_relatorios import marcar_dados_alterados, versao_dados
+
+
+def test_marcar_todas_cria_versao_das_organizacoes_sem_linha(db):
+    db.add(models.Organizacao(no_organizacao="Organização sem versão"))
+    db.flush()
+    ids_organizacoes = [id_org for id_org, in db.query(models.Organizacao.id_organizacao)]
+    db.query(models.VersaoDadosOrganizacao).delete(synchronize_session=False)
+    marcar_dados_alterados(db, ids_organizacoes[0])
+    marcar_dados_alterados(db, ids_organizacoes[0])
+
+    marcar_dados_alterados(db, None)
+
+    assert versao_dados(db, ids_organizacoes[0]) == 3
+    assert all(versao_dados(db, id_org) == 1 for id_org in ids_organizacoes[1:])
+    db.rollback()
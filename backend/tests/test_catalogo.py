@@ -0,0 +1,89 @@
+# /backend/tests/test_catalogo.py
+"""
+Catálogo do vendedor: o ETag acompanha a versão dos catálogos da empresa
+e, reenviado em If-None-Match, devolve 304 até a próxima alteração. A
+sincronização incremental (/changes) devolve só os produtos alterados e
+pede a carga completa quando o log tem lacunas.
+"""
+from src.models import models
+from src.services.alteracoes_catalogo import marcar_catalogo_alterado, versao_catalogo
+
+ID_EMPRESA = 1
+ID_CATALOGO = 1
+URL = "/api/vendedor/catalogo"
+
+
+def test_etag_devolve_304_ate_o_catalogo_mudar(client, vendedor, db):
+    parametros = {"id_catalogo": ID_CATALOGO}
+    resposta = client.get(f"{URL}/", params=parametros, headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    etag = resposta.headers["ETag"]
+    assert resposta.json()
+
+    repetida = client.get(f"{URL}/", params=parametros, headers={**vendedor, "If-None-Match": etag})
+    assert repetida.status_code == 304
+    assert repetida.headers["ETag"] == etag
+    assert repetida.content == b""
+
+    # Cada formato tem seu próprio ETag
+    compacto = client.get(f"{URL}/", params={**parametros, "format": "compacto"}, headers={
+        **vendedor, "If-None-Match": etag
+    })
+    assert compacto.status_code == 200
+    assert compacto.headers["ETag"] != etag
+
+    marcar_catalogo_alterado(db, ID_EMPRESA, [2])
+    db.commit()
+
+    alterada = client.get(f"{URL}/", params=parametros, headers={**vendedor, "If-None-Match": etag})
+    assert alterada.status_code == 200
+    assert alterada.headers["ETag"] != etag
+    assert alterada.json() == resposta.json()
+
+
+def _alteracoes(client, vendedor, desde: int) -> dict:
+    resposta = client.get(f"{URL}/changes", params={"id_catalogo": ID_CATALOGO, "since": desde}, headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+def test_changes_incremental_e_carga_completa_com_lacuna(client, vendedor, db):
+    ID_FORA_DO_CATALOGO = 999
+    desde = versao_catalogo(db, ID_EMPRESA)
+    marcar_catalogo_alterado(db, ID_EMPRESA, [2])
+    marcar_catalogo_alterado(db, ID_EMPRESA, [3, ID_FORA_DO_CATALOGO], ID_CATALOGO)
+    db.commit()
+
+    corpo = _alteracoes(client, vendedor, desde)
+    assert corpo["nr_versao"] == desde + 2
+    assert not corpo["fl_completo"]
+    assert sorted(i["produto"]["id_produto"] for i in corpo["itens"]) == [2, 3]
+    assert corpo["ids_produtos_removidos"] == [ID_FORA_DO_CATALOGO]
+
+    # Já sincronizado: nada a enviar
+    corpo = _alteracoes(client, vendedor, desde + 2)
+    assert (corpo["fl_completo"], corpo["itens"], corpo["ids_produtos_removidos"]) == (False, [], [])
+
+    # Lacuna no log (retenção apagou a versão seguinte à do cliente)
+    db.query(models.AlteracaoCatalogo).filter(
+        models.AlteracaoCatalogo.id_empresa == ID_EMPRESA,
+        models.AlteracaoCatalogo.nr_versao == desde + 1
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    corpo = _alteracoes(client, vendedor, desde)
+    assert corpo["fl_completo"]
+    assert len(corpo["itens"]) == len(client.get(
+        f"{URL}/", params={"id_catalogo": ID_CATALOGO}, headers=vendedor
+    ).json())
+    assert corpo["ids_produtos_removidos"] == []
+
+    # Quem já passou da lacuna continua incremental
+    corpo = _alteracoes(client, vendedor, desde + 1)
+    assert not corpo["fl_completo"]
+    assert [i["produto"]["id_produto"] for i in corpo["itens"]] == [3]
+
+    # Alteração do catálogo inteiro também pede a carga completa
+    marcar_catalogo_alterado(db, ID_EMPRESA, id_catalogo=ID_CATALOGO)
+    db.commit()
+    assert _alteracoes(client, vendedor, desde + 2)["fl_completo"]
@@ -0,0 +1,37 @@
+# /backend/tests/test_comissoes.py
+"""
+Livro de comissões: rascunhos só entram no livro quando são enviados.
+"""
+from src.models import models
+from src.services.comissoes import recalcular_comissoes
+
+RASCUNHO = {
+    "id_cliente": 1, "id_endereco_entrega": 1, "id_endereco_cobranca": 1,
+    "id_forma_pagamento": 1, "id_catalogo": 1, "pc_desconto": 0,
+    "itens": [{"id_produto": 2, "qt_quantidade": 1, "pc_desconto_item": 0}],
+}
+
+
+def _comissao(db, id_pedido):
+    db.expire_all()
+    return db.get(models.ComissaoPedido, id_pedido)
+
+
+def test_rascunho_so_gera_comissao_ao_ser_enviado(client, db, vendedor):
+    resposta = client.post("/api/vendedor/rascunhos/", json=RASCUNHO, headers=vendedor)
+    assert resposta.status_code == 201, resposta.text
+    id_pedido = resposta.json()["id_pedido"]
+
+    # Livro com uma linha indevida do rascunho (gravada antes da correção)
+    db.add(models.ComissaoPedido(id_pedido=id_pedido, id_usuario=1, pc_comissao=5, vl_comissao=1))
+    db.commit()
+
+    recalcular_comissoes(db)
+    assert _comissao(db, id_pedido) is None
+
+    resposta = client.post(f"/api/vendedor/rascunhos/{id_pedido}/enviar", headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    assert _comissao(db, id_pedido) is not None
+
+    recalcular_comissoes(db)
+    assert _comissao(db, id_pedido) is not None
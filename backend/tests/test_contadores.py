@@ -0,0 +1,34 @@
+# /backend/tests/test_contadores.py
+"""
+Contadores do Super Admin: pedido gravado soma e pedido cancelado subtrai
+(ajustados pelas rotas de pedido via 'registrar_contadores_pedidos').
+"""
+from decimal import Decimal
+
+from src.services.contadores_sistema import ler_contadores
+
+PEDIDO = {
+    "id_cliente": 1, "id_endereco_entrega": 1, "id_endereco_cobranca": 1,
+    "id_forma_pagamento": 1, "id_catalogo": 1, "pc_desconto": 0,
+    "itens": [{"id_produto": 2, "qt_quantidade": 1, "pc_desconto_item": 0}],
+}
+
+
+def _pedidos(db):
+    db.expire_all()
+    contadores = ler_contadores(db)
+    return contadores["pedidos"], contadores["vl_pedidos"]
+
+
+def test_pedido_gravado_e_cancelado_ajustam_contadores(client, vendedor, db):
+    qt_antes, vl_antes = _pedidos(db)
+
+    resposta = client.post("/api/vendedor/pedidos/", json=PEDIDO, headers=vendedor)
+    assert resposta.status_code == 201, resposta.text
+    pedido = resposta.json()
+    assert _pedidos(db) == (qt_antes + 1, vl_antes + Decimal(str(pedido["vl_total"])))
+
+    resposta = client.post(f"/api/vendedor/pedidos/{pedido['id_pedido']}/cancelar", json={"motivo": "teste"},
+                           headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    assert _pedidos(db) == (qt_antes, vl_antes)
@@ -0,0 +1,131 @@
+# /backend/tests/test_email_worker.py
+"""
+Processo de envio da fila de e-mails contra um SMTP de teste (aiosmtpd):
+envio, reagendamento com backoff, descarte após MAX_TENTATIVAS e limpeza
+da fila pela retenção.
+"""
+import asyncio
+import socket
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig
+
+from src.models import models
+
+TIPO_TESTE = "teste_worker"  # Só os e-mails deste teste são apagados ao final
+
+
+class CaixaPostal:
+    """ Aceita as mensagens, exceto as destinadas a endereços 'falha@...' """
+
+    def __init__(self):
+        self.destinatarios = []
+
+    async def handle_DATA(self, server, session, envelope):
+        if any(rcpt.startswith("falha@") for rcpt in envelope.rcpt_tos):
+            return "550 Caixa postal inexistente"
+        self.destinatarios += envelope.rcpt_tos
+        return "250 OK"
+
+
+def _porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def caixa(app, db, monkeypatch):
+    from src.services import email
+    caixa = CaixaPostal()
+    controller = Controller(caixa, hostname="127.0.0.1", port=_porta_livre())
+    controller.start()
+    monkeypatch.setattr(email, "_conf", ConnectionConfig(
+        MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM="repcom@teste.com", MAIL_FROM_NAME="RepCom",
+        MAIL_SERVER=controller.hostname, MAIL_PORT=controller.port,
+        MAIL_STARTTLS=False, MAIL_SSL_TLS=False, USE_CREDENTIALS=False, VALIDATE_CERTS=False,
+        TEMPLATE_FOLDER=Path(email.__file__).parent.parent / "templates",
+    ))
+    yield caixa
+    controller.stop()
+    db.query(models.FilaEmail).filter(models.FilaEmail.tp_email == TIPO_TESTE).delete(synchronize_session=False)
+    db.commit()
+
+
+def _enfileirar(db, destinatario: str, **campos) -> int:
+    from src.services.email import enfileirar_email
+    db_email = enfileirar_email(
+        db, tp_email=TIPO_TESTE, emails_to=[destinatario], assunto="Teste",
+        template_name="recuperacao_senha.html", template_body={"reset_link": "http://teste"}
+    )
+    for campo, valor in campos.items():
+        setattr(db_email, campo, valor)
+    db.commit()
+    return db_email.id_email
+
+
+def _executar_uma_vez(db):
+    from src.services.email_worker import executar
+    asyncio.run(executar(continuo=False))
+    db.expire_all()
+
+
+def test_envia_e_marca_enviado(caixa, db):
+    id_email = _enfileirar(db, "cliente@teste.com")
+
+    _executar_uma_vez(db)
+
+    db_email = db.get(models.FilaEmail, id_email)
+    assert db_email.st_envio == "enviado"
+    assert db_email.qt_tentativas == 1
+    assert db_email.dt_envio is not None
+    assert "cliente@teste.com" in caixa.destinatarios
+
+
+def test_falha_reagenda_com_backoff(caixa, db):
+    from src.services.email_worker import calcular_backoff
+    id_email = _enfileirar(db, "falha@teste.com")
+
+    antes = datetime.utcnow()
+    _executar_uma_vez(db)
+    depois = datetime.utcnow()
+
+    db_email = db.get(models.FilaEmail, id_email)
+    assert db_email.st_envio == "pendente"
+    assert db_email.qt_tentativas == 1
+    assert "550" in db_email.ds_ultimo_erro
+    assert antes + calcular_backoff(1) <= db_email.dt_proxima_tentativa <= depois + calcular_backoff(1)
+
+
+def test_descarta_apos_max_tentativas(caixa, db):
+    from src.services.email_worker import MAX_TENTATIVAS
+    id_email = _enfileirar(db, "falha@teste.com", qt_tentativas=MAX_TENTATIVAS - 1)
+
+    _executar_uma_vez(db)
+
+    db_email = db.get(models.FilaEmail, id_email)
+    assert db_email.st_envio == "erro"
+    assert db_email.qt_tentativas == MAX_TENTATIVAS
+
+
+def test_limpeza_respeita_retencao(caixa, db):
+    from src.services.email_worker import DIAS_RETENCAO
+    antigo = datetime.utcnow() - timedelta(days=DIAS_RETENCAO + 1)
+    recente = datetime.utcnow() - timedelta(days=DIAS_RETENCAO - 1)
+    futuro = datetime.utcnow() + timedelta(days=1)  # Pendente fora da vez: não é enviado
+    ids = {
+        "enviado_antigo": _enfileirar(db, "a@teste.com", st_envio="enviado", dt_criacao=antigo),
+        "erro_antigo": _enfileirar(db, "b@teste.com", st_envio="erro", dt_criacao=antigo),
+        "enviado_recente": _enfileirar(db, "c@teste.com", st_envio="enviado", dt_criacao=recente),
+        "pendente_antigo": _enfileirar(db, "d@teste.com", dt_criacao=antigo, dt_proxima_tentativa=futuro),
+    }
+
+    _executar_uma_vez(db)
+
+    restantes = {
+        nome for nome, id_email in ids.items() if db.get(models.FilaEmail, id_email) is not None
+    }
+    assert restantes == {"enviado_recente", "pendente_antigo"}
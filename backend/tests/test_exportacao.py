@@ -0,0 +1,78 @@
+# /backend/tests/test_exportacao.py
+"""
+Exportação em fluxo: pedidos em CSV e XLSX sem que a memória do processo
+(RSS) passe de um limite fixo.
+
+A rodada padrão usa 20.000 pedidos. A de 1.000.000 (TESTE_EXPORTACAO_LINHAS)
+leva alguns minutos e só roda com 'python -m pytest -m slow'.
+"""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from src.models import models
+
+QT_LINHAS_RAPIDO = 20_000
+QT_LINHAS_LENTO = int(os.getenv("TESTE_EXPORTACAO_LINHAS", 1_000_000))
+LIMITE_RSS_MB = 100
+ST_TESTE = "exportacao"  # Status próprio: a exportação filtra só estes pedidos
+TAMANHO_LOTE = 10000
+
+
+def _rss_mb() -> int:
+    with open("/proc/self/status") as status:
+        for linha in status:
+            if linha.startswith("VmRSS"):
+                return int(linha.split()[1]) // 1024
+
+
+@pytest.fixture(scope="module", params=[
+    QT_LINHAS_RAPIDO, pytest.param(QT_LINHAS_LENTO, marks=pytest.mark.slow)
+])
+def pedidos_exportacao(app, request):
+    qt_linhas = request.param
+    from src.database import engine
+    inicio = datetime(2023, 1, 1)
+    with engine.begin() as conexao:
+        for primeiro in range(0, qt_linhas, TAMANHO_LOTE):
+            conexao.execute(insert(models.Pedido.__table__), [
+                {"ID_USUARIO": 3, "ID_EMPRESA": 1, "ID_CLIENTE": 1, "NR_PEDIDO": f"X{i}", "VL_TOTAL": "999.00",
+                 "ST_PEDIDO": ST_TESTE, "DT_PEDIDO": inicio + timedelta(minutes=i)}
+                for i in range(primeiro, min(primeiro + TAMANHO_LOTE, qt_linhas))
+            ])
+    yield qt_linhas
+    with engine.begin() as conexao:
+        conexao.execute(models.Pedido.__table__.delete().where(models.Pedido.__table__.c.ST_PEDIDO == ST_TESTE))
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="RSS lido de /proc (Linux)")
+@pytest.mark.parametrize("formato", ["csv", "xlsx"])
+def test_exportacao_em_memoria_constante(pedidos_exportacao, formato):
+    from src.routes.gestor.pedidos import CABECALHO_EXPORTACAO_PEDIDOS, filtrar_pedidos_organizacao
+    from src.services.exportacao import gerar_csv, gerar_xlsx, linhas_consulta
+    from src.services.resumo_pedidos import consultar_resumo_pedidos
+
+    def montar(db):
+        return filtrar_pedidos_organizacao(consultar_resumo_pedidos(db), 1, st_pedido=ST_TESTE)
+
+    rss_inicial = pico = _rss_mb()
+    linhas = 0
+
+    def medir(linhas_exportadas):
+        # Mede durante a leitura: o XLSX só devolve blocos depois de escrever tudo
+        nonlocal linhas, pico
+        for linha in linhas_exportadas:
+            linhas += 1
+            if linhas % TAMANHO_LOTE == 0:
+                pico = max(pico, _rss_mb())
+            yield linha
+
+    gerador = gerar_csv if formato == "csv" else gerar_xlsx
+    for _ in gerador(CABECALHO_EXPORTACAO_PEDIDOS, medir(linhas_consulta(montar))):
+        pass
+    pico = max(pico, _rss_mb())
+
+    assert linhas == pedidos_exportacao
+    assert pico - rss_inicial < LIMITE_RSS_MB, f"RSS subiu {pico - rss_inicial} MB"
@@ -0,0 +1,71 @@
+# /backend/tests/test_idempotencia.py
+"""
+Criação de pedido com 'Idempotency-Key': o reenvio devolve o pedido já
+criado sem consumir outro número, a mesma chave com outro conteúdo é
+recusada (422) e uma chave ainda em processamento responde 409.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from src.models import models
+from src.services.numeracao import alocador_numero_pedido
+
+ID_EMPRESA = 1
+URL = "/api/vendedor/pedidos/"
+PEDIDO = {
+    "id_cliente": 1, "id_endereco_entrega": 1, "id_endereco_cobranca": 1,
+    "id_forma_pagamento": 1, "id_catalogo": 1, "pc_desconto": 0,
+    "itens": [{"id_produto": 2, "qt_quantidade": 1, "pc_desconto_item": 0}],
+}
+
+
+def _chave() -> dict:
+    return {"Idempotency-Key": str(uuid.uuid4())}
+
+
+def _proximo_numero() -> int:
+    return alocador_numero_pedido.blocos[ID_EMPRESA][0]
+
+
+def test_reenvio_devolve_o_mesmo_pedido(client, vendedor):
+    headers = {**vendedor, **_chave()}
+    primeira = client.post(URL, json=PEDIDO, headers=headers)
+    assert primeira.status_code == 201, primeira.text
+    assert "Idempotent-Replayed" not in primeira.headers
+    proximo = _proximo_numero()
+
+    repetida = client.post(URL, json=PEDIDO, headers=headers)
+    assert repetida.status_code == 201, repetida.text
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+    assert repetida.json()["id_pedido"] == primeira.json()["id_pedido"]
+    assert repetida.json()["nr_pedido"] == primeira.json()["nr_pedido"]
+    assert _proximo_numero() == proximo  # O reenvio não consome número
+
+
+def test_mesma_chave_com_outro_conteudo(client, vendedor):
+    headers = {**vendedor, **_chave()}
+    assert client.post(URL, json=PEDIDO, headers=headers).status_code == 201
+
+    outro = {**PEDIDO, "itens": [{"id_produto": 3, "qt_quantidade": 2, "pc_desconto_item": 0}]}
+    resposta = client.post(URL, json=outro, headers=headers)
+    assert resposta.status_code == 422, resposta.text
+
+
+def test_chave_em_processamento(client, vendedor, db):
+    chave = _chave()
+    id_usuario = db.query(models.Usuario.id_usuario).filter(
+        models.Usuario.ds_email == "vendedor@repcom.com"
+    ).scalar()
+    agora = datetime.utcnow()
+    # Registro sem resposta: outra requisição com a mesma chave ainda não terminou
+    db.add(models.ChaveIdempotencia(
+        id_usuario=id_usuario, ds_chave=chave["Idempotency-Key"], ds_hash_requisicao="em-processamento",
+        dt_expiracao=agora + timedelta(hours=1), dt_criacao=agora
+    ))
+    db.commit()
+    qt_pedidos = db.query(models.Pedido).count()
+
+    resposta = client.post(URL, json=PEDIDO, headers={**vendedor, **chave})
+    assert resposta.status_code == 409, resposta.text
+    db.expire_all()
+    assert db.query(models.Pedido).count() == qt_pedidos
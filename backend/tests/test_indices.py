@@ -0,0 +1,48 @@
+# /backend/tests/test_indices.py
+"""
+Os filtros de período (services/periodos.py) usam os índices por data:
+o EXPLAIN QUERY PLAN (SQLite) de cada consulta precisa citar o índice
+esperado, com os dois limites do intervalo, em vez de varrer a tabela.
+"""
+import pytest
+from sqlalchemy import text
+
+from src.routes.admin.logs import consultar_logs
+from src.routes.gestor.logs import consultar_logs_organizacao
+from src.routes.gestor.relatorios import consultar_comissoes, consultar_total_comissoes
+from src.routes.vendedor.dashboard import consultar_comissoes_vendedor
+from src.services.periodos import intervalo_mes
+
+ID_ORGANIZACAO = 1
+ID_VENDEDOR = 3
+
+
+def _plano(db, query) -> str:
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return "\n".join(linha[3] for linha in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+
+@pytest.mark.parametrize("consulta, esperado", [
+    (lambda db, mes: consultar_total_comissoes(db, ID_ORGANIZACAO, mes), [
+        "USING COVERING INDEX IX_PEDIDOS_EMPRESA_DATA (ID_EMPRESA=? AND DT_PEDIDO>? AND DT_PEDIDO<?)",
+        "USING INDEX IX_COMISSOES_PEDIDO_PEDIDO (ID_PEDIDO=?)",
+    ]),
+    (lambda db, mes: consultar_comissoes_vendedor(db, ID_VENDEDOR, mes), [
+        "USING COVERING INDEX IX_PEDIDOS_USUARIO_DATA (ID_USUARIO=? AND DT_PEDIDO>? AND DT_PEDIDO<?)",
+        "USING INDEX IX_COMISSOES_PEDIDO_PEDIDO (ID_PEDIDO=?)",
+    ]),
+    (lambda db, mes: consultar_comissoes(db, ID_ORGANIZACAO, None, None), [
+        "USING INDEX IX_PEDIDOS_EMPRESA_DATA (ID_EMPRESA=? AND DT_PEDIDO>? AND DT_PEDIDO<?)",
+        "USING INDEX IX_COMISSOES_PEDIDO_PEDIDO (ID_PEDIDO=?)",
+    ]),
+    (lambda db, mes: consultar_logs_organizacao(db, ID_ORGANIZACAO, intervalo=mes), [
+        "USING INDEX IX_LOGS_ORGANIZACAO_DATA (ID_ORGANIZACAO=? AND DT_ACAO>? AND DT_ACAO<?)"
+    ]),
+    (lambda db, mes: consultar_logs(db, intervalo=mes), ["USING INDEX IX_LOGS_DATA (DT_ACAO>? AND DT_ACAO<?)"]),
+], ids=["kpi-comissoes-gestor", "kpi-comissoes-vendedor", "relatorio-comissoes", "logs-gestor", "logs-admin"])
+def test_filtros_de_periodo_usam_indices(db, consulta, esperado):
+    plano = _plano(db, consulta(db, intervalo_mes()))
+    for trecho in esperado:
+        assert trecho in plano, plano
+    assert "SCAN TB_PEDIDOS" not in plano
+    assert "SCAN TB_LOGS_AUDITORIA" not in plano
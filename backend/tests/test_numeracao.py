@@ -0,0 +1,86 @@
+# /backend/tests/test_numeracao.py
+"""
+Unicidade do NR_PEDIDO com vários alocadores (workers) e threads
+simultâneos, e o descarte dos blocos herdados após um fork.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.services.numeracao import AlocadorNumeroPedido
+
+ID_EMPRESA = 1
+POR_THREAD = 40
+
+
+def _alocar(alocador: AlocadorNumeroPedido, quantidade: int):
+    return [alocador.proximo(ID_EMPRESA) for _ in range(quantidade)]
+
+
+def test_numeros_unicos_entre_alocadores_e_threads(app):
+    # 4 "workers", cada um com 4 threads; blocos pequenos forçam muitas reservas simultâneas
+    alocadores = [AlocadorNumeroPedido(tamanho_bloco=7) for _ in range(4)]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        tarefas = [
+            executor.submit(_alocar, alocador, POR_THREAD)
+            for alocador in alocadores for _ in range(4)
+        ]
+        numeros = [numero for tarefa in tarefas for numero in tarefa.result()]
+
+    assert len(numeros) == 16 * POR_THREAD
+    assert len(set(numeros)) == len(numeros)
+
+
+def _alocar_no_filho(alocador: AlocadorNumeroPedido, quantidade: int, fila):
+    from src.database import engine
+    engine.dispose(close=False)  # Conexões do pool pertencem ao processo pai
+    fila.put(_alocar(alocador, quantidade))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="depende de fork (Gunicorn no Linux)")
+def test_numeros_unicos_entre_processos_apos_fork(app):
+    # O pai já tem um bloco em uso quando os filhos são criados (como no
+    # preload do Gunicorn); cada filho herda uma cópia desse bloco
+    alocador = AlocadorNumeroPedido(tamanho_bloco=10)
+    numeros_pai = _alocar(alocador, 3)
+
+    contexto = multiprocessing.get_context("fork")
+    fila = contexto.Queue()
+    processos = [
+        contexto.Process(target=_alocar_no_filho, args=(alocador, 25, fila))
+        for _ in range(4)
+    ]
+    for processo in processos:
+        processo.start()
+    resultados = [fila.get(timeout=60) for _ in processos]
+    for processo in processos:
+        processo.join(timeout=60)
+        assert processo.exitcode == 0
+
+    numeros = numeros_pai + _alocar(alocador, 10) + [n for lista in resultados for n in lista]
+    assert len(numeros) == 3 + 10 + 4 * 25
+    assert len(set(numeros)) == len(numeros)
+
+
+def test_fork_descarta_blocos_herdados(app):
+    alocador = AlocadorNumeroPedido(tamanho_bloco=50)
+    primeiro = int(alocador.proximo(ID_EMPRESA))
+
+    alocador.pid = -1  # Simula o processo filho: o pid gravado não é mais o atual
+    depois_do_fork = int(alocador.proximo(ID_EMPRESA))
+
+    assert alocador.pid == os.getpid()
+    assert depois_do_fork > primeiro + 49  # Novo bloco, não o restante do herdado
+
+
+def test_garantir_bloco_nao_consome_numero(app):
+    alocador = AlocadorNumeroPedido(tamanho_bloco=2)
+    alocador.garantir_bloco(ID_EMPRESA)
+    inicio_bloco = alocador.blocos[ID_EMPRESA][0]
+
+    assert int(alocador.proximo(ID_EMPRESA)) == inicio_bloco
+    alocador.garantir_bloco(ID_EMPRESA)  # Ainda resta um número: não reserva outro bloco
+    assert int(alocador.proximo(ID_EMPRESA)) == inicio_bloco + 1
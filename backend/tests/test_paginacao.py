@@ -0,0 +1,48 @@
+# /backend/tests/test_paginacao.py
+"""
+Paginação por cursor: pedidos sem DT_PEDIDO (legados) não somem nem se
+repetem entre as páginas.
+"""
+from datetime import datetime
+
+from src.models import models
+from src.services.paginacao import codificar_cursor, paginar_pedidos
+
+ST_TESTE = "paginacao"
+
+
+def test_cursor_percorre_pedidos_com_e_sem_data(db):
+    datas = [None, datetime(2002, 1, 1), None, datetime(2002, 1, 2), datetime(2002, 1, 2), None]
+    pedidos = [
+        models.Pedido(id_usuario=3, id_empresa=1, id_cliente=1, nr_pedido=f"PAG-{i}", vl_total=1,
+                      st_pedido=ST_TESTE, dt_pedido=dt_pedido)
+        for i, dt_pedido in enumerate(datas)
+    ]
+    db.add_all(pedidos)
+    db.flush()
+    # O default do modelo preenche a data no INSERT: volta a NULL como nos legados
+    ids_sem_data = [p.id_pedido for p, dt_pedido in zip(pedidos, datas) if dt_pedido is None]
+    db.query(models.Pedido).filter(models.Pedido.id_pedido.in_(ids_sem_data)).update(
+        {models.Pedido.dt_pedido: None}, synchronize_session=False
+    )
+
+    def pagina(cursor):
+        query = db.query(models.Pedido.id_pedido, models.Pedido.dt_pedido).filter(
+            models.Pedido.st_pedido == ST_TESTE
+        )
+        return paginar_pedidos(query, 2, cursor=cursor).all()
+
+    vistos, cursor = [], None
+    while True:
+        linhas = pagina(cursor)
+        vistos += [linha.id_pedido for linha in linhas]
+        if len(linhas) < 2:
+            break
+        cursor = codificar_cursor(linhas[-1].dt_pedido, linhas[-1].id_pedido)
+
+    assert vistos == [p.id_pedido for p in db.query(models.Pedido.id_pedido).filter(
+        models.Pedido.st_pedido == ST_TESTE
+    ).order_by(models.Pedido.dt_pedido.desc().nulls_first(), models.Pedido.id_pedido.desc())]
+    assert sorted(vistos) == sorted(p.id_pedido for p in pedidos)
+    assert vistos[:3] == sorted(ids_sem_data, reverse=True)
+    db.rollback()
@@ -0,0 +1,55 @@
+# /backend/tests/test_pedidos_lote.py
+"""
+Envio em lote: um pedido que viola uma restrição do banco desfaz a
+gravação conjunta, e o lote é regravado um a um. Cada pedido recebe seu
+próprio resultado e só os gravados têm e-mail na fila.
+"""
+from src.models import models
+from src.services.numeracao import alocador_numero_pedido, formatar_numero
+
+ID_EMPRESA = 1
+PEDIDO = {
+    "id_cliente": 1, "id_endereco_entrega": 1, "id_endereco_cobranca": 1,
+    "id_forma_pagamento": 1, "id_catalogo": 1, "pc_desconto": 0,
+    "itens": [{"id_produto": 2, "qt_quantidade": 1, "pc_desconto_item": 0}],
+}
+
+
+def _emails(db) -> int:
+    db.expire_all()
+    return db.query(models.FilaEmail).filter(models.FilaEmail.tp_email == "pedido_confirmacao").count()
+
+
+def test_lote_regrava_um_a_um_com_falhas_parciais(client, vendedor, db):
+    # Ocupa o próximo número do alocador: o primeiro pedido válido do lote
+    # viola UK_PEDIDOS_EMPRESA_NUMERO e derruba a gravação conjunta
+    alocador_numero_pedido.garantir_bloco(ID_EMPRESA)
+    nr_ocupado = formatar_numero(alocador_numero_pedido.blocos[ID_EMPRESA][0])
+    ocupante = models.Pedido(
+        id_usuario=3, id_empresa=ID_EMPRESA, id_cliente=1, nr_pedido=nr_ocupado, vl_total=0, st_pedido="lote"
+    )
+    db.add(ocupante)
+    db.commit()
+    emails_antes = _emails(db)
+
+    lote = [PEDIDO, {**PEDIDO, "id_catalogo": 999}, PEDIDO, PEDIDO]
+    resposta = client.post("/api/vendedor/pedidos/lote", json=lote, headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    corpo = resposta.json()
+
+    assert (corpo["qt_recebidos"], corpo["qt_criados"], corpo["qt_falhas"]) == (4, 2, 2)
+    resultados = corpo["resultados"]
+    assert [r["indice"] for r in resultados] == [0, 1, 2, 3]
+    assert [r["status_code"] for r in resultados] == [500, 400, 201, 201]
+    assert not resultados[0]["sucesso"] and not resultados[1]["sucesso"]
+
+    criados = [r for r in resultados if r["sucesso"]]
+    db.expire_all()
+    for resultado in criados:
+        pedido = db.get(models.Pedido, resultado["id_pedido"])
+        assert pedido.nr_pedido == resultado["nr_pedido"] != nr_ocupado
+        assert pedido.st_pedido == "pendente"
+    assert _emails(db) == emails_antes + len(criados)
+
+    db.delete(db.get(models.Pedido, ocupante.id_pedido))
+    db.commit()
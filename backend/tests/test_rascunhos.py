@@ -0,0 +1,144 @@
+# /backend/tests/test_rascunhos.py
+"""
+Rascunhos (carrinho): o subtotal muda só pela diferença de cada item, a
+troca de catálogo reprecifica tudo e o envio promove o rascunho a pedido
+(número, reserva de estoque, remoção do rascunho e resumos mensais).
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.models import models
+
+ID_VARIACAO = 2
+RASCUNHO = {
+    "id_cliente": 1, "id_catalogo": 1, "id_endereco_entrega": 1, "id_endereco_cobranca": 1,
+    "id_forma_pagamento": 1, "pc_desconto": 10,
+    "itens": [
+        {"id_produto": 1, "id_variacao": ID_VARIACAO, "qt_quantidade": 3, "pc_desconto_item": 0},
+        {"id_produto": 2, "qt_quantidade": 1, "pc_desconto_item": 5},
+    ],
+}
+URL = "/api/vendedor/rascunhos"
+
+
+def _dec(valor) -> Decimal:
+    return Decimal(str(valor))
+
+
+def _criar(client, vendedor) -> dict:
+    resposta = client.post(f"{URL}/", json=RASCUNHO, headers=vendedor)
+    assert resposta.status_code == 201, resposta.text
+    return resposta.json()
+
+
+def _conferir_totais(rascunho: dict, subtotal: Decimal):
+    assert _dec(rascunho["vl_subtotal"]) == subtotal
+    assert _dec(rascunho["vl_total"]) == (subtotal * Decimal("0.9")).quantize(Decimal("0.01"))
+
+
+def test_itens_alteram_subtotal_pela_diferenca(client, vendedor):
+    rascunho = _criar(client, vendedor)
+    id_pedido = rascunho["id_pedido"]
+    subtotal = sum(_dec(i["vl_total_item"]) for i in rascunho["itens"])
+    assert subtotal == Decimal("49.90") * 3 + Decimal("123.41")  # 129,90 - 5% = 123,405 -> 123,41
+    _conferir_totais(rascunho, subtotal)
+
+    resposta = client.post(f"{URL}/{id_pedido}/itens", headers=vendedor, json=[
+        {"id_produto": 3, "qt_quantidade": 2, "pc_desconto_item": 0}
+    ])
+    assert resposta.status_code == 201, resposta.text
+    novo = resposta.json()["itens"][0]
+    subtotal += _dec(novo["vl_total_item"])
+    _conferir_totais(resposta.json(), subtotal)
+
+    resposta = client.patch(f"{URL}/{id_pedido}/itens/{novo['id_item_pedido']}", headers=vendedor, json={
+        "qt_quantidade": 5
+    })
+    assert resposta.status_code == 200, resposta.text
+    alterado = resposta.json()["itens"][0]
+    subtotal += _dec(alterado["vl_total_item"]) - _dec(novo["vl_total_item"])
+    _conferir_totais(resposta.json(), subtotal)
+
+    resposta = client.delete(f"{URL}/{id_pedido}/itens/{novo['id_item_pedido']}", headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    subtotal -= _dec(alterado["vl_total_item"])
+    _conferir_totais(resposta.json(), subtotal)
+
+    client.delete(f"{URL}/{id_pedido}", headers=vendedor)
+
+
+@pytest.fixture
+def catalogo_promocional(db):
+    """ Segundo catálogo ativo da empresa, com preços diferentes """
+    catalogo = models.Catalogo(id_empresa=1, no_catalogo="Promoção", fl_ativo=True)
+    db.add(catalogo)
+    db.flush()
+    db.add_all([
+        models.ItemCatalogo(id_catalogo=catalogo.id_catalogo, id_produto=1, vl_preco_catalogo=Decimal("39.90")),
+        models.ItemCatalogo(id_catalogo=catalogo.id_catalogo, id_produto=2, vl_preco_catalogo=Decimal("99.99")),
+    ])
+    db.commit()
+    yield catalogo.id_catalogo
+    db.query(models.ItemCatalogo).filter(models.ItemCatalogo.id_catalogo == catalogo.id_catalogo).delete()
+    db.query(models.Catalogo).filter(models.Catalogo.id_catalogo == catalogo.id_catalogo).delete()
+    db.commit()
+
+
+def test_troca_de_catalogo_reprecifica_itens(client, vendedor, db, catalogo_promocional):
+    id_pedido = _criar(client, vendedor)["id_pedido"]
+
+    resposta = client.patch(f"{URL}/{id_pedido}", headers=vendedor, json={"id_catalogo": catalogo_promocional})
+    assert resposta.status_code == 200, resposta.text
+    rascunho = resposta.json()
+
+    totais = {i["id_produto"]: _dec(i["vl_total_item"]) for i in rascunho["itens"]}
+    assert totais == {1: Decimal("119.70"), 2: Decimal("94.99")}  # 99,99 - 5% = 94,9905
+    assert rascunho["id_catalogo"] == catalogo_promocional
+    assert [i["id_variacao"] for i in rascunho["itens"]] == [ID_VARIACAO, None]
+    _conferir_totais(rascunho, sum(totais.values()))
+
+    client.delete(f"{URL}/{id_pedido}", headers=vendedor)
+
+
+def _estoque(db) -> int:
+    db.expire_all()
+    return db.get(models.VariacaoProduto, ID_VARIACAO).qt_estoque
+
+
+def _resumo_vendedor(db, id_usuario: int, mes: datetime):
+    db.expire_all()
+    linha = db.get(models.VwVendasVendedorMes, (id_usuario, mes))
+    return (linha.qt_pedidos, linha.vl_total_vendas) if linha else (0, Decimal(0))
+
+
+def test_enviar_promove_rascunho_a_pedido(client, vendedor, db):
+    id_usuario = db.query(models.Usuario.id_usuario).filter(
+        models.Usuario.ds_email == "vendedor@repcom.com"
+    ).scalar()
+    agora = datetime.utcnow()
+    mes = datetime(agora.year, agora.month, 1)
+    db.query(models.VariacaoProduto).filter(
+        models.VariacaoProduto.id_variacao == ID_VARIACAO
+    ).update({"qt_estoque": 10}, synchronize_session=False)
+    db.commit()
+    qt_pedidos, vl_vendas = _resumo_vendedor(db, id_usuario, mes)
+
+    rascunho = _criar(client, vendedor)
+    resposta = client.post(f"{URL}/{rascunho['id_pedido']}/enviar", headers=vendedor)
+    assert resposta.status_code == 200, resposta.text
+    pedido = resposta.json()
+
+    assert pedido["st_pedido"] == "pendente"
+    assert pedido["nr_pedido"]
+    assert _dec(pedido["vl_total"]) == _dec(rascunho["vl_total"])
+    assert _estoque(db) == 10 - 3
+    assert db.get(models.RascunhoPedido, rascunho["id_pedido"]) is None
+    assert db.query(models.ReservaEstoquePedido).filter(
+        models.ReservaEstoquePedido.id_pedido == pedido["id_pedido"]
+    ).count() == 1
+    assert _resumo_vendedor(db, id_usuario, mes) == (qt_pedidos + 1, vl_vendas + _dec(pedido["vl_total"]))
+
+    # O rascunho enviado não pode ser enviado de novo
+    assert client.post(f"{URL}/{rascunho['id_pedido']}/enviar", headers=vendedor).status_code == 404
@@ -0,0 +1,104 @@
+# /backend/tests/test_resumos.py
+"""
+Resumos mensais: o cancelamento apaga só as linhas que ele próprio zerou.
+Cada resumo tem seu próprio 'registrar_*', chamado pelas rotas de pedido.
+"""
+from datetime import datetime
+
+from src.models import models
+from src.services.resumos_vendas import registrar_sketches, registrar_vendas, registrar_vendas_produtos
+from src.services.sketches_clientes import de_bytes, estimar
+
+MES = datetime(2001, 5, 1)
+OUTRO_MES = datetime(2001, 6, 1)
+
+
+def _linhas_vendedor(db, id_usuario):
+    return {
+        linha.dt_mes_referencia: linha.qt_pedidos
+        for linha in db.query(models.VwVendasVendedorMes).filter(
+            models.VwVendasVendedorMes.id_usuario == id_usuario,
+            models.VwVendasVendedorMes.dt_mes_referencia.in_([MES, OUTRO_MES])
+        )
+    }
+
+
+def test_cancelamento_remove_apenas_linhas_zeradas_pelo_pedido(db):
+    vendedor = db.query(models.Usuario).filter(models.Usuario.ds_email == "vendedor@repcom.com").one()
+    # Linha vazia de outro mês, que não pertence a este cancelamento
+    db.add(models.VwVendasVendedorMes(
+        id_usuario=vendedor.id_usuario, dt_mes_referencia=OUTRO_MES, id_organizacao=vendedor.id_organizacao,
+        qt_pedidos=0, vl_total_vendas=0
+    ))
+    pedido = models.Pedido(
+        id_usuario=vendedor.id_usuario, id_empresa=1, id_cliente=1, id_endereco_entrega=1,
+        nr_pedido="RESUMO-1", vl_total=100, st_pedido="pendente", dt_pedido=datetime(2001, 5, 10)
+    )
+    db.add(pedido)
+    db.flush()
+
+    registrar_vendas(db, [pedido])
+    assert _linhas_vendedor(db, vendedor.id_usuario) == {MES: 1, OUTRO_MES: 0}
+
+    registrar_vendas(db, [pedido], sinal=-1)
+    assert _linhas_vendedor(db, vendedor.id_usuario) == {OUTRO_MES: 0}
+    assert db.query(models.VwVendasEmpresaMes).filter(
+        models.VwVendasEmpresaMes.id_empresa == 1, models.VwVendasEmpresaMes.dt_mes_referencia == MES
+    ).first() is None
+    db.rollback()
+
+
+def test_resumo_de_produtos_soma_e_subtrai_itens(db):
+    pedido = models.Pedido(
+        id_usuario=3, id_empresa=1, id_cliente=1, nr_pedido="RESUMO-2", vl_total=150,
+        st_pedido="pendente", dt_pedido=datetime(2001, 5, 10)
+    )
+    pedido.itens = [
+        models.ItemPedido(id_produto=1, id_variacao=2, qt_quantidade=2, vl_unitario=50, vl_total_item=100),
+        models.ItemPedido(id_produto=2, qt_quantidade=1, vl_unitario=50, vl_total_item=50),
+    ]
+    db.add(pedido)
+    db.flush()
+
+    def linhas():
+        return {
+            (linha.id_produto, linha.id_variacao): linha.qt_vendida
+            for linha in db.query(models.ResumoVendasProdutoMes).filter(
+                models.ResumoVendasProdutoMes.dt_mes_referencia == MES
+            )
+        }
+
+    registrar_vendas_produtos(db, [pedido])
+    registrar_vendas_produtos(db, [pedido])
+    assert linhas() == {(1, 2): 4, (2, 0): 2}
+
+    registrar_vendas_produtos(db, [pedido], sinal=-1)
+    registrar_vendas_produtos(db, [pedido], sinal=-1)
+    assert linhas() == {}
+    db.rollback()
+
+
+def test_sketch_inclui_cliente_e_recalcula_no_cancelamento(db):
+    pedidos = [
+        models.Pedido(id_usuario=3, id_empresa=1, id_cliente=1, nr_pedido=f"RESUMO-{3 + i}", vl_total=10,
+                      st_pedido="pendente", dt_pedido=datetime(2001, 5, 10 + i))
+        for i in range(2)
+    ]
+    db.add_all(pedidos)
+    db.flush()
+
+    def clientes():
+        sketch = db.get(models.SketchClientesMes, (1, 3, MES))
+        return estimar(de_bytes(sketch.bl_registros)) if sketch else 0
+
+    registrar_sketches(db, pedidos)
+    assert clientes() == 1
+
+    pedidos[0].st_pedido = "cancelado"
+    db.flush()
+    registrar_sketches(db, pedidos[:1], sinal=-1)
+    assert clientes() == 1  # O outro pedido do mesmo cliente continua valendo
+
+    registrar_sketches(db, pedidos[1:], sinal=-1)
+    assert clientes() == 0
+    db.rollback()
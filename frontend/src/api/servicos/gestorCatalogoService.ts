@@ -45,10 +45,17 @@ export const useGetCategorias = () => {
  */
 export const useGetProdutosPorEmpresa = (idEmpresa: number) => {
   const fetchProdutos = async (): Promise<IProdutoCompleto[]> => {
-    const { data } = await apiClient.get('/gestor/catalogo/produtos', {
-      params: { id_empresa: idEmpresa }
-    });
-    return data;
+    // A listagem é paginada: segue o header X-Next-Cursor até a última página
+    const produtos: IProdutoCompleto[] = [];
+    let cursor: string | undefined;
+    do {
+      const { data, headers } = await apiClient.get('/gestor/catalogo/produtos', {
+        params: { id_empresa: idEmpresa, limit: 500, cursor }
+      });
+      produtos.push(...data);
+      cursor = headers['x-next-cursor'];
+    } while (cursor);
+    return produtos;
   };
 
   return useQuery({